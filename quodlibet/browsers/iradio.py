@@ -16,7 +16,8 @@ from os.path import splitext
 from pathlib import Path
 from threading import Thread
 from collections.abc import Collection, Callable, Iterable
-from urllib.request import urlopen
+from urllib.error import HTTPError
+from urllib.request import urlopen, Request
 
 import re
 from gi.repository import Gtk, GLib, Pango
@@ -33,6 +34,7 @@ from quodlibet import config
 from quodlibet.browsers import Browser
 from quodlibet.formats.remote import RemoteFile
 from quodlibet.formats._audio import TAG_TO_SORT, MIGRATE, AudioFile
+from quodlibet.formats import load_audio_files, dump_audio_files, SerializationError
 from quodlibet.library import SongLibrary
 from quodlibet.query import Query
 from quodlibet.qltk.getstring import GetStringDialog
@@ -40,8 +42,10 @@ from quodlibet.qltk.songsmenu import SongsMenu
 from quodlibet.qltk.notif import Task
 from quodlibet.qltk import Icons, ErrorMessage, WarningMessage
 from quodlibet.util import copool, connect_destroy, sanitize_tags, connect_obj
+from quodlibet.util.atomic import atomic_save
 from quodlibet.util.i18n import numeric_phrase
 from quodlibet.util.path import uri_is_valid
+from quodlibet.util.picklehelper import pickle_load, pickle_dump, PickleError
 from quodlibet.util.string import decode, encode
 from quodlibet.util import print_w
 from quodlibet.qltk.views import AllTreeView
@@ -52,6 +56,7 @@ from quodlibet.qltk.x import MenuItem, Align, ScrolledWindow, Button
 STATION_LIST_URL = "https://quodlibet.github.io/radio/radiolist.bz2"
 STATIONS_FAV = os.path.join(quodlibet.get_user_dir(), "stations")
 STATIONS_ALL = os.path.join(quodlibet.get_user_dir(), "stations_all")
+STATION_LIST_CACHE = os.path.join(quodlibet.get_user_dir(), "stations_list")
 
 # TODO: - Ranking: reduce duplicate stations (max 3 URLs per station)
 #                  prefer stations that match a genre?
@@ -264,18 +269,60 @@ def _get_stations_from(
     on_done(irfs, uri)
 
 
-def download_taglist(url, callback, cofuncid, step=1024 * 10):
+def _load_station_cache(path, url):
+    """Returns the ETag and the serialized stations cached for `url`,
+    or `(None, None)`"""
+
+    try:
+        with open(path, "rb") as fileobj:
+            cache = pickle_load(fileobj)
+        if cache["url"] == url:
+            return cache["etag"], cache["stations"]
+    except FileNotFoundError:
+        pass
+    except (OSError, PickleError, KeyError, TypeError) as e:
+        print_w(f"Couldn't read station list cache {path!r} ({e})")
+    return None, None
+
+
+def _save_station_cache(path, url, etag, stations):
+    try:
+        data = dump_audio_files(stations)
+        with atomic_save(path, "wb") as fileobj:
+            pickle_dump({"url": url, "etag": etag, "stations": data}, fileobj, 2)
+    except (OSError, SerializationError) as e:
+        print_w(f"Couldn't save station list cache {path!r} ({e})")
+
+
+def download_taglist(url, callback, cofuncid, step=1024 * 10, cache=None):
     """Generator for loading the bz2 compressed tag list.
 
-    Calls callback with the decompressed data or None in case of
-    an error."""
+    Calls callback with the stations or None in case of an error.
+    The stations get parsed while downloading. If `cache` is a path, they
+    get stored there with the ETag of the download and get reused as long
+    as the server reports the list as unchanged."""
 
     with Task(_("Internet Radio"), _("Downloading station list")) as task:
         if cofuncid:
             task.copool(cofuncid)
 
+        etag, cached = _load_station_cache(cache, url) if cache else (None, None)
+        headers = {"If-None-Match": etag} if etag else {}
         try:
-            response = urlopen(url)
+            response = urlopen(Request(url, headers=headers))
+        except HTTPError as e:
+            stations = None
+            if e.code == 304:
+                try:
+                    stations = load_audio_files(cached)
+                except SerializationError as err:
+                    print_w(f"Couldn't load cached stations ({err})")
+                else:
+                    print_d(f"Station list unchanged, got {len(stations)} station(s)")
+            if stations is None:
+                print_e(f"Failed fetching from {url}", e)
+            GLib.idle_add(callback, stations)
+            return
         except (OSError, HTTPException) as e:
             print_e(f"Failed fetching from {url}", e)
             GLib.idle_add(callback, None)
@@ -286,86 +333,120 @@ def download_taglist(url, callback, cofuncid, step=1024 * 10):
             size = 0
 
         decomp = bz2.BZ2Decompressor()
+        parser = TaglistParser()
 
-        data = b""
-        temp = b""
+        stations = None
         read = 0
-        while temp or not data:
-            read += len(temp)
-
-            if size:
-                task.update(float(read) / size)
-            else:
-                task.pulse()
-            yield True
+        try:
+            while True:
+                if size:
+                    task.update(float(read) / size)
+                else:
+                    task.pulse()
+                yield True
 
-            try:
-                data += decomp.decompress(temp)
                 temp = response.read(step)
-            except (OSError, EOFError):
-                data = None
-                break
-        response.close()
+                if not temp:
+                    break
+                read += len(temp)
+                parser.feed(decomp.decompress(temp))
+        except (OSError, EOFError, HTTPException) as e:
+            print_e(f"Failed reading from {url}", e)
+        else:
+            stations = parser.finish()
+        finally:
+            response.close()
 
         yield True
 
-        stations = None
-        if data:
-            stations = parse_taglist(data)
+        etag = response.headers.get("ETag")
+        if stations and cache and etag:
+            _save_station_cache(cache, url, etag, stations)
         print_d(f"Got {len(stations or [])} station(s)")
         GLib.idle_add(callback, stations)
 
 
-def parse_taglist(data):
-    """Parses a dump file like list of tags and returns a list of IRFiles
+class TaglistParser:
+    """Parses a dump file like list of tags into IRFiles, from parts of it
+    as they come in. See `parse_taglist`."""
 
-    uri=http://...
-    tag=value1
-    tag2=value
-    tag=value2
-    uri=http://...
-    ...
+    def __init__(self):
+        self.stations: list[IRFile] = []
+        self._rest = b""
+        self._uri: str | None = None
+        self._tags: dict = {}
 
-    """
+    def feed(self, data: bytes) -> None:
+        """Parses all complete lines, including the ones started before"""
 
-    stations = []
-    station = None
+        lines = (self._rest + data).split(b"\n")
+        self._rest = lines.pop()
+        for line in lines:
+            self._parse_line(line)
 
-    for l in data.split(b"\n"):
-        if not l:
-            continue
-        key = l.split(b"=")[0]
-        value = l.split(b"=", 1)[1]
+    def finish(self) -> list[IRFile]:
+        """Parses the rest and returns all stations"""
+
+        self._parse_line(self._rest)
+        self._rest = b""
+        self._add_station()
+        return self.stations
+
+    def _add_station(self):
+        if self._uri is None:
+            return
+        station = IRFile(self._uri)
+        for key, value in self._tags.items():
+            station[key] = "\n".join(value) if isinstance(value, list) else value
+        self.stations.append(station)
+        self._uri = None
+        self._tags = {}
+
+    def _parse_line(self, line):
+        key, sep, value = line.partition(b"=")
+        if not sep:
+            return
         key = decode(key)
         value = decode(value)
         if key == "uri":
-            if station:
-                stations.append(station)
-            station = IRFile(value)
-            continue
+            self._add_station()
+            self._uri = value
+            return
 
         san = list(sanitize_tags({key: value}, stream=True).items())
-        if not san:
-            continue
+        if not san or self._uri is None:
+            return
 
         key, value = san[0]
         if key == "~listenerpeak":
             key = "~#listenerpeak"
             value = int(value)
 
-        if not station:
-            continue
-
         if isinstance(value, str):
-            if value not in station.list(key):
-                station.add(key, value)
+            values = self._tags.setdefault(key, [])
+            if not isinstance(values, list):
+                values = self._tags[key] = [str(values)]
+            if value not in values:
+                values.append(value)
         else:
-            station[key] = value
+            self._tags[key] = value
 
-    if station:
-        stations.append(station)
 
-    return stations
+def parse_taglist(data):
+    """Parses a dump file like list of tags and returns a list of IRFiles
+
+    uri=http://...
+    tag=value1
+    tag2=value
+    tag=value2
+    uri=http://...
+    ...
+
+    """
+
+    parser = TaglistParser()
+    parser.feed(data)
+    return parser.finish()
 
 
 class AddNewStation(GetStringDialog):
@@ -710,6 +791,7 @@ class InternetRadio(Browser, util.InstanceTracker):
             download_taglist,
             self.station_list_url,
             self.__update_done,
+            cache=STATION_LIST_CACHE,
             cofuncid="radio-load",
             funcid="radio-load",
         )
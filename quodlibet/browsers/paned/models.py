@@ -7,6 +7,8 @@
 # (at your option) any later version.
 
 import re
+from collections import OrderedDict
+
 from quodlibet.browsers.paned.util import PaneConfig
 
 from quodlibet import _
@@ -106,12 +108,23 @@ class AllEntry(BaseEntry):
 
 
 class PaneModel(ObjectStore):
+    MAX_CACHED_GROUPINGS = 8
+    """How many recent fills to remember the grouping of"""
+
     def __init__(self, pattern_config):
         super().__init__()
         self.__sort_cache = {}  # text to sort text cache
         self.__key_cache = {}  # song to key cache
         self.config = pattern_config
 
+        # An index of all songs seen, maintained as songs come and go
+        self.__indexed = set()
+        self.__groups = {}  # key to set of songs
+        self.__sorts = {}  # key to (human sort key, has real sort)
+        self.__unknown = set()
+        self.__order = None  # keys in display order, computed lazily
+        self.__groupings = OrderedDict()  # frozenset of songs to grouping
+
     def get_format_keys(self, song):
         try:
             return self.__key_cache[song]
@@ -120,6 +133,118 @@ class PaneModel(ObjectStore):
             self.__key_cache[song] = [v for v in self.config.format(song) if v[0]]
             return self.__key_cache[song]
 
+    def _prefetch_format_keys(self, songs):
+        """Formats keys for all uncached `songs` in one batch"""
+        cache = self.__key_cache
+        missing = [song for song in songs if song not in cache]
+        if not missing:
+            return
+        for song, values in zip(missing, self.config.format_many(missing), strict=True):
+            cache[song] = [v for v in values if v[0]]
+
+    def __index(self, songs):
+        """Add any songs not yet seen to the per-key index"""
+        groups = self.__groups
+        sorts = self.__sorts
+        human_sort = self.__human_sort_key
+        changed = False
+        for song in songs:
+            if song in self.__indexed:
+                continue
+            changed = True
+            self.__indexed.add(song)
+            items = self.get_format_keys(song)
+            if not items:
+                self.__unknown.add(song)
+            for key, sort in items:
+                if key in groups:
+                    groups[key].add(song)
+                    if sort and not sorts[key][1]:  # first actual sort key
+                        sorts[key] = (human_sort(sort), True)
+                else:  # first key sets up sorting
+                    groups[key] = {song}
+                    sorts[key] = (human_sort(sort), bool(sort))
+        if changed:
+            self.__order = None
+            self.__groupings.clear()
+
+    def __unindex(self, songs):
+        """Remove songs from the index. Needs their keys still cached"""
+        groups = self.__groups
+        changed = False
+        for song in songs:
+            if song not in self.__indexed:
+                continue
+            changed = True
+            self.__indexed.discard(song)
+            self.__unknown.discard(song)
+            for key, _sort in self.get_format_keys(song):
+                group = groups.get(key)
+                if group is None:
+                    continue
+                group.discard(song)
+                if not group:
+                    del groups[key]
+                    del self.__sorts[key]
+        if changed:
+            self.__order = None
+            self.__groupings.clear()
+
+    def group(self, songs):
+        """Groups songs by their keys, in display order.
+
+        Returns a list of (key, sort, songs) and the set of songs without
+        any key. Recent results are cached until the index changes.
+        """
+        songs = songs if isinstance(songs, frozenset) else frozenset(songs)
+        self.__index(songs)
+        try:
+            grouping = self.__groupings[songs]
+        except KeyError:
+            pass
+        else:
+            self.__groupings.move_to_end(songs)
+            return grouping
+
+        sorts = self.__sorts
+        if len(songs) * 4 < len(self.__groups):
+            # Only a few songs: cheaper to look at each of them
+            collection = {}
+            unknown = set()
+            for song in songs:
+                items = self.get_format_keys(song)
+                if not items:
+                    unknown.add(song)
+                for key, _sort in items:
+                    collection.setdefault(key, set()).add(song)
+            entries = [
+                (key, sorts[key][0], collection[key])
+                for key in sorted(collection, key=lambda k: sorts[k][0])
+            ]
+        else:
+            # Many songs: intersect with the (already sorted) index
+            if self.__order is None:
+                self.__order = sorted(self.__groups, key=lambda k: sorts[k][0])
+            groups = self.__groups
+            entries = []
+            if len(songs) == len(self.__indexed):
+                # Everything we know about, so no need to intersect
+                for key in self.__order:
+                    entries.append((key, sorts[key][0], groups[key]))
+                unknown = self.__unknown
+            else:
+                for key in self.__order:
+                    in_both = groups[key] & songs
+                    if in_both:
+                        entries.append((key, sorts[key][0], in_both))
+                unknown = self.__unknown & songs
+        grouping = ([(k, s, frozenset(g)) for k, s, g in entries], frozenset(unknown))
+
+        self.__groupings[songs] = grouping
+        while len(self.__groupings) > self.MAX_CACHED_GROUPINGS:
+            self.__groupings.popitem(last=False)
+        return grouping
+
     def __human_sort_key(self, text, reg=re.compile("<.*?>")):
         try:
             return self.__sort_cache[text], text
@@ -160,9 +285,11 @@ class PaneModel(ObjectStore):
 
         songs = set(songs)
 
+        self.__unindex(songs)
         for song in songs:
             if song in self.__key_cache:
                 del self.__key_cache[song]
+        self.config.invalidate(songs)
 
         to_remove = []
         for iter_, entry in self.iterrows():
@@ -196,6 +323,22 @@ class PaneModel(ObjectStore):
     def add_songs(self, songs):
         """Add new songs to the list, creating new rows"""
 
+        songs = list(songs)
+        self._prefetch_format_keys(songs)
+
+        # fast path: (re)fill from the index
+        if not len(self):
+            entries, unknown = self.group(songs)
+            self.insert_many(
+                0, [SongsEntry(key, sort, group) for key, sort, group in entries]
+            )
+            if unknown:
+                self.append(row=[UnknownEntry(unknown)])
+            if len(self) > 1:
+                self.insert(0, [AllEntry()])
+            return
+
+        self.__index(songs)
         collection = {}
         unknown = UnknownEntry()
         human_sort = self.__human_sort_key
@@ -218,18 +361,6 @@ class PaneModel(ObjectStore):
 
         items = sorted(collection.items(), key=lambda s: s[1][1], reverse=True)
 
-        # fast path
-        if not len(self):
-            if unknown.songs:
-                self.insert(0, [unknown])
-            entries = []
-            for _key, (val, _sort_key, _srtp) in items:
-                entries.append(val)
-            self.insert_many(0, reversed(entries))
-            if len(self) > 1:
-                self.insert(0, [AllEntry()])
-            return
-
         # insert all new songs
         key = None
         val = None
@@ -58,6 +58,8 @@ class PaneConfig:
                 pc = XMLFromPattern("")
             tags = pc.tags
             format = pc.format_list
+            format_many = pc.format_list_many
+            invalidate = pc.invalidate
             has_markup = True
         else:
             title = util.tag(cat)
@@ -79,6 +81,12 @@ class PaneConfig:
                 def format(song: AudioFile) -> list[tuple[str, str]]:
                     return song.list_separate(cat)
 
+            def format_many(songs):
+                return [format(song) for song in songs]
+
+            def invalidate(songs=None):
+                pass
+
         if is_pattern(disp):
             try:
                 pd = XMLFromPattern(disp)
@@ -98,6 +106,8 @@ class PaneConfig:
         self.title = title
         self.tags = set(tags)
         self.format = format
+        self.format_many = format_many
+        self.invalidate = invalidate
         self.format_display = format_display
         self.has_markup = has_markup
 
@@ -10,6 +10,9 @@ import os
 import sys
 import threading
 import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
 from urllib.request import urlopen, Request
 
 from gi.repository import Gtk, GLib, Pango, Gdk
@@ -41,6 +44,9 @@ from quodlibet.util.picklehelper import pickle_load, pickle_dump, PickleError
 FEEDS = os.path.join(quodlibet.get_user_dir(), "feeds")
 DND_URI_LIST, DND_MOZ_URL = range(2)
 
+_MAX_REFRESH_WORKERS = 4
+"""Upper bound on feeds downloaded at the same time"""
+
 # Migration path for pickle
 sys.modules["browsers.audiofeeds"] = sys.modules[__name__]
 
@@ -50,6 +56,12 @@ class InvalidFeedError(ValueError):
 
 
 class Feed(list):
+    etag: str | None = None
+    """ETag of the last downloaded version, for conditional requests"""
+
+    modified: str | None = None
+    """Last-Modified date of the last downloaded version"""
+
     def __init__(self, uri):
         self.name = _("Unknown")
         self.uri = uri
@@ -141,25 +153,46 @@ class Feed(list):
                 if value and value not in af.list("genre"):
                     af.add("genre", value)
 
-    def parse(self):
-        req = Request(self.uri, method="HEAD")
+    def parse(self, conditional=False):
+        """Downloads the feed and merges in its new episodes.
+
+        If `conditional`, the server gets asked to skip the download if the
+        feed didn't change since the last time. Returns whether there were
+        new episodes.
+        """
+
+        headers = {}
+        if conditional:
+            if self.etag:
+                headers["If-None-Match"] = self.etag
+            if self.modified:
+                headers["If-Modified-Since"] = self.modified
+        req = Request(self.uri, headers=headers)
         try:
-            with urlopen(req, timeout=5) as head:
+            with urlopen(req, timeout=15) as resp:
                 # Some requests don't support status, e.g. file://
-                if hasattr(head, "status"):
+                if hasattr(resp, "status"):
                     print_d(
-                        f"Feed URL {self.uri!r} ({head.url}) "
-                        f"returned HTTP {head.status}, "
-                        f"with content {head.headers.get('Content-Type')}"
+                        f"Feed URL {self.uri!r} ({resp.url}) "
+                        f"returned HTTP {resp.status}, "
+                        f"with content {resp.headers.get('Content-Type')}"
                     )
-                    if head.status and head.status >= 400:
-                        return False
-                if head.headers.get("Content-Type").lower().startswith("audio"):
+                content_type = resp.headers.get("Content-Type") or ""
+                if content_type.lower().startswith("audio"):
                     print_w("Looks like an audio stream / radio, not a audio feed.")
                     return False
-            # Don't pass feedparser URLs
-            # see https://github.com/kurtmckee/feedparser/pull/80#issuecomment-449543486
-            content = urlopen(self.uri, timeout=15).read()
+                # Don't pass feedparser URLs
+                # see https://github.com/kurtmckee/feedparser/pull/80#issuecomment-449543486
+                content = resp.read()
+                etag = resp.headers.get("ETag")
+                modified = resp.headers.get("Last-Modified")
+        except HTTPError as e:
+            if e.code == 304:
+                print_d(f"Feed {self.uri!r} didn't change")
+                self.__lastgot = time.time()
+            else:
+                print_w(f"Couldn't fetch content from {self.uri} ({e})")
+            return False
         except OSError as e:
             print_w(f"Couldn't fetch content from {self.uri} ({e})")
             return False
@@ -235,9 +268,34 @@ class Feed(list):
                 else:
                     self.insert(0, song)
         self.__lastgot = time.time()
+        self.etag = etag
+        self.modified = modified
         return bool(uris)
 
 
+def refresh_feeds(
+    feeds: Iterable[Feed], max_age: float = 0, conditional: bool = True
+) -> list[Feed]:
+    """Parses the feeds at least `max_age` seconds old, some at the same time.
+
+    Returns the ones with new episodes.
+    """
+
+    feeds = [feed for feed in feeds if feed.get_age() >= max_age]
+    if not feeds:
+        return []
+
+    def parse(feed):
+        return feed.parse(conditional=conditional)
+
+    workers = max(1, min(_MAX_REFRESH_WORKERS, len(feeds)))
+    with ThreadPoolExecutor(workers) as pool:
+        results = list(pool.map(parse, feeds))
+    changed = [feed for feed, new in zip(feeds, results, strict=True) if new]
+    print_d(f"{len(changed)} of {len(feeds)} feed(s) had new episodes")
+    return changed
+
+
 class AddFeedDialog(GetStringDialog):
     def __init__(self, parent):
         super().__init__(
@@ -384,19 +442,18 @@ class Podcasts(Browser):
 
     @classmethod
     def __do_check(cls):
-        thread = threading.Thread(target=cls.__check, args=(), daemon=True)
+        feeds = [row[0] for row in cls.__feeds]
+        thread = threading.Thread(target=cls.__check, args=(feeds,), daemon=True)
         thread.start()
 
     @classmethod
-    def __check(cls):
-        for row in cls.__feeds:
-            feed = row[0]
-            if feed.get_age() < 2 * 60 * 60:
-                continue
-            if feed.parse():
-                feed.changed = True
-                row[0] = feed
-        cls.write()
+    def __check(cls, feeds):
+        changed = refresh_feeds(feeds, max_age=2 * 60 * 60)
+        GLib.idle_add(cls.__checked, changed)
+
+    @classmethod
+    def __checked(cls, changed):
+        cls.changed(changed)
         GLib.timeout_add(60 * 60 * 1000, cls.__do_check)
 
     def __init__(self, library):
@@ -519,14 +576,12 @@ class Podcasts(Browser):
         Podcasts.write()
 
     def __refresh(self, feeds):
-        changed = list(filter(Feed.parse, feeds))
-        Podcasts.changed(changed)
+        Podcasts.changed(refresh_feeds(feeds))
 
     def __rebuild(self, feeds):
         for feed in feeds:
             feed.clear()
-        changed = list(filter(Feed.parse, feeds))
-        Podcasts.changed(changed)
+        Podcasts.changed(refresh_feeds(feeds, conditional=False))
 
     def __remove_paths(self, model, paths):
         for path in paths:
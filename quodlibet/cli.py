@@ -300,7 +300,8 @@ def process_arguments(argv):
                 queue("print-playing", opts.get("with-pattern"))
         elif command == "print-query":
             pattern = opts.get("with-pattern")
-            queue(command, json.dumps({"query": arg, "pattern": pattern}))
+            # sent in parts, for big libraries
+            queue("print-query-stream", json.dumps({"query": arg, "pattern": pattern}))
         elif command == "print-query-text":
             queue(command)
         elif command == "start-playing":
@@ -9,6 +9,7 @@
 
 import json
 import os
+from collections.abc import Iterator
 
 from senf import uri2fsn, fsnative, fsn2text, text2fsn
 
@@ -44,7 +45,8 @@ class CommandRegistry:
         """Register a new command function
 
         The functions gets zero or more arguments as `fsnative`
-        and should return `None` or `fsnative`. In case an error
+        and should return `None` or `fsnative`, or an iterator of `fsnative`
+        for responses which get sent in parts. In case an error
         occurred the command should raise `CommandError`.
 
         Args:
@@ -70,7 +72,7 @@ class CommandRegistry:
             app (Application)
             line (fsnative)
         Returns:
-            fsnative or None
+            fsnative, Iterator[fsnative] or None
         """
 
         assert isinstance(line, fsnative)
@@ -112,6 +114,8 @@ class CommandRegistry:
         except CommandError as e:
             raise CommandError(f"{name}: {e!s}") from e
         else:
+            if isinstance(result, Iterator):
+                return result
             if result is not None and not isinstance(result, fsnative):
                 raise CommandError(f"{name}: returned {result!r} which is not fsnative")
             return result
@@ -531,11 +535,13 @@ def _refresh(app):
     scan_library(app.library, False)
 
 
-@registry.register("print-query", args=1)
-def _print_query(app, json_encoded_args):
-    """Queries library, dumping filenames of matches to stdout
-    See Issue 716
-    """
+QUERY_CHUNK_SIZE = 500
+"""How many songs get matched (and formatted) per part of a query response"""
+
+
+def _query_args(json_encoded_args):
+    """Returns the `print-query` arguments as dict,
+    or None if they are invalid"""
 
     try:
         args = json.loads(arg2text(json_encoded_args))
@@ -543,16 +549,107 @@ def _print_query(app, json_encoded_args):
         fstring = args["pattern"]
     except (json.decoder.JSONDecodeError, KeyError, TypeError):
         # backward compatibility
+        args = {}
         query = arg2text(json_encoded_args)
         fstring = None
+    args = {
+        "query": query,
+        "pattern": fstring,
+        "offset": args.get("offset", 0),
+        "limit": args.get("limit"),
+        "sort": args.get("sort"),
+        "reverse": args.get("reverse") is True,
+    }
     if not isinstance(query, str) or (
         fstring is not None and not isinstance(fstring, str)
     ):
         # This should not happen
+        return None
+    for key in ["offset", "limit"]:
+        value = args[key]
+        if value is not None and (
+            not isinstance(value, int) or isinstance(value, bool) or value < 0
+        ):
+            return None
+    if args["sort"] is not None and not isinstance(args["sort"], str):
+        return None
+    return args
+
+
+def _chunks(songs):
+    for i in range(0, len(songs), QUERY_CHUNK_SIZE):
+        yield songs[i : i + QUERY_CHUNK_SIZE]
+
+
+def _iter_query(app, args):
+    """Yields the formatted results of a `print-query` in parts,
+    matching only `QUERY_CHUNK_SIZE` songs per part"""
+
+    from quodlibet.formats import AudioFile
+    from quodlibet.query import Query
+
+    pattern = make_pattern(args["pattern"], "<~filename>")
+    search = Query(args["query"]).search if args["query"] != "" else None
+    offset, limit, tag = args["offset"], args["limit"], args["sort"]
+    # A copy, as the library can change between the parts
+    songs = list(app.library.values())
+
+    def matching():
+        for chunk in _chunks(songs):
+            yield chunk if search is None else [s for s in chunk if search(s)]
+
+    if tag:
+        found = []
+        for chunk in matching():
+            found.extend(chunk)
+            # Let the main loop run while matching
+            yield fsnative("")
+        found.sort(key=AudioFile.sort_by_func(tag), reverse=args["reverse"])
+        end = None if limit is None else offset + limit
+        results = _chunks(found[offset:end])
+        offset, limit = 0, None
+    else:
+        results = matching()
+
+    empty = True
+    for chunk in results:
+        if offset:
+            skipped = min(offset, len(chunk))
+            chunk = chunk[skipped:]
+            offset -= skipped
+        if limit is not None:
+            chunk = chunk[:limit]
+            limit -= len(chunk)
+        empty = empty and not chunk
+        yield fsnative("".join(text2fsn(pattern.format(s)) + "\n" for s in chunk))
+        if limit == 0:
+            break
+
+    if empty:
+        yield fsnative("\n")
+
+
+@registry.register("print-query", args=1)
+def _print_query(app, json_encoded_args):
+    """Queries library, dumping filenames of matches to stdout
+    See Issue 716
+    """
+
+    args = _query_args(json_encoded_args)
+    if args is None:
+        return "\n"
+    return fsnative("".join(_iter_query(app, args)))
+
+
+@registry.register("print-query-stream", args=1)
+def _print_query_stream(app, json_encoded_args):
+    """Like `print-query`, but the results get sent in parts
+    while the main loop keeps running"""
+
+    args = _query_args(json_encoded_args)
+    if args is None:
         return "\n"
-    pattern = make_pattern(fstring, "<~filename>")
-    songs = app.library.query(query)
-    return "\n".join([text2fsn(pattern.format(song)) for song in songs]) + "\n"
+    return _iter_query(app, args)
 
 
 @registry.register("print-query-text")
@@ -42,6 +42,8 @@ INITIAL: dict[str, dict[str, str]] = {
         "gst_buffer": "3",
         "gst_device": "",
         "gst_disable_gapless": "false",
+        # Keep the pipeline for non-gapless song changes instead of rebuilding it
+        "gst_reuse_pipeline": "false",
         # Use WASAPI exclusive mode on Windows
         "gst_exclusive_mode": "false",
         # Use Jack sink (via Gstreamer) if available
@@ -54,12 +56,18 @@ INITIAL: dict[str, dict[str, str]] = {
         # this proportion of its overall length
         "playcount_minimum_length_proportion": "0.5",
         "gst_use_playbin3": "false",
+        # Read ahead the files of this many upcoming songs (0 to disable)
+        "prefetch_songs": "0",
+        # ...up to this many MiB in total
+        "prefetch_budget": "32",
     },
     "library": {
         "exclude": "",
         "refresh_on_start": "true",
         # Watch all library files / directories for changes
         "watch": "false",
+        # Combine library signals emitted in the same main loop iteration
+        "coalesce_signals": "false",
     },
     # State about the player, to restore on startup
     "memory": {
@@ -98,6 +106,9 @@ INITIAL: dict[str, dict[str, str]] = {
         "auto_sort": "true",
         # Make all browsers sortable even
         "always_allow_sorting": "true",
+        # Fill lists of at least this many songs progressively
+        # (sorting in the background, then adding rows in chunks). 0 disables
+        "progressive_fill_threshold": "20000",
     },
     "browsers": {
         # search bar text
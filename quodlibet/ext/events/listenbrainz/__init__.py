@@ -24,6 +24,7 @@
 import os
 import threading
 import time
+from functools import partial
 
 from gi.repository import Gtk, GLib
 
@@ -38,7 +39,8 @@ from quodlibet.qltk.entry import ValidatingEntry, UndoEntry
 from quodlibet.qltk.msg import Message
 from quodlibet.qltk import Icons
 from quodlibet.util.dprint import print_d
-from quodlibet.util.picklehelper import pickle_load, pickle_dump, PickleError
+from quodlibet.util.journal import Journal
+from quodlibet.util.picklehelper import pickle_load, PickleError
 
 import csv
 from io import StringIO
@@ -86,10 +88,15 @@ class ListenBrainzSubmitQueue:
     """
 
     DUMP = os.path.join(quodlibet.get_user_dir(), "listenbrainz_cache")
+    """Where older versions kept the queue, which gets moved to the journal"""
+    JOURNAL_FILE = os.path.join(quodlibet.get_user_dir(), "listenbrainz_journal")
+
+    BATCH_SIZE = 100
+    """Listens sent with one request when catching up"""
 
     # These objects are shared across instances, to allow other plugins to
     # queue listens in future versions of QL.
-    queue: list[tuple[int, listenbrainz.Track]] = []
+    journal: Journal | None = None
     condition = threading.Condition()
 
     def set_nowplaying(self, song):
@@ -115,7 +122,7 @@ class ListenBrainzSubmitQueue:
         if timestamp == 0:
             timestamp = int(time.time())
         print_d(f"Queueing: {track}")
-        self.queue.append((timestamp, track))
+        self.journal.add({"listened_at": timestamp, "track": track.to_dict()})
         self.changed()
         self.condition.release()
 
@@ -201,28 +208,22 @@ class ListenBrainzSubmitQueue:
         self.artpat = Pattern(config_get_artist_pattern())
         self.tags = config_get_tags()
 
+        if ListenBrainzSubmitQueue.journal is None:
+            ListenBrainzSubmitQueue.journal = Journal(self.JOURNAL_FILE)
         try:
             with open(self.DUMP, "rb") as disk_queue_file:
                 disk_queue = pickle_load(disk_queue_file)
             os.unlink(self.DUMP)
-            self.queue += disk_queue
         except (OSError, PickleError):
-            pass
-
-    @classmethod
-    def dump_queue(cls):
-        if cls.queue:
-            try:
-                with open(cls.DUMP, "wb") as disk_queue_file:
-                    pickle_dump(cls.queue, disk_queue_file)
-            except (OSError, PickleError):
-                pass
+            disk_queue = []
+        for timestamp, track in disk_queue:
+            self.journal.add({"listened_at": timestamp, "track": track.to_dict()})
 
     # Must be called with self.condition acquired
     def _check_config(self):
         user_token = plugin_config.get("user_token")
         if not user_token:
-            if self.queue and not self.broken:
+            if self.journal and not self.broken:
                 self.quick_dialog(
                     _(
                         "Please visit the Plugins window to set "
@@ -248,7 +249,7 @@ class ListenBrainzSubmitQueue:
         if (
             not self.broken
             and not self.offline
-            and (self.queue or (self.nowplaying_track and not self.nowplaying_sent))
+            and (self.journal or (self.nowplaying_track and not self.nowplaying_sent))
         ):
             self.condition.notify()
 
@@ -265,7 +266,7 @@ class ListenBrainzSubmitQueue:
                 self.broken
                 or self.offline
                 or (
-                    not self.queue
+                    not self.journal
                     and (not self.nowplaying_track or self.nowplaying_sent)
                 )
             ):
@@ -277,9 +278,7 @@ class ListenBrainzSubmitQueue:
 
             # Poll inputs under the lock
 
-            submit = None
-            if self.queue:
-                submit = self.queue[0]
+            submit = self.journal.peek(self.BATCH_SIZE)
             nowplaying = None
             if self.nowplaying_track and not self.nowplaying_sent:
                 nowplaying = self.nowplaying_track
@@ -324,19 +323,22 @@ class ListenBrainzSubmitQueue:
                 return True
 
             if submit:
-                (listened_at, track) = submit
-                print_d(f"Submitting: {track}")
-
-                if not with_backoff(lambda: self.lb.listen(listened_at, track)):  # noqa
+                listens = [
+                    (entry["listened_at"], listenbrainz.Track.from_dict(entry["track"]))
+                    for _id, entry in submit
+                ]
+                print_d(f"Submitting: {listens}")
+
+                # After being offline, catch up with fewer requests
+                if len(listens) == 1:
+                    send = partial(self.lb.listen, *listens[0])
+                else:
+                    send = partial(self.lb.import_tracks, listens)
+                if not with_backoff(send):
                     continue
 
                 print_d("Submission successful")
-
-                # Remove submitted entry under lock
-                self.condition.acquire()
-                if self.queue[0] == submit:
-                    self.queue.pop(0)
-                self.condition.release()
+                self.journal.acknowledge(id_ for id_, _entry in submit)
 
             if nowplaying:
                 print_d(f"Now playing: {nowplaying}")
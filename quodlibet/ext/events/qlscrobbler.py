@@ -31,7 +31,8 @@ from quodlibet.qltk.entry import ValidatingEntry, UndoEntry
 from quodlibet.qltk.msg import Message
 from quodlibet.qltk import Icons
 from quodlibet.util.dprint import print_d, print_w
-from quodlibet.util.picklehelper import pickle_load, pickle_dump, PickleError
+from quodlibet.util.journal import Journal
+from quodlibet.util.picklehelper import pickle_load, PickleError
 from quodlibet.util.urllib import urlopen, UrllibError
 from quodlibet.errorreport import errorhook
 
@@ -86,10 +87,17 @@ class QLSubmitQueue:
     CLIENT_VERSION = const.VERSION
     PROTOCOL_VERSION = "1.2"
     SCROBBLER_CACHE_FILE = os.path.join(quodlibet.get_user_dir(), "scrobbler_cache_v2")
+    """Where older versions kept the queue, which gets moved to the journal"""
+    JOURNAL_FILE = os.path.join(quodlibet.get_user_dir(), "scrobbler_journal")
+
+    BATCH_SIZE = 50
+    """Songs sent with one submission, the most the protocol allows"""
+    SUBMIT_INTERVAL = 1.0
+    """Minimum seconds between two submissions"""
 
     # These objects are shared across instances, to allow other plugins to
     # queue scrobbles in future versions of QL
-    queue: list[dict[str, str]] = []
+    journal: Journal | None = None
     changed_event = threading.Event()
 
     def set_nowplaying(self, song):
@@ -114,7 +122,7 @@ class QLSubmitQueue:
         else:
             # TODO: Forging timestamps for submission from PMPs
             return
-        self.queue.append(formatted)
+        self.journal.add(formatted)
         self.changed()
 
     def _format_song(self, song):
@@ -141,6 +149,7 @@ class QLSubmitQueue:
         self.handshake_delay = 1.0
         self.failures = 0
         self.handshake_sent = 0
+        self.last_submission = 0.0
         self.session_id, self.nowplaying_url, self.submit_url = None, None, None
 
         self.broken = False
@@ -154,30 +163,24 @@ class QLSubmitQueue:
         self._load_queue()
 
     def _load_queue(self):
+        if QLSubmitQueue.journal is None:
+            QLSubmitQueue.journal = Journal(self.JOURNAL_FILE)
         try:
             with open(self.SCROBBLER_CACHE_FILE, "rb") as disk_queue_file:
                 disk_queue = pickle_load(disk_queue_file)
             os.unlink(self.SCROBBLER_CACHE_FILE)
-            self.queue += disk_queue
         except (OSError, PickleError):
-            pass
-
-    @classmethod
-    def dump_queue(cls):
-        if cls.queue:
-            print_d(f"Saving scrobble queue to {cls.SCROBBLER_CACHE_FILE}")
-            try:
-                with open(cls.SCROBBLER_CACHE_FILE, "wb") as disk_queue_file:
-                    pickle_dump(cls.queue, disk_queue_file)
-            except (OSError, PickleError) as e:
-                print_w(f"Couldn't persist scrobble queue ({e})")
+            return
+        print_d(f"Moving {len(disk_queue)} scrobble(s) to {self.JOURNAL_FILE}")
+        for entry in disk_queue:
+            self.journal.add(entry)
 
     def _check_config(self):
         user = plugin_config.get("username")
         passw = md5(plugin_config.getbytes("password")).hexdigest()
         url = config_get_url()
         if not user or not passw or not url:
-            if self.queue and not self.broken:
+            if self.journal and not self.broken:
                 self.quick_dialog(
                     _(
                         "Please visit the Plugins window to set "
@@ -198,7 +201,7 @@ class QLSubmitQueue:
     def changed(self):
         """Signal that settings or queue contents were changed."""
         self._check_config()
-        pending = self.queue or (self.nowplaying_song and not self.nowplaying_sent)
+        pending = self.journal or (self.nowplaying_song and not self.nowplaying_sent)
         if not self.broken and not self.offline and pending:
             self.changed_event.set()
             return
@@ -231,7 +234,11 @@ class QLSubmitQueue:
                     )
                     continue
             self.changed_event.wait()
-            if self.queue:
+            if self.journal:
+                wait = self.last_submission + self.SUBMIT_INTERVAL - time.time()
+                if wait > 0:
+                    time.sleep(wait)
+                self.last_submission = time.time()
                 if self.send_submission():
                     self.failures = 0
                 else:
@@ -338,7 +345,8 @@ class QLSubmitQueue:
 
     def send_submission(self):
         data = {"s": self.session_id}
-        to_submit = self.queue[: min(len(self.queue), 50)]
+        batch = self.journal.peek(self.BATCH_SIZE)
+        to_submit = [song for _id, song in batch]
         for idx, song in enumerate(to_submit):
             for key, val in song.items():
                 data["%s[%d]" % (key, idx)] = val.encode("utf-8")
@@ -349,7 +357,7 @@ class QLSubmitQueue:
         print_d(f"Submitting song(s): {song_info}")
 
         if self._check_submit(self.submit_url, data):
-            del self.queue[: len(to_submit)]
+            self.journal.acknowledge(id_ for id_, _song in batch)
             return True
         return False
 
@@ -382,13 +390,9 @@ class QLScrobbler(EventPlugin):
     )
     PLUGIN_ICON = Icons.NETWORK_WORKGROUP
 
-    AUTOSAVE_INTERVAL = 30
-    """How often, in seconds, to save the queue (if any) to disk"""
-
     def __init__(self):
         self.__enabled = False
         self.queue = QLSubmitQueue()
-        self._tid = None
 
         def queue_run():
             try:
@@ -465,20 +469,10 @@ class QLScrobbler(EventPlugin):
     def enabled(self):
         self.__enabled = True
         print_d("Plugin enabled - accepting new songs.")
-        if not self._tid:
-            print_d("Starting scrobble autosaver")
-            self._tid = GLib.timeout_add_seconds(
-                self.AUTOSAVE_INTERVAL, lambda: QLSubmitQueue.dump_queue() or True
-            )
 
     def disabled(self):
         self.__enabled = False
         print_d("Plugin disabled - not accepting any new songs.")
-        if self._tid:
-            print_d("Stopping scrobble autosaver")
-            GLib.source_remove(self._tid)
-            self._tid = None
-        QLSubmitQueue.dump_queue()
 
     def PluginPreferences(self, parent):
         def changed(entry, key):
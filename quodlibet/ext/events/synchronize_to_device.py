@@ -6,9 +6,12 @@
 # the Free Software Foundation; either version 2 of the License, or
 # (at your option) any later version.
 
+import hashlib
 import os
 import shutil
+import time
 import unicodedata
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 
 from gi.repository import Gtk, Pango
@@ -36,6 +39,57 @@ from quodlibet.util.path import strip_win32_incompat_from_path
 
 PLUGIN_CONFIG_SECTION = "synchronize_to_device"
 
+_MAX_COPY_WORKERS = 2
+"""Files copied at the same time, devices rarely profit from more"""
+
+
+def _file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as h:
+        for chunk in iter(lambda: h.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def needs_copy(source, dest, compare_hash=False):
+    """Whether `dest` is missing or differs from `source`: by size, by being
+    older or (if `compare_hash` is set) by content.
+
+    Raises OSError.
+    """
+
+    try:
+        dest_stat = os.stat(dest)
+    except FileNotFoundError:
+        return True
+    try:
+        source_stat = os.stat(source)
+    except OSError:
+        # Nothing to compare with, keep what's there
+        return False
+    if source_stat.st_size != dest_stat.st_size:
+        return True
+    if source_stat.st_mtime > dest_stat.st_mtime:
+        return True
+    return compare_hash and _file_digest(source) != _file_digest(dest)
+
+
+def copy_if_changed(source, dest, compare_hash=False):
+    """Copies `source` to `dest` unless `needs_copy` says it's up to date.
+
+    Returns the number of bytes copied, or None if it was skipped.
+    Raises OSError.
+    """
+
+    if not needs_copy(source, dest, compare_hash):
+        return None
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    shutil.copyfile(source, dest)
+    try:
+        return os.path.getsize(source)
+    except OSError:
+        return 0
+
 
 class Entry:
     """
@@ -93,6 +147,7 @@ class SyncToDevice(EventPlugin, PluginConfigMixin):
     CONFIG_QUERY_PREFIX = "query_"
     CONFIG_PATH_KEY = "{}_{}".format(PLUGIN_CONFIG_SECTION, "path")
     CONFIG_PATTERN_KEY = "{}_{}".format(PLUGIN_CONFIG_SECTION, "pattern")
+    CONFIG_HASH_KEY = "compare_hash"
 
     path_query = os.path.join(get_user_dir(), "lists", "queries.saved")
     path_pattern = os.path.join(get_user_dir(), "lists", "renamepatterns")
@@ -105,6 +160,11 @@ class SyncToDevice(EventPlugin, PluginConfigMixin):
 
     default_export_pattern = os.path.join("<artist>", "<album>", "<title>")
 
+    _synced: set | frozenset = frozenset()
+    """Entries taken care of by the copying of the current synchronization"""
+    _sync_eta = None
+    """Estimated seconds left for copying, while copying"""
+
     model_cols = {
         "entry": (0, object),
         "tag": (1, str),
@@ -183,9 +243,24 @@ class SyncToDevice(EventPlugin, PluginConfigMixin):
             Icons.DIALOG_INFORMATION,
         )
 
+        # Change detection
+        hash_button = ConfigCheckButton(
+            _("Compare file contents to find changed files (slower)"),
+            PM.CONFIG_SECTION,
+            self._config_key(self.CONFIG_HASH_KEY),
+        )
+        hash_button.set_active(self.config_get_bool(self.CONFIG_HASH_KEY))
+        hash_button.set_tooltip_text(
+            _(
+                "Existing files are copied again if their size differs or the "
+                "original is newer. With this, their contents get compared too."
+            )
+        )
+
         # Destination path frame
         destination_vbox = Gtk.VBox(spacing=self.spacing_large)
         destination_vbox.pack_start(destination_path_hbox, False, False, 0)
+        destination_vbox.pack_start(hash_button, False, False, 0)
         destination_vbox.pack_start(destination_warn_label, False, False, 0)
         destination_vbox.pack_start(destination_info_label, False, False, 0)
         frame = qltk.Frame(label=_("Destination path:"), child=destination_vbox)
@@ -1069,12 +1144,110 @@ class SyncToDevice(EventPlugin, PluginConfigMixin):
         self.c_files_copy = self.c_files_skip = self.c_files_skip_previous = (
             self.c_files_dupes
         ) = self.c_files_delete = self.c_files_failed = 0
+        self.c_bytes_copied = 0
+        self._sync_eta = None
+
+        copies = []
+
+        def _collect_copy(model, path, iter_, *data):
+            entry = model[path][self._model_col_id("entry")]
+            if entry.tag == Entry.Tags.PENDING_COPY:
+                copies.append((iter_, entry))
+            return False
+
+        self.model.foreach(_collect_copy)
+        self._synced = {entry for iter_, entry in copies}
+        if not self._copy_entries(copies):
+            return False
         self.model.foreach(self._sync_entry)
         if not self.running:
             return False
         self._remove_empty_dirs()
         return True
 
+    def _copy_entries(self, copies):
+        """
+        Copy the files of the given entries in a thread pool, while keeping the
+        dialog responsive. Entries not started when stopping stay pending,
+        so the next synchronization picks up from there.
+
+        :param copies: A list of (Gtk.TreeIter, Entry) to copy.
+        :return: Whether all copies were attempted.
+        """
+        if not copies:
+            return True
+        compare_hash = self.config_get_bool(self.CONFIG_HASH_KEY)
+        self._sync_started = time.monotonic()
+        n_left = len(copies)
+
+        with ThreadPoolExecutor(_MAX_COPY_WORKERS) as pool:
+            futures = {}
+            for iter_, entry in copies:
+                expanded_path = os.path.expanduser(entry.export_path)
+                future = pool.submit(
+                    copy_if_changed, entry.filename, expanded_path, compare_hash
+                )
+                futures[future] = (iter_, entry)
+                entry.tag = Entry.Tags.IN_PROGRESS_SYNC
+                self._update_model_value(iter_, "tag", entry.tag)
+
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._copy_done(future, *futures[future])
+                n_left -= len(done)
+                if done:
+                    elapsed = time.monotonic() - self._sync_started
+                    n_done = len(copies) - n_left
+                    self._sync_eta = (elapsed / n_done * n_left) if n_left else None
+                    self._update_sync_summary()
+                self._run_pending_events()
+
+                stop = not self.running
+                if not stop and not self.destination_entry.get_text():
+                    print_d(_("A different plugin was selected - stop synchronization"))
+                    stop = True
+                if stop and pending:
+                    print_d(_("Stopped song synchronization"))
+                    for future in pending:
+                        if future.cancel():
+                            iter_, entry = futures[future]
+                            entry.tag = Entry.Tags.PENDING_COPY
+                            self._update_model_value(iter_, "tag", entry.tag)
+                    for future in wait(pending).done:
+                        if not future.cancelled():
+                            self._copy_done(future, *futures[future])
+                    self._sync_eta = None
+                    self._update_sync_summary()
+                    return False
+
+        self._sync_eta = None
+        return self.running
+
+    def _copy_done(self, future, iter_, entry):
+        """
+        Update an entry with the result of copying its file.
+        """
+        try:
+            size = future.result()
+        except Exception as ex:
+            entry.tag = Entry.Tags.RESULT_FAILURE + ": " + str(ex)
+            print_exc()
+            self.c_files_failed += 1
+        else:
+            if size is None:
+                entry.tag = Entry.Tags.RESULT_SKIP_EXISTING
+                self.c_files_skip += 1
+            else:
+                entry.tag = Entry.Tags.RESULT_SUCCESS
+                self.c_files_copy += 1
+                self.c_bytes_copied += size
+        print_d(
+            _('{tag} - "{filename}"').format(tag=entry.tag, filename=entry.filename)
+        )
+        self._update_model_value(iter_, "tag", entry.tag)
+
     def _sync_entry(self, model, path, iter_, *data):
         """
         Synchronize a single song.
@@ -1099,32 +1272,11 @@ class SyncToDevice(EventPlugin, PluginConfigMixin):
         if not entry.export_path and not entry.tag:
             return False
 
-        if entry.tag == Entry.Tags.PENDING_COPY:
-            # Export, skipping existing files
-            expanded_path = os.path.expanduser(entry.export_path)
-            if os.path.exists(expanded_path):
-                entry.tag = Entry.Tags.RESULT_SKIP_EXISTING
-                self._update_model_value(iter_, "tag", entry.tag)
-                self.c_files_skip += 1
-            else:
-                entry.tag = Entry.Tags.IN_PROGRESS_SYNC
-                self._update_model_value(iter_, "tag", entry.tag)
-
-                song_folders = os.path.dirname(expanded_path)
-                os.makedirs(song_folders, exist_ok=True)
-                try:
-                    shutil.copyfile(entry.filename, expanded_path)
-                except Exception as ex:
-                    entry.tag = Entry.Tags.RESULT_FAILURE + ": " + str(ex)
-                    self._update_model_value(iter_, "tag", entry.tag)
-                    print_exc()
-                    self.c_files_failed += 1
-                else:
-                    entry.tag = Entry.Tags.RESULT_SUCCESS
-                    self._update_model_value(iter_, "tag", entry.tag)
-                    self.c_files_copy += 1
+        if entry in self._synced:
+            # Copied (or attempted to) by _copy_entries
+            return False
 
-        elif entry.tag == Entry.Tags.SKIP_DUPLICATE:
+        if entry.tag == Entry.Tags.SKIP_DUPLICATE:
             self.c_files_dupes += 1
 
         elif entry.tag == Entry.Tags.PENDING_DELETE:
@@ -1251,6 +1403,15 @@ class SyncToDevice(EventPlugin, PluginConfigMixin):
                 ).format(count=counter)
             )
 
+        if self._sync_eta is not None:
+            elapsed = max(time.monotonic() - self._sync_started, 1e-3)
+            sync_summary.append(
+                _("{speed}/s, about {time} left").format(
+                    speed=util.format_size(self.c_bytes_copied / elapsed),
+                    time=util.format_time_display(self._sync_eta),
+                )
+            )
+
         sync_summary_text = self.summary_sep_list.join(sync_summary)
         sync_summary_text = sync_summary_prefix + sync_summary_text
         self.status_progress.set_label(sync_summary_text)
@@ -5,6 +5,12 @@
 # the Free Software Foundation; either version 2 of the License, or
 # (at your option) any later version.
 
+import errno
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
 from gi.repository import Gtk
 
 from quodlibet import _
@@ -16,10 +22,95 @@ from quodlibet.qltk.entry import UndoEntry
 from quodlibet.qltk.notif import Task
 from quodlibet.qltk.window import Dialog
 from quodlibet.qltk.msg import ErrorMessage
-from quodlibet.util import copool
+from quodlibet.util import copool, format_size
 from quodlibet.util.dprint import print_d
 
-from shutil import copyfile
+_MAX_COPY_WORKERS = 4
+"""Files copied at the same time to solid state storage"""
+
+_DEFAULT_COPY_WORKERS = 2
+"""Files copied at the same time where the kind of storage is unknown"""
+
+_NO_COPY_FILE_RANGE = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP}
+"""Errors of copy_file_range() meaning it can't be used for the files"""
+
+
+def copy_workers(directory):
+    """How many files to copy to `directory` at the same time.
+
+    Spinning disks and removable drives (USB sticks) get slower with
+    concurrent writes, so they get one at a time.
+    """
+
+    try:
+        dev = os.stat(directory).st_dev
+        block = f"/sys/dev/block/{os.major(dev)}:{os.minor(dev)}"
+    except (OSError, AttributeError):
+        return _DEFAULT_COPY_WORKERS
+
+    # partitions have the queue settings of their disk
+    for path in [block, os.path.join(block, "..")]:
+        try:
+            with open(os.path.join(path, "queue", "rotational")) as h:
+                rotational = h.read().strip() == "1"
+        except OSError:
+            continue
+        try:
+            with open(os.path.join(path, "removable")) as h:
+                removable = h.read().strip() == "1"
+        except OSError:
+            removable = False
+        return 1 if rotational or removable else _MAX_COPY_WORKERS
+    return _DEFAULT_COPY_WORKERS
+
+
+def _copy_file_range(source, dest):
+    """Returns the number of bytes copied, or None if copy_file_range()
+    didn't copy everything (some file systems make it copy nothing)"""
+
+    copied = 0
+    with open(source, "rb") as fsrc, open(dest, "wb") as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        while True:
+            count = os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1 << 30)
+            if not count:
+                break
+            copied += count
+    return copied if copied == size else None
+
+
+def copy_file(source, dest):
+    """Copies the contents of `source` to `dest`, inside the kernel
+    if possible. Returns the number of bytes copied. Raises OSError."""
+
+    if hasattr(os, "copy_file_range"):
+        try:
+            copied = _copy_file_range(source, dest)
+        except OSError as e:
+            if e.errno not in _NO_COPY_FILE_RANGE:
+                raise
+        else:
+            if copied is not None:
+                return copied
+            print_d(f"copy_file_range() fell short for {source!r}, copying again")
+    # uses os.sendfile() where available
+    shutil.copyfile(source, dest)
+    return os.path.getsize(dest)
+
+
+def is_unchanged(source, dest):
+    """Whether `dest` looks like an up to date copy of `source`:
+    it has the same size and isn't older"""
+
+    try:
+        source_stat = os.stat(source)
+        dest_stat = os.stat(dest)
+    except OSError:
+        return False
+    return (
+        source_stat.st_size == dest_stat.st_size
+        and source_stat.st_mtime <= dest_stat.st_mtime
+    )
 
 
 class ExportToFolderDialog(Dialog):
@@ -105,32 +196,56 @@ class ExportToFolder(PlaylistPlugin):
     REQUIRES_ACTION = True
 
     def __copy_songs(self, task, songs, directory, pattern, parent=None):
-        """Generator for copool to copy songs to the folder"""
+        """Generator for copool to copy songs to the folder in a thread pool"""
         self.__cancel = False
         total = len(songs)
+        workers = copy_workers(directory)
         print_d(
-            "Copying %d song(s) to directory %s. "
-            "This might take a while..." % (total, directory)
+            f"Copying {total} song(s) to directory {directory} "
+            f"with {workers} worker(s). This might take a while..."
+        )
+        started = time.monotonic()
+        copied = skipped = 0
+        pool = ThreadPoolExecutor(workers)
+        try:
+            pending = {
+                pool.submit(self._copy_file, song, directory, i + 1, pattern)
+                for i, song in enumerate(songs)
+            }
+            while pending:
+                if self.__cancel:
+                    print_d("Cancelled export to directory.")
+                    self.__cancel = False
+                    break
+                done, pending = wait(pending, timeout=0)
+                try:
+                    for future in done:
+                        size = future.result()
+                        if size is None:
+                            skipped += 1
+                        else:
+                            copied += size
+                except OSError as e:
+                    print_d(f"Unable to copy file: {e}")
+                    ErrorMessage(
+                        parent,
+                        _("Unable to export playlist"),
+                        _("Ensure you have write access to the destination."),
+                    ).run()
+                    break
+                speed = copied / max(time.monotonic() - started, 1e-3)
+                task.desc = "{} ({}/s)".format(
+                    _("Export Playlist to Folder"), format_size(speed)
+                )
+                task.update(float(total - len(pending)) / total)
+                yield True
+        finally:
+            # copies already running get finished in the background
+            pool.shutdown(wait=False, cancel_futures=True)
+        print_d(
+            f"Finished export to directory: {format_size(copied)} copied, "
+            f"{skipped} unchanged song(s) skipped."
         )
-        for i, song in enumerate(songs):
-            if self.__cancel:
-                print_d("Cancelled export to directory.")
-                self.__cancel = False
-                break
-            # Actually do the copy
-            try:
-                self._copy_file(song, directory, i + 1, pattern)
-            except OSError as e:
-                print_d(f"Unable to copy file: {e}")
-                ErrorMessage(
-                    parent,
-                    _("Unable to export playlist"),
-                    _("Ensure you have write access to the destination."),
-                ).run()
-                break
-            task.update(float(i) / total)
-            yield True
-        print_d("Finished export to directory.")
         task.finish()
 
     def __cancel_copy(self):
@@ -138,10 +253,15 @@ class ExportToFolder(PlaylistPlugin):
         self.__cancel = True
 
     def _copy_file(self, song, directory, index, pattern):
+        """Returns the number of bytes copied, or None if the file
+        was already there"""
         filename = song["~filename"]
-        print_d(f"Copying {filename}.")
         new_name = pattern.format(song)
-        copyfile(filename, "%s/%04d - %s" % (directory, index, new_name))
+        target = "%s/%04d - %s" % (directory, index, new_name)
+        if is_unchanged(filename, target):
+            return None
+        print_d(f"Copying {filename}.")
+        return copy_file(filename, target)
 
     def plugin_playlist(self, playlist):
         pattern_text = CONFIG.default_pattern
@@ -161,6 +281,7 @@ class ExportToFolder(PlaylistPlugin):
                 pattern,
                 self.plugin_window,
                 funcid="export-playlist-folder",
+                timeout=100,
             )
 
         dialog.destroy()
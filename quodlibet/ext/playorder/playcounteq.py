@@ -7,7 +7,6 @@
 # (at your option) any later version.
 
 import math
-import random
 
 from gi.repository import Gtk
 
@@ -31,14 +30,21 @@ class PlaycountEqualizer(ShufflePlugin, OrderRemembered, PluginConfigMixin):
 
     _MAGNITUDE_DEFAULT = 1
 
+    _weight_params: tuple[int, float] = (0, 1.0)
+    """The highest remaining play count and the magnitude in use"""
+
+    def _weight(self, song):
+        max_count, magn = self._weight_params
+        return math.ceil(math.pow(max(0, max_count - song("~#playcount") + 1), magn))
+
     # Select the next track.
     def next(self, playlist, current):
         super().next(playlist, current)
 
-        remaining = self.remaining(playlist)
+        state = self._shuffle_state(playlist, weight=self._weight, tally="~#playcount")
 
         # Don't try to search through an empty / played playlist.
-        if len(remaining) <= 0:
+        if not state:
             return None
 
         mag_cfg = float(self.config_get("magnitude", self._MAGNITUDE_DEFAULT))
@@ -46,26 +52,15 @@ class PlaycountEqualizer(ShufflePlugin, OrderRemembered, PluginConfigMixin):
         # weights will be calculated as a power of this value.
         magn = (mag_cfg * 2.0) / 100.0 + 1.0
 
-        # Set-up the search information.
-        max_count = max([song("~#playcount") for song in remaining.values()])
-
-        weights = {
-            i: math.ceil(math.pow(max_count - song("~#playcount") + 1, magn))
-            for i, song in remaining.items()
-        }
-
-        weights_sum = sum(weights.values())
-        choice = int(max(1, math.ceil(weights_sum * random.random())))
-
-        print_d(f"Weighted random: {choice} for the weights sum: {weights_sum}")
+        # Weights are relative to the highest remaining play count,
+        # so only recalculate them all if that changed.
+        params = (max(state.tally), magn)
+        if params != self._weight_params:
+            print_d(f"Reweighting for max play count / magnitude: {params}")
+            self._weight_params = params
+            state.reweight()
 
-        # Search for a track.
-        for i, weight in weights.items():
-            choice -= weight
-            if choice <= 0:
-                return playlist.get_iter([i])
-        else:  # This should only happen if all songs have equal play counts.
-            return playlist.get_iter([random.choice(list(remaining.keys()))])
+        return playlist.get_iter([state.pick()])
 
     @classmethod
     def PluginPreferences(cls, parent):
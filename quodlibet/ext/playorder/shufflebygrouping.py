@@ -6,8 +6,6 @@
 # the Free Software Foundation; either version 2 of the License, or
 # (at your option) any later version.
 
-import random
-
 from gi.repository import Gtk, GLib
 
 from quodlibet import _
@@ -63,7 +61,7 @@ class ShuffleByGrouping(ShufflePlugin, OrderRemembered):
 
         # Keep track of played songs
         OrderRemembered.next(self, playlist, current_song)
-        remaining = OrderRemembered.remaining(self, playlist)
+        remaining = self._shuffle_state(playlist)
 
         # Check if playlist is finished or empty
         if not remaining:
@@ -81,7 +79,7 @@ class ShuffleByGrouping(ShufflePlugin, OrderRemembered):
 
         # Pick random song at the start of a new group
         while True:
-            song_location = random.choice(list(remaining.keys()))
+            song_location = remaining.pick()
             new_song = playlist.get_iter(song_location)
             new_song_prev = (
                 playlist.get_iter(song_location - 1) if song_location >= 1 else None
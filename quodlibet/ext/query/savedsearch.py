@@ -6,13 +6,9 @@
 # the Free Software Foundation; either version 2 of the License, or
 # (at your option) any later version.
 
-import os.path
-
-from quodlibet import _, print_w
+from quodlibet import _, app, print_w
+from quodlibet.library.saved import SavedSearches
 from quodlibet.plugins.query import QueryPlugin, QueryPluginError, markup_for_syntax
-from quodlibet.query import Query
-from quodlibet.query._match import Error as QueryError
-from quodlibet import get_user_dir
 
 
 class IncludeSavedSearchQuery(QueryPlugin):
@@ -31,27 +27,17 @@ class IncludeSavedSearchQuery(QueryPlugin):
     def parse_body(self, body, query_path_=None):
         if body is None:
             raise QueryPluginError
-        body = body.strip().lower()
         # Use provided query file for testing
-        if query_path_:
-            query_path = query_path_
+        if query_path_ or app.library is None:
+            searches = SavedSearches(path=query_path_)
         else:
-            query_path = os.path.join(get_user_dir(), "lists", "queries.saved")
+            searches = app.library.saved_searches
         try:
-            with open(query_path, encoding="utf-8") as query_file:
-                for query_string in query_file:
-                    name = next(query_file).strip().lower()
-                    if name == body:
-                        try:
-                            return Query(query_string.strip())
-                        except QueryError as e:
-                            raise QueryPluginError from e
-            # We've searched the whole file and haven't found a match
+            return searches.get(body)
+        except KeyError as e:
             print_w(f"None found for {body}")
-            raise QueryPluginError
-        except OSError as e:
             raise QueryPluginError from e
-        except StopIteration:
+        except (OSError, ValueError) as e:
             # The file has an odd number of lines. This shouldn't happen unless
             # it has been externally modified
-            raise QueryPluginError from None
+            raise QueryPluginError from e
@@ -13,10 +13,12 @@ if not Gst.ElementFactory.find("chromaprint"):
 
     raise plugins.MissingGstreamerElementPluginError("chromaprint", "bad")
 
+from .analyze import LibraryFingerprinter
+from .cache import get_cache
 from .submit import FingerprintDialog
 from .util import get_api_key
 
-from quodlibet import _
+from quodlibet import _, app, ngettext
 from quodlibet import config
 from quodlibet import util
 from quodlibet.qltk import Button, Frame, Icons
@@ -26,6 +28,69 @@ from quodlibet.plugins.songsmenu import SongsMenuPlugin
 from quodlibet.plugins.songshelpers import is_writable, is_finite, each_song
 
 
+_library_job = None
+
+
+def get_library_job() -> LibraryFingerprinter:
+    """The library fingerprinting job, which keeps going while the
+    preferences are closed"""
+
+    global _library_job
+    if _library_job is None:
+        _library_job = LibraryFingerprinter(get_cache())
+    return _library_job
+
+
+class LibraryFingerprintBox(Gtk.HBox):
+    """Shows the progress of fingerprinting the whole library and starts
+    or stops it"""
+
+    def __init__(self):
+        super().__init__(spacing=6)
+
+        self._job = job = get_library_job()
+        self._label = label = Gtk.Label()
+        label.set_alignment(0.0, 0.5)
+        label.set_line_wrap(True)
+        self._button = button = Gtk.Button()
+        button.connect("clicked", self.__clicked)
+        self.pack_start(label, True, True, 0)
+        self.pack_start(button, False, True, 0)
+
+        util.connect_destroy(job, "progress", self.__update)
+        util.connect_destroy(job, "finished", self.__update)
+        self.__update()
+
+    def __update(self, *args):
+        job = self._job
+        if job.is_running:
+            self._label.set_text(
+                _("Fingerprinting %(done)d/%(total)d songs…")
+                % {"done": job.done, "total": job.total}
+            )
+            self._button.set_label(_("_Stop"))
+        else:
+            self._label.set_text(
+                ngettext(
+                    "%d song fingerprinted", "%d songs fingerprinted", len(job.cache)
+                )
+                % len(job.cache)
+            )
+            self._button.set_label(_("_Fingerprint Library"))
+        self._button.set_use_underline(True)
+
+    def __clicked(self, button):
+        if self._job.is_running:
+            self._job.stop()
+        else:
+            self._job.start(app.library.values())
+        self.__update()
+
+
+def _cache_frame():
+    return Frame(_("Fingerprint Cache"), child=LibraryFingerprintBox())
+
+
 class AcoustidSearch(SongsMenuPlugin):
     PLUGIN_ID = "AcoustidSearch"
     PLUGIN_NAME = _("Acoustic Fingerprint Lookup")
@@ -46,6 +111,10 @@ class AcoustidSearch(SongsMenuPlugin):
     def __plugin_done(self, *args):
         self.plugin_finish()
 
+    @classmethod
+    def PluginPreferences(cls, win):
+        return _cache_frame()
+
 
 class AcoustidSubmit(SongsMenuPlugin):
     PLUGIN_ID = "AcoustidSubmit"
@@ -95,5 +164,6 @@ class AcoustidSubmit(SongsMenuPlugin):
         key_box.pack_start(button, False, True, 0)
 
         box.pack_start(Frame(_("AcoustID Web Service"), child=key_box), True, True, 0)
+        box.pack_start(_cache_frame(), True, True, 0)
 
         return box
@@ -8,8 +8,9 @@
 
 import multiprocessing
 
-from gi.repository import Gst, GObject
+from gi.repository import Gst, GObject, GLib
 
+from quodlibet import print_d
 from quodlibet.plugins import MissingGstreamerElementPluginError
 from quodlibet.util import connect_obj
 
@@ -157,16 +158,20 @@ class FingerPrintPool(GObject.GObject):
         "fingerprint-error": (GObject.SignalFlags.RUN_LAST, None, (object, object)),
     }
 
-    def __init__(self, max_workers=None):
+    def __init__(self, max_workers=None, cache=None):
         super().__init__()
 
         if max_workers is None:
             max_workers = int(multiprocessing.cpu_count() * 1.5)
         self._max_workers = max_workers
+        self._cache = cache
+        """A FingerprintCache for skipping and storing results, or None"""
 
         self._idle = set()
         self._workers = set()
         self._queue = []
+        self._cached = {}
+        """Sources emitting results from the cache, by result"""
 
     def _get_worker(self):
         """An idle FingerPrintPipeline or None"""
@@ -194,6 +199,12 @@ class FingerPrintPool(GObject.GObject):
     def push(self, song):
         """Add a new song to the queue"""
 
+        result = self._cache.get(song) if self._cache is not None else None
+        if result is not None:
+            # Signal it later like the others, the caller might not be ready
+            self._cached[result] = GLib.idle_add(self._emit_cached, result)
+            return
+
         worker = self._get_worker()
         if worker:
             self._start_song(worker, song)
@@ -207,14 +218,28 @@ class FingerPrintPool(GObject.GObject):
         Can be called multiple times.
         """
 
+        for source_id in self._cached.values():
+            GLib.source_remove(source_id)
+        self._cached.clear()
+        self._stop_workers()
+
+    def _stop_workers(self):
         for worker in self._workers:
             worker.stop()
         self._workers.clear()
         self._idle.clear()
 
+    def _emit_cached(self, result):
+        del self._cached[result]
+        self.emit("fingerprint-started", result.song)
+        self.emit("fingerprint-done", result)
+        return False
+
     def _callback(self, worker, song, result, error):
         self._idle.add(worker)
         if result:
+            if self._cache is not None:
+                self._cache.put(result)
             self.emit("fingerprint-done", result)
         else:
             self.emit("fingerprint-error", song, error)
@@ -226,7 +251,81 @@ class FingerPrintPool(GObject.GObject):
             self._start_song(worker, song)
         elif len(self._idle) == len(self._workers):
             # all done, all idle, kill em
+            self._stop_workers()
+
+
+class LibraryFingerprinter(GObject.GObject):
+    """Fingerprints the songs not in the cache yet in the background, as
+    many at once as there are CPU cores.
+
+    Every result gets stored right away, so starting again after stopping
+    (or quitting) only goes through the songs still missing.
+    """
+
+    __gsignals__ = {
+        # songs done, songs to do
+        "progress": (GObject.SignalFlags.RUN_LAST, None, (int, int)),
+        "finished": (GObject.SignalFlags.RUN_LAST, None, ()),
+    }
+
+    def __init__(self, cache, max_workers=None):
+        super().__init__()
+
+        self.cache = cache
+        self._max_workers = max_workers or multiprocessing.cpu_count()
+        self._pool = None
+        self._todo = iter(())
+        self._running = 0
+        self.done = 0
+        self.total = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._pool is not None
+
+    def start(self, songs):
+        """Starts fingerprinting the files of `songs` not in the cache"""
+
+        self.stop()
+        todo = [s for s in songs if s.is_file and s not in self.cache]
+        print_d(f"Fingerprinting {len(todo)} song(s)")
+        self._todo = iter(todo)
+        self.done = 0
+        self.total = len(todo)
+
+        self._pool = pool = FingerPrintPool(self._max_workers, self.cache)
+        pool.connect("fingerprint-done", self._song_done)
+        pool.connect("fingerprint-error", self._song_done)
+        self._fill()
+
+    def stop(self):
+        """Stops without signalling. Can be called multiple times."""
+
+        if self._pool is not None:
+            self._pool.stop()
+            self._pool = None
+        self._todo = iter(())
+        self._running = 0
+
+    def _fill(self):
+        while self._running < self._max_workers:
+            song = next(self._todo, None)
+            if song is None:
+                break
+            self._running += 1
+            self._pool.push(song)
+
+        if not self._running:
+            print_d(f"Fingerprinted {self.done} song(s)")
             self.stop()
+            self.emit("finished")
+
+    def _song_done(self, pool, *args):
+        self._running -= 1
+        self.done += 1
+        self.emit("progress", self.done, self.total)
+        if self.is_running:
+            self._fill()
 
 
 if not FingerPrintPipeline.setup_chromaprint_element():
@@ -0,0 +1,98 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+
+"""Fingerprints computed before, so looking up or submitting songs again
+doesn't need to decode them again"""
+
+import os
+from collections.abc import Iterable
+
+import quodlibet
+from quodlibet.util.journal import COMPACT_AFTER, RecordFile
+
+from .analyze import FingerPrintResult
+
+CACHE_FILE = os.path.join(quodlibet.get_user_dir(), "fingerprint_cache")
+
+
+def _record(song, result):
+    return {
+        "path": song("~filename"),
+        "mtime": song("~#mtime", 0),
+        "length": song("~#length", 0),
+        "chromaprint": result.chromaprint,
+        "duration": result.length,
+    }
+
+
+class FingerprintCache(RecordFile):
+    """Chromaprint fingerprints of songs by path. An entry only gets used
+    while the modification time and length of the song stay the same.
+
+    New entries get appended to the file, which gets rewritten once enough
+    of its entries were replaced. Has to be used from the main loop.
+    """
+
+    def __init__(self, path, compact_after: int = COMPACT_AFTER):
+        super().__init__(path, compact_after)
+        self._records: dict[str, dict] = {}
+        self._load()
+
+    def _load_record(self, record: dict):
+        path = record["path"]
+        self._stale += path in self._records
+        self._records[path] = record
+
+    def _current_records(self) -> Iterable[dict]:
+        return self._records.values()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, song) -> bool:
+        return self._lookup(song) is not None
+
+    def _lookup(self, song) -> dict | None:
+        record = self._records.get(song("~filename"))
+        if (
+            record is None
+            or record.get("mtime") != song("~#mtime", 0)
+            or record.get("length") != song("~#length", 0)
+        ):
+            return None
+        return record
+
+    def get(self, song) -> FingerPrintResult | None:
+        """The cached result for `song`, or None if the song (or its file)
+        changed since or was never fingerprinted"""
+
+        record = self._lookup(song)
+        if record is None:
+            return None
+        return FingerPrintResult(song, record["chromaprint"], record["duration"])
+
+    def put(self, result: FingerPrintResult):
+        """Stores `result`, replacing any entry for its song"""
+
+        record = _record(result.song, result)
+        path = record["path"]
+        if self._records.get(path) == record:
+            return
+        self._stale += path in self._records
+        self._records[path] = record
+        if not (self._should_compact() and self._compact()):
+            self._append([record])
+
+
+_cache = None
+
+
+def get_cache() -> FingerprintCache:
+    """The cache shared by lookups, submissions and the library job"""
+
+    global _cache
+    if _cache is None:
+        _cache = FingerprintCache(CACHE_FILE)
+    return _cache
@@ -10,6 +10,7 @@ from contextlib import contextmanager
 from gi.repository import Gtk, Pango, Gdk
 
 from .analyze import FingerPrintPool
+from .cache import get_cache
 from .acoustid import AcoustidLookupThread
 from .util import get_write_mb_tags, get_group_by_dir
 from quodlibet import _
@@ -263,7 +264,7 @@ class SearchWindow(Window):
 
         sw.add(view)
 
-        self.pool = pool = FingerPrintPool()
+        self.pool = pool = FingerPrintPool(cache=get_cache())
         pool.connect("fingerprint-done", self.__fp_done_cb)
         pool.connect("fingerprint-error", self.__fp_error_cb)
         pool.connect("fingerprint-started", self.__fp_started_cb)
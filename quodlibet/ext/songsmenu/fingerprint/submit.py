@@ -14,6 +14,7 @@ from quodlibet.util import connect_obj, print_w
 
 from .acoustid import AcoustidSubmissionThread
 from .analyze import FingerPrintPool
+from .cache import get_cache
 
 
 def get_stats(results):
@@ -79,7 +80,7 @@ class FingerprintDialog(Window):
 
         self.__update_stats()
 
-        pool = FingerPrintPool()
+        pool = FingerPrintPool(cache=get_cache())
 
         bbox = Gtk.HButtonBox()
         bbox.set_layout(Gtk.ButtonBoxStyle.END)
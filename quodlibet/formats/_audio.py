@@ -204,6 +204,12 @@ class AudioFile(dict, ImageContainer, HasKey):
     def sort_key(self):
         return [self.album_key, self.__song_key()]
 
+    @util.cached_property
+    def search_forms(self) -> dict[str, tuple[Any, str]]:
+        """Tag values in their `unisearch.search_form`, by tag name,
+        as `(value, search form)`. Only valid while the value is the same."""
+        return {}
+
     @staticmethod
     def sort_by_func(tag):
         """Returns a fast sort function for a specific tag (or pattern).
@@ -248,6 +254,7 @@ class AudioFile(dict, ImageContainer, HasKey):
         pop = self.__dict__.pop
         pop("album_key", None)
         pop("sort_key", None)
+        pop("search_forms", None)
 
     def __delitem__(self, key):
         dict.__delitem__(self, key)
@@ -255,6 +262,7 @@ class AudioFile(dict, ImageContainer, HasKey):
         pop = self.__dict__.pop
         pop("album_key", None)
         pop("sort_key", None)
+        pop("search_forms", None)
 
     @property
     def key(self) -> K:  # type: ignore
@@ -54,10 +54,15 @@ class Library(GObject.GObject, DictMixin, Generic[K, V]):
     that iterating over it yields values and not keys.
     """
 
+    # RUN_FIRST, so subclasses can update their own state in do_<signal>
+    # before anybody else gets told about the change. This only changes
+    # the handler order for libraries with such class handlers (see
+    # SongLibrary), as handlers connected normally run in connection order
+    # either way and ones connected with connect_after() still run last.
     __gsignals__ = {
-        "changed": (GObject.SignalFlags.RUN_LAST, None, (object,)),
-        "removed": (GObject.SignalFlags.RUN_LAST, None, (object,)),
-        "added": (GObject.SignalFlags.RUN_LAST, None, (object,)),
+        "changed": (GObject.SignalFlags.RUN_FIRST, None, (object,)),
+        "removed": (GObject.SignalFlags.RUN_FIRST, None, (object,)),
+        "added": (GObject.SignalFlags.RUN_FIRST, None, (object,)),
     }
 
     librarian: Optional["quodlibet.library.librarians.Librarian"] = None
@@ -11,10 +11,13 @@
 Librarians for libraries.
 """
 
+import heapq
 import itertools
+import time
+from collections import Counter
 from collections.abc import Iterable, Iterator, Generator
 
-from gi.repository import GObject
+from gi.repository import GObject, GLib
 
 from quodlibet.library.base import Library
 from quodlibet.library.playlist import PlaylistLibrary
@@ -22,6 +25,37 @@ from quodlibet.util.dprint import print_d, print_w
 from senf import fsnative
 
 
+class SignalStats:
+    """Counts the signals of a librarian and the time its handlers took"""
+
+    def __init__(self):
+        self.emissions: Counter[str] = Counter()
+        """Number of emissions per signal"""
+
+        self.items: Counter[str] = Counter()
+        """Number of items passed per signal"""
+
+        self.calls: Counter[tuple[str, str]] = Counter()
+        """Number of calls per (signal, handler name)"""
+
+        self.seconds: Counter[tuple[str, str]] = Counter()
+        """Time spent per (signal, handler name)"""
+
+    def emitted(self, signal: str, items) -> None:
+        self.emissions[signal] += 1
+        self.items[signal] += len(items)
+
+    def handled(self, signal: str, name: str, seconds: float) -> None:
+        self.calls[signal, name] += 1
+        self.seconds[signal, name] += seconds
+
+    def slowest(self, count: int = 5) -> list[tuple[tuple[str, str], float]]:
+        """Returns the (signal, handler name) and seconds of the handlers
+        which took the most time"""
+
+        return self.seconds.most_common(count)
+
+
 class Librarian(GObject.GObject):
     """The librarian is a nice interface to all active libraries.
 
@@ -31,8 +65,12 @@ class Librarian(GObject.GObject):
     ones found in libraries that group the results of the real
     libraries.
 
+    With coalescing enabled, the items of the signals get collected
+    and the signals emitted once per main loop iteration instead.
+
     Attributes:
     libraries -- a dict mapping library names to libraries
+    stats -- a `SignalStats` of the emitted signals
     """
 
     __gsignals__ = {
@@ -44,10 +82,116 @@ class Librarian(GObject.GObject):
     def __init__(self):
         super().__init__()
         self.libraries: dict[str, Library] = {}
+        self.stats = SignalStats()
         self.__signals = {}
+        self.__coalesce = False
+        # Ordered sets of the items of pending signals
+        self.__pending: dict[str, dict] = {"removed": {}, "added": {}, "changed": {}}
+        self.__flush_id = None
+        # The handlers passed to connect() by ID, as they get wrapped
+        self.__handlers: dict[int, object] = {}
 
     def destroy(self) -> None:
-        pass
+        self.flush()
+        if self.stats.emissions:
+            print_d(
+                f"Emitted {dict(self.stats.emissions)}, "
+                f"slowest handlers: {self.stats.slowest()}"
+            )
+
+    def connect(self, detailed_signal, handler, *args):
+        timed = self.__timed(detailed_signal, handler)
+        handler_id = super().connect(detailed_signal, timed, *args)
+        if timed is not handler:
+            self.__handlers[handler_id] = handler
+        return handler_id
+
+    def connect_after(self, detailed_signal, handler, *args):
+        timed = self.__timed(detailed_signal, handler)
+        handler_id = super().connect_after(detailed_signal, timed, *args)
+        if timed is not handler:
+            self.__handlers[handler_id] = handler
+        return handler_id
+
+    def disconnect(self, handler_id):
+        self.__handlers.pop(handler_id, None)
+        super().disconnect(handler_id)
+
+    handler_disconnect = disconnect
+
+    def __ids_of(self, handler) -> list[int]:
+        return [i for i, h in self.__handlers.items() if h == handler]
+
+    # The *_by_func() methods look for the wrapped handlers otherwise
+
+    def disconnect_by_func(self, handler):
+        ids = self.__ids_of(handler)
+        if not ids:
+            return super().disconnect_by_func(handler)
+        for handler_id in ids:
+            self.disconnect(handler_id)
+        return len(ids)
+
+    def handler_block_by_func(self, handler):
+        ids = self.__ids_of(handler)
+        if not ids:
+            return super().handler_block_by_func(handler)
+        for handler_id in ids:
+            self.handler_block(handler_id)
+        return len(ids)
+
+    def handler_unblock_by_func(self, handler):
+        ids = self.__ids_of(handler)
+        if not ids:
+            return super().handler_unblock_by_func(handler)
+        for handler_id in ids:
+            self.handler_unblock(handler_id)
+        return len(ids)
+
+    def __timed(self, signal, handler):
+        if signal not in self.__pending:
+            return handler
+
+        name = getattr(handler, "__qualname__", repr(handler))
+        stats = self.stats
+
+        def timed(*args):
+            start = time.perf_counter()
+            try:
+                return handler(*args)
+            finally:
+                stats.handled(signal, name, time.perf_counter() - start)
+
+        return timed
+
+    def set_coalescing(self, coalesce: bool) -> None:
+        """Whether to collect the items of signals from the libraries and
+        emit them together, once per main loop iteration.
+
+        Removed items get emitted before added ones, and those before
+        changed ones. Items added and removed again in the meantime
+        get left out, like changed items which are added or removed.
+        """
+
+        self.__coalesce = coalesce
+        if not coalesce:
+            self.flush()
+
+    def flush(self) -> None:
+        """Emits the pending signals now"""
+
+        if self.__flush_id is not None:
+            GLib.source_remove(self.__flush_id)
+            self.__flush_id = None
+        changed, removed = self.__pending["changed"], self.__pending["removed"]
+        for item in [i for i in changed if i in removed]:
+            # Removed items don't change anymore
+            del changed[item]
+        for signal, pending in self.__pending.items():
+            if pending:
+                items = list(pending)
+                pending.clear()
+                self.__emit(signal, items)
 
     def register(self, library: Library, name: str) -> None:
         """Register a library with this librarian."""
@@ -69,19 +213,60 @@ class Librarian(GObject.GObject):
             library.disconnect(signal_id)
         del self.__signals[library]
 
-    # FIXME: We can be smarter about this -- queue a list of items
-    # and fire the signal after a short wait, to take advantage of
-    # a case where many libraries fire a signal at the same time (or
-    # one fires a signal often).
+    def __emit(self, signal: str, items) -> None:
+        self.stats.emitted(signal, items)
+        self.emit(signal, items)
+
+    def __schedule_flush(self) -> None:
+        if self.__flush_id is None:
+
+            def idle_flush():
+                self.__flush_id = None
+                self.flush()
+                return False
+
+            self.__flush_id = GLib.idle_add(
+                idle_flush, priority=GLib.PRIORITY_HIGH_IDLE
+            )
 
     def __changed(self, _library: Library, items: Iterable) -> None:
-        self.emit("changed", items)
+        if not self.__coalesce:
+            self.__emit("changed", items)
+            return
+        added = self.__pending["added"]
+        changed = self.__pending["changed"]
+        for item in items:
+            if item not in added:
+                changed[item] = None
+        self.__schedule_flush()
 
     def __added(self, _library: Library, items: Iterable) -> None:
-        self.emit("added", items)
+        if not self.__coalesce:
+            self.__emit("added", items)
+            return
+        added = self.__pending["added"]
+        changed = self.__pending["changed"]
+        for item in items:
+            changed.pop(item, None)
+            added[item] = None
+        self.__schedule_flush()
 
     def __removed(self, _library: Library, items: Iterable) -> None:
-        self.emit("removed", items)
+        if not self.__coalesce:
+            self.__emit("removed", items)
+            return
+        removed = self.__pending["removed"]
+        added = self.__pending["added"]
+        changed = self.__pending["changed"]
+        for item in items:
+            changed.pop(item, None)
+            if item in added and item not in removed:
+                # Nobody got told about it yet
+                del added[item]
+            else:
+                added.pop(item, None)
+                removed[item] = None
+        self.__schedule_flush()
 
     def changed(self, items: Iterable) -> None:
         """Triage the items and inform their real libraries."""
@@ -165,6 +350,24 @@ class SongLibrarian(Librarian):
             value for lib in self.libraries.values() for value in lib.tag_values(tag)
         }
 
+    def sorted_tag_values(self, tag) -> list[str]:
+        """Return a list of all text values for the given tag,
+        sorted case-insensitively."""
+        values = heapq.merge(
+            *(lib.sorted_tag_values(tag) for lib in self.libraries.values()),
+            key=str.casefold,
+        )
+        return list(dict.fromkeys(values))
+
+    def tag_names(self) -> set[str]:
+        """Return a set of all tags used by songs."""
+        return {name for lib in self.libraries.values() for name in lib.tag_names()}
+
+    def index_tag_names(self):
+        """Prepare `tag_names()` in steps, yielding in between."""
+        for lib in list(self.libraries.values()):
+            yield from lib.index_tag_names()
+
     def rename(self, song, newname, changed=None):
         """Rename the song in all libraries it belongs to.
 
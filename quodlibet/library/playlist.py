@@ -4,14 +4,21 @@
 # (at your option) any later version.
 
 import os
+import time
 from collections.abc import Iterable, Generator
+from concurrent.futures import ThreadPoolExecutor
+from xml.etree import ElementTree as ET
+
+from gi.repository import GLib
 
 import quodlibet
 from quodlibet import print_d, print_w, print_e, ngettext, _
 from quodlibet.formats import AudioFile
 from quodlibet.library.base import Library
 from quodlibet.util.collection import Playlist, XSPFBackedPlaylist, FileBackedPlaylist
+from quodlibet.util.atomic import atomic_save
 from quodlibet.util.path import is_hidden
+from quodlibet.util.picklehelper import pickle_dump, pickle_load, PickleError
 from senf import text2fsn, _fsnative, fsnative
 
 _DEFAULT_PLAYLIST_DIR = text2fsn(os.path.join(quodlibet.get_user_dir(), "playlists"))
@@ -22,6 +29,160 @@ _MIN_NON_EMPTY_PL_BYTES = 4
 """Arbitrary minimum file size for a legacy non-empty playlist file"""
 
 
+_WRITE_DELAY_MS = 2000
+"""How long to coalesce changes before writing playlists out"""
+
+
+_MAX_WRITE_DELAY_MS = 10000
+"""How long continuous changes can hold back writing playlists out"""
+
+
+_MAX_READ_WORKERS = 4
+"""Upper bound on threads used to parse playlists at startup"""
+
+
+class PlaylistIndex:
+    """A cache of the contents of XSPF playlists, keyed by filename
+    and valid only while the file's mtime and size stay the same,
+    so unchanged playlists can load without reparsing any XML.
+    """
+
+    FILENAME = ".index"
+    _VERSION = 1
+
+    def __init__(self, pl_dir: _fsnative):
+        self.path = os.path.join(pl_dir, self.FILENAME)
+        self._entries: dict[str, tuple] = {}
+        self.dirty = False
+
+    @staticmethod
+    def _stamp(path) -> tuple[int, int]:
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "rb") as h:
+                version, entries = pickle_load(h)
+        except (OSError, PickleError, ValueError, TypeError) as e:
+            print_d(f"No usable playlist index at {self.path!r} ({e})")
+            return
+        if version == self._VERSION and isinstance(entries, dict):
+            self._entries = entries
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        try:
+            with atomic_save(self.path, "wb") as h:
+                pickle_dump((self._VERSION, self._entries), h, 2)
+        except (OSError, PickleError) as e:
+            print_w(f"Couldn't save playlist index to {self.path!r} ({e})")
+        else:
+            self.dirty = False
+
+    def get(self, fn: str, path) -> tuple[str | None, list[str]] | None:
+        """Returns cached (title, locations) for the file, if still valid"""
+        entry = self._entries.get(fn)
+        if entry is None:
+            return None
+        try:
+            if self._stamp(path) != entry[0]:
+                return None
+        except OSError:
+            return None
+        return entry[1]
+
+    def read(self, fn: str, path) -> tuple[str | None, list[str]]:
+        """Returns (title, locations), parsing and caching them if needed.
+        Doesn't touch any library, so is fine to call from other threads"""
+        cached = self.get(fn, path)
+        if cached is not None:
+            return cached
+        stamp = self._stamp(path)
+        data = XSPFBackedPlaylist.read_locations(path)
+        self._entries[fn] = (stamp, data)
+        self.dirty = True
+        return data
+
+    def prune(self, keep: Iterable[str]) -> None:
+        """Forget about everything except `keep`"""
+        keep = set(keep)
+        for fn in list(self._entries):
+            if fn not in keep:
+                del self._entries[fn]
+                self.dirty = True
+
+
+class PlaylistWriter:
+    """Write-behind scheduler for playlists.
+
+    Requests are coalesced per playlist and flushed once things have
+    been quiet for `delay` ms, only writing playlists whose persisted
+    data has actually changed, or at the latest `max_delay` ms after
+    the first request.
+    """
+
+    def __init__(
+        self, delay: int = _WRITE_DELAY_MS, max_delay: int = _MAX_WRITE_DELAY_MS
+    ):
+        self.delay = delay
+        self.max_delay = max_delay
+        self._pending: dict[int, Playlist] = {}
+        self._source_id: int | None = None
+        self._deadline: float | None = None
+        """Monotonic time by which pending playlists get written at the latest"""
+
+    def __len__(self):
+        return len(self._pending)
+
+    def schedule(self, playlists: Iterable[Playlist]) -> None:
+        for pl in playlists:
+            self._pending[id(pl)] = pl
+        now = time.monotonic()
+        if self._deadline is None:
+            self._deadline = now + self.max_delay / 1000
+        if self._source_id is not None:
+            GLib.source_remove(self._source_id)
+        delay = min(self.delay, max(0, int((self._deadline - now) * 1000)))
+        self._source_id = GLib.timeout_add(
+            delay, self._on_timeout, priority=GLib.PRIORITY_LOW
+        )
+
+    def discard(self, playlist: Playlist) -> None:
+        """Forget about any pending write for `playlist`"""
+        self._pending.pop(id(playlist), None)
+
+    def _on_timeout(self):
+        self._source_id = None
+        self.flush()
+        return False
+
+    def flush(self) -> int:
+        """Writes all pending playlists now, returning how many were written"""
+        if self._source_id is not None:
+            GLib.source_remove(self._source_id)
+            self._source_id = None
+        self._deadline = None
+        pending = list(self._pending.values())
+        self._pending.clear()
+        written = 0
+        for pl in pending:
+            try:
+                write_if_changed = pl.write_if_changed
+            except AttributeError:
+                pl.write()
+                written += 1
+                continue
+            try:
+                written += write_if_changed()
+            except OSError as e:
+                print_e(f"Couldn't write {pl} ({e})")
+        if pending:
+            print_d(f"Wrote {written} of {len(pending)} pending playlist(s)")
+        return written
+
+
 class PlaylistLibrary(Library[str, Playlist]):
     """A PlaylistLibrary listens to a SongLibrary, and keeps tracks of playlists
     of these songs.
@@ -38,6 +199,7 @@ class PlaylistLibrary(Library[str, Playlist]):
         if library is None:
             raise ValueError("Need a library to listen to")
         self._library = library
+        self.writer = PlaylistWriter()
         self._read_playlists(library)
 
         self._rsig = library.connect("removed", self.__songs_removed)
@@ -52,18 +214,26 @@ class PlaylistLibrary(Library[str, Playlist]):
             os.mkdir(self.pl_dir)
             fns = []
 
+        fns = [
+            fn
+            for fn in fns
+            if not os.path.isdir(os.path.join(self.pl_dir, fn))
+            and not is_hidden(fsnative(fn))
+        ]
+        locations = self._read_xspf_locations(fns)
+
         # Populate this library by relying on existing signal passing.
         # Weird, but allows keeping the logic in one place
         failed = []
         for fn in fns:
-            full_path = os.path.join(self.pl_dir, fn)
-            if os.path.isdir(full_path):
-                continue
-            if is_hidden(fsnative(fn)):
-                print_d(f"Ignoring hidden file {fn!r}")
-                continue
             try:
-                XSPFBackedPlaylist(self.pl_dir, fn, songs_lib=library, pl_lib=self)
+                XSPFBackedPlaylist(
+                    self.pl_dir,
+                    fn,
+                    songs_lib=library,
+                    pl_lib=self,
+                    locations=locations.get(fn),
+                )
             except TypeError as e:
                 # Don't add to library - it's temporary
                 legacy = FileBackedPlaylist(
@@ -108,6 +278,34 @@ class PlaylistLibrary(Library[str, Playlist]):
                 % len(failed)
             )
 
+    def _read_xspf_locations(self, fns: list[str]) -> dict[str, tuple]:
+        """Reads the contents of all XSPF files in parallel,
+        using (and updating) the on-disk index where possible"""
+        xspfs = []
+        for fn in fns:
+            try:
+                XSPFBackedPlaylist.name_for(fsnative(fn))
+            except TypeError:
+                continue
+            xspfs.append(fn)
+        index = PlaylistIndex(self.pl_dir)
+        index.load()
+
+        def read(fn):
+            try:
+                return fn, index.read(fn, os.path.join(self.pl_dir, fn))
+            except (OSError, ValueError, ET.ParseError):
+                # Leave it to the playlist itself to deal with
+                return fn, None
+
+        workers = max(1, min(_MAX_READ_WORKERS, os.cpu_count() or 1, len(xspfs)))
+        with ThreadPoolExecutor(workers) as pool:
+            results = {fn: data for fn, data in pool.map(read, xspfs) if data}
+        index.prune(results)
+        index.save()
+        print_d(f"Read {len(results)} playlist(s) using {workers} thread(s)")
+        return results
+
     def create(self, name_base: str | None = None) -> Playlist:
         if name_base:
             return XSPFBackedPlaylist.new(
@@ -121,7 +319,14 @@ class PlaylistLibrary(Library[str, Playlist]):
             self.pl_dir, songs, title=title, songs_lib=self._library, pl_lib=self
         )
 
+    def remove(self, items: Iterable[Playlist]) -> set[Playlist]:
+        items = list(items)
+        for pl in items:
+            self.writer.discard(pl)
+        return super().remove(items)
+
     def destroy(self):
+        self.writer.flush()
         for sig in [self._rsig, self._csig]:
             self._library.disconnect(sig)
 
@@ -136,8 +341,7 @@ class PlaylistLibrary(Library[str, Playlist]):
         )
         changed = {pl for pl in self if pl.remove_songs(songs)}
         if changed:
-            for pl in changed:
-                pl.write()
+            self.writer.schedule(changed)
             self.changed(changed)
 
     def rename(self, playlist: Playlist, old_key: str):
@@ -160,11 +364,10 @@ class PlaylistLibrary(Library[str, Playlist]):
                     # It's definitely changed now, nothing else is interesting
                     break
         if changed:
-            # TODO: only write if anything *persisted* changes (#3622)
-            #  i.e. not internal stuff (notably: ~playlists itself)
             for pl in changed:
                 pl.finalize()
-                pl.write()
+            # Only persisted changes get written, and not straight away (#3622)
+            self.writer.schedule(changed)
             self.changed(changed)
 
     def recreate(self, playlist: Playlist, songs: Iterable[AudioFile]):
@@ -0,0 +1,192 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+
+import os
+import re
+from collections.abc import Iterable
+
+from quodlibet import get_user_dir, print_d
+from quodlibet.formats import TIME_TAGS
+from quodlibet.query import Query
+
+_VOLATILE = re.compile(
+    r"\b(?:now|today|{})\b|@\((?!\s*saved\s*:)".format(
+        "|".join(sorted(re.escape(tag[2:]) for tag in TIME_TAGS))
+    ),
+    re.IGNORECASE,
+)
+"""Things in a query that can change its results without songs changing"""
+
+_SAVED = re.compile(r"@\(\s*saved\s*:([^)]*)\)", re.IGNORECASE)
+"""Other saved searches included by a query"""
+
+
+def is_volatile(text: str) -> bool:
+    """Whether the results of a query can change without any song changing,
+    i.e. it depends on the current time or a query plugin"""
+
+    return bool(_VOLATILE.search(text))
+
+
+class SavedQuery(Query):
+    """A `Query` for the text of a saved search.
+
+    For songs of the library this is a lookup in the saved search's
+    results, which get kept up to date with library changes.
+    """
+
+    def __init__(self, string: str, star: Iterable[str], searches: "SavedSearches"):
+        super().__init__(string, star)
+        self._searches = searches
+        self._key = (string, tuple(self.star))
+
+    def search(self, data):
+        results = self._searches._results_for(self._key, self._match)
+        if data in results:
+            return True
+        if data in self._searches.library:
+            return False
+        return self._match.search(data)
+
+    def filter(self, sequence):
+        return [s for s in sequence if self.search(s)]
+
+
+class SavedSearches:
+    """The saved searches (`lists/queries.saved`) of a song library.
+
+    Their queries are only compiled once, and the results of
+    non-volatile ones are kept up to date from the library changes.
+    """
+
+    _compiling: set[tuple[str, str]] = set()
+    """Saved searches being compiled by path and name, shared so nested
+    queries using another instance (e.g. without a library) are caught too"""
+
+    def __init__(self, library=None, path: str | None = None):
+        self.library = library
+        self.path = path or os.path.join(get_user_dir(), "lists", "queries.saved")
+        self._mtime: int | None = None
+        self._names: dict[str, str] = {}
+        self._queries: dict[tuple[str, tuple[str, ...]], Query] = {}
+        self._results: dict[tuple[str, tuple[str, ...]], set] = {}
+
+    def destroy(self):
+        self._queries.clear()
+        self._results.clear()
+
+    def _read(self) -> dict[str, str]:
+        """Returns saved query texts by (lower-case) name.
+
+        Raises OSError, or ValueError if the file is corrupt.
+        """
+
+        mtime = os.stat(self.path).st_mtime_ns
+        if mtime == self._mtime:
+            return self._names
+
+        with open(self.path, encoding="utf-8") as h:
+            lines = [line.strip() for line in h]
+        if lines and not lines[-1]:
+            del lines[-1]
+        if len(lines) % 2:
+            # This shouldn't happen unless it has been externally modified
+            raise ValueError(f"Odd number of lines in {self.path!r}")
+
+        names = {}
+        for text, name in zip(lines[::2], lines[1::2], strict=True):
+            names.setdefault(name.lower(), text)
+        self._names = names
+        self._mtime = mtime
+
+        texts = set(names.values())
+        for cache in (self._queries, self._results):
+            # Included saved searches might have changed as well
+            for key in [k for k in cache if k[0] not in texts or _SAVED.search(k[0])]:
+                del cache[key]
+        print_d(f"Read {len(names)} saved search(es)")
+        return names
+
+    def get(self, name: str) -> Query:
+        """Returns the query of the saved search called `name`
+        (case-insensitive).
+
+        Raises KeyError if there is none (or it includes itself), OSError
+        or ValueError if the saved searches couldn't be read.
+        """
+
+        name = name.strip().lower()
+        text = self._read()[name]
+        key = (self.path, name)
+        if key in self._compiling:
+            raise KeyError(f"{name!r} includes itself")
+        self._compiling.add(key)
+        try:
+            return self._query(text, Query.STAR)
+        finally:
+            self._compiling.discard(key)
+
+    def query(self, text: str, star: Iterable[str] | None = None) -> Query:
+        """Returns a `Query` for `text`, which matches by lookups of cached
+        results if the text is the one of a saved search"""
+
+        star = Query.STAR if star is None else star
+        try:
+            saved = text in self._read().values()
+        except (OSError, ValueError):
+            saved = False
+        if not saved:
+            return Query(text, star)
+        return self._query(text, star)
+
+    def _query(self, text: str, star: Iterable[str]) -> Query:
+        key = (text, tuple(star))
+        query = self._queries.get(key)
+        if query is None:
+            if self.library is None or self._is_volatile(text):
+                query = Query(text, star)
+            else:
+                query = SavedQuery(text, star, self)
+            self._queries[key] = query
+        return query
+
+    def _is_volatile(self, text: str, seen: frozenset = frozenset()) -> bool:
+        """Like `is_volatile`, but also checks included saved searches"""
+
+        if is_volatile(text):
+            return True
+        for name in _SAVED.findall(text):
+            name = name.strip().lower()
+            if name in seen:
+                continue
+            included = self._names.get(name)
+            if included is None or self._is_volatile(included, seen | {name}):
+                return True
+        return False
+
+    def _results_for(self, key, match) -> set:
+        results = self._results.get(key)
+        if results is None:
+            results = self._results[key] = set(match.filter(self.library.values()))
+            print_d(f"Cached {len(results)} result(s) of saved search {key[0]!r}")
+        return results
+
+    def _match_of(self, key):
+        return self._queries[key]._match
+
+    def added(self, songs: Iterable):
+        songs = list(songs)
+        for key, results in self._results.items():
+            results.update(self._match_of(key).filter(songs))
+
+    def changed(self, songs: Iterable):
+        songs = list(songs)
+        for key, results in self._results.items():
+            results.difference_update(songs)
+            results.update(self._match_of(key).filter(songs))
+
+    def removed(self, songs: Iterable):
+        for results in self._results.values():
+            results.difference_update(songs)
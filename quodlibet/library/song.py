@@ -11,6 +11,8 @@ from quodlibet.library.album import AlbumLibrary
 from quodlibet.library.base import K, Library, PicklingMixin
 from quodlibet.library.file import WatchedFileLibraryMixin
 from quodlibet.library.playlist import PlaylistLibrary
+from quodlibet.library.saved import SavedSearches
+from quodlibet.library.vocabulary import TagVocabulary
 from quodlibet.query import Query
 from quodlibet.util.path import normalize_path
 
@@ -37,16 +39,59 @@ class SongLibrary(Library[K, V], PicklingMixin):
         print_d(f"Created playlist library {pl_lib}")
         return pl_lib
 
+    @util.cached_property
+    def saved_searches(self):
+        return SavedSearches(self)
+
+    @util.cached_property
+    def vocabulary(self):
+        return TagVocabulary(self)
+
     def destroy(self):
         super().destroy()
         if "albums" in self.__dict__:
             self.albums.destroy()
         if "playlists" in self.__dict__:
             self.playlists.destroy()
+        if "saved_searches" in self.__dict__:
+            self.saved_searches.destroy()
+        if "vocabulary" in self.__dict__:
+            self.vocabulary.destroy()
+
+    def do_added(self, items):
+        if "saved_searches" in self.__dict__:
+            self.saved_searches.added(items)
+        if "vocabulary" in self.__dict__:
+            self.vocabulary.added(items)
+
+    def do_changed(self, items):
+        if "saved_searches" in self.__dict__:
+            self.saved_searches.changed(items)
+        if "vocabulary" in self.__dict__:
+            self.vocabulary.changed(items)
+
+    def do_removed(self, items):
+        if "saved_searches" in self.__dict__:
+            self.saved_searches.removed(items)
+        if "vocabulary" in self.__dict__:
+            self.vocabulary.removed(items)
 
     def tag_values(self, tag):
         """Return a set of all values for the given tag."""
-        return {value for song in self.values() for value in song.list(tag)}
+        return self.vocabulary.values(tag)
+
+    def sorted_tag_values(self, tag) -> list[str]:
+        """Return a list of all text values for the given tag,
+        sorted case-insensitively."""
+        return list(self.vocabulary.sorted_values(tag))
+
+    def tag_names(self) -> set[str]:
+        """Return a set of all tags used by songs."""
+        return self.vocabulary.names()
+
+    def index_tag_names(self):
+        """Prepare `tag_names()` in steps, yielding in between."""
+        return self.vocabulary.index_names()
 
     def rename(self, song, new_name, changed: set | None = None):
         """Rename a song.
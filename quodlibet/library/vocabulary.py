@@ -0,0 +1,142 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+
+from collections import Counter
+from collections.abc import Iterable
+
+from quodlibet import print_d
+
+_NAMES_CHUNK = 500
+"""Songs to index the tag names of between yields"""
+
+
+class TagVocabulary:
+    """The values (and tag names) used by the songs of a library, with the
+    number of songs using each, kept up to date from the library changes.
+
+    A tag gets indexed the first time its values are asked for, tag names
+    the first time they are asked for or `index_names()` gets run.
+    """
+
+    def __init__(self, library):
+        self.library = library
+        self._values: dict[str, dict] = {}
+        """Values by song, for each indexed tag"""
+        self._counts: dict[str, Counter] = {}
+        self._sorted: dict[str, list[str]] = {}
+        self._names: dict[object, frozenset] | None = None
+        """Tag names by song, shared by songs with the same ones"""
+        self._name_sets: dict[frozenset, frozenset] = {}
+        self._name_counts: Counter = Counter()
+        self._unnamed: list = []
+        """Songs still to be added to the tag name index"""
+
+    def destroy(self):
+        self._values.clear()
+        self._counts.clear()
+        self._sorted.clear()
+        self._names = None
+        self._name_sets.clear()
+        self._name_counts.clear()
+        self._unnamed.clear()
+
+    def _index(self, tag) -> Counter:
+        counts = self._counts.get(tag)
+        if counts is None:
+            values = self._values[tag] = {}
+            counts = self._counts[tag] = Counter()
+            for song in self.library.values():
+                values[song] = song_values = tuple(set(song.list(tag)))
+                counts.update(song_values)
+            print_d(f"Indexed {len(counts)} value(s) of {tag!r}")
+        return counts
+
+    def values(self, tag) -> set:
+        """All values of `tag`"""
+        return set(self._index(tag))
+
+    def sorted_values(self, tag) -> list[str]:
+        """All text values of `tag`, sorted case-insensitively (like entry
+        completion matches them). Don't modify the result."""
+
+        values = self._sorted.get(tag)
+        if values is None:
+            counts = self._index(tag)
+            values = sorted((v for v in counts if isinstance(v, str)), key=str.casefold)
+            self._sorted[tag] = values
+        return values
+
+    def index_names(self):
+        """Builds the tag name index in steps, yielding in between
+        so it can run in a copool"""
+
+        if self._names is None:
+            self._names = {}
+            self._unnamed = list(self.library.values())
+        while self._unnamed:
+            chunk = self._unnamed[-_NAMES_CHUNK:]
+            del self._unnamed[-_NAMES_CHUNK:]
+            # skip songs removed in the meantime
+            self._add_names(song for song in chunk if song in self.library)
+            if not self._unnamed:
+                print_d(f"Indexed {len(self._name_counts)} tag name(s)")
+            yield True
+
+    def names(self) -> set[str]:
+        """All tag names used by songs"""
+
+        for _ in self.index_names():
+            pass
+        return set(self._name_counts)
+
+    def _add_names(self, songs):
+        indexed = self._names
+        for song in songs:
+            if song in indexed:
+                # added or changed before its turn came
+                continue
+            names = frozenset(song.keys())
+            indexed[song] = self._name_sets.setdefault(names, names)
+            self._name_counts.update(names)
+
+    def _remove(self, songs):
+        for tag, values in self._values.items():
+            counts = self._counts[tag]
+            for song in songs:
+                for value in values.pop(song, ()):
+                    counts[value] -= 1
+                    if not counts[value]:
+                        del counts[value]
+                        self._sorted.pop(tag, None)
+
+        if self._names is not None:
+            counts = self._name_counts
+            for song in songs:
+                for name in self._names.pop(song, ()):
+                    counts[name] -= 1
+                    if not counts[name]:
+                        del counts[name]
+
+    def added(self, songs: Iterable):
+        songs = list(songs)
+        for tag, values in self._values.items():
+            counts = self._counts[tag]
+            for song in songs:
+                values[song] = song_values = tuple(set(song.list(tag)))
+                for value in song_values:
+                    if value not in counts:
+                        self._sorted.pop(tag, None)
+                    counts[value] += 1
+
+        if self._names is not None:
+            self._add_names(songs)
+
+    def changed(self, songs: Iterable):
+        songs = list(songs)
+        self._remove(songs)
+        self.added(songs)
+
+    def removed(self, songs: Iterable):
+        self._remove(list(songs))
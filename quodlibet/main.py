@@ -57,6 +57,7 @@ def main(argv=None):
 
     library = quodlibet.library.init(library_path)
     app.library = library
+    library.librarian.set_coalescing(config.getboolean("library", "coalesce_signals"))
 
     # this assumes that nullbe will always succeed
     from quodlibet.player import PlayerError
@@ -164,9 +165,8 @@ def main(argv=None):
     from quodlibet.plugins.events import EventPluginHandler
     from quodlibet.plugins.gui import UserInterfacePluginHandler
 
-    pm.register_handler(
-        EventPluginHandler(library.librarian, player, app.window.songlist)
-    )
+    event_handler = EventPluginHandler(library.librarian, player, app.window.songlist)
+    pm.register_handler(event_handler)
     pm.register_handler(UserInterfacePluginHandler())
 
     from quodlibet.mmkeys import MMKeysHandler
@@ -192,6 +192,7 @@ def main(argv=None):
     if DBusHandler is not None:
         DBusHandler(player, library)
     tracker = SongTracker(library.librarian, player, window.playlist)
+    event_handler.connect_tracker(tracker)
 
     from quodlibet import session
 
@@ -6,6 +6,9 @@
 # (at your option) any later version.
 
 import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from optparse import OptionParser
 
 from quodlibet import _
@@ -53,6 +56,12 @@ class Command:
     def verbose(self, value):
         self.__options.verbose = bool(value)
 
+    @property
+    def jobs(self):
+        """How many files get loaded or saved at the same time"""
+
+        return max(1, getattr(self.__options, "jobs", None) or 1)
+
     def log(self, text):
         """Print output if --verbose was passed"""
 
@@ -60,6 +69,34 @@ class Command:
             return print_(text, file=sys.stderr)
         return None
 
+    def map(self, func, items):
+        """Like `map()`, but calls `func` in up to `jobs` threads.
+
+        The results are in the order of `items`. If calls raise, the
+        exception of the first one in that order gets raised. Only up to
+        twice as many calls as `jobs` run ahead of the consumer, so results
+        don't pile up if it is slower.
+        """
+
+        if self.jobs == 1:
+            yield from map(func, items)
+            return
+
+        items = iter(items)
+        pool = ThreadPoolExecutor(self.jobs)
+        pending: deque = deque()
+        try:
+            for item in islice(items, 2 * self.jobs):
+                pending.append(pool.submit(func, item))
+            while pending:
+                result = pending.popleft().result()
+                # keep the pool busy while the result gets used
+                for item in islice(items, 1):
+                    pending.append(pool.submit(func, item))
+                yield result
+        finally:
+            pool.shutdown(cancel_futures=True)
+
     def load_song(self, path):
         """Load a song. Raises CommandError in case it fails"""
 
@@ -69,17 +106,58 @@ class Command:
             raise CommandError(_("Failed to load file: %r") % path)
         return song
 
+    def iter_songs(self, paths, ignore_errors=False):
+        """Yields the songs for all paths in order, while up to `jobs`
+        threads load the following ones.
+
+        Raises CommandError once reaching a song which failed to load, or
+        yields None for it if `ignore_errors` is True.
+        """
+
+        for path, song in zip(paths, self.map(MusicFile, paths), strict=True):
+            self.log(f"Load file: {path!r}")
+            if not song:
+                if not ignore_errors:
+                    raise CommandError(_("Failed to load file: %r") % path)
+                song = None
+            yield song
+
+    def load_songs(self, paths):
+        """Load songs. Raises CommandError for the first one
+        which fails to load"""
+
+        return list(self.iter_songs(paths))
+
+    def for_each_file(self, func, songs):
+        """Calls `func` for all songs in up to `jobs` threads.
+
+        Songs of the same file get passed one after the other, from the
+        same thread. Raises the exception of the first failed call.
+        """
+
+        by_file = {}
+        for song in songs:
+            by_file.setdefault(song("~filename"), []).append(song)
+
+        def call(songs):
+            for song in songs:
+                func(song)
+
+        list(self.map(call, by_file.values()))
+
     def save_songs(self, songs):
         """Save all passed songs"""
 
         self.log("Saving songs...")
 
-        for song in songs:
+        def write(song):
             try:
                 song.write()
             except AudioFileError as e:
                 raise CommandError(e) from e
 
+        self.for_each_file(write, songs)
+
     def _execute(self, options, args):
         """Override to execute something"""
 
@@ -257,7 +257,7 @@ class EditCommand(Command):
         if len(args) < 1:
             raise CommandError(_("Not enough arguments"))
 
-        songs = [self.load_song(path) for path in args]
+        songs = self.load_songs(args)
         dump = self._songs_to_text(songs).encode("utf-8")
 
         # write to tmp file
@@ -335,9 +335,7 @@ class SetCommand(Command):
         paths = args[2:]
 
         songs = []
-        for path in paths:
-            song = self.load_song(path)
-
+        for song in self.iter_songs(paths):
             if not song.can_change(tag):
                 vars = {
                     "tag": tag,
@@ -394,9 +392,7 @@ class ClearCommand(Command):
             self.verbose = True
 
         songs = []
-        for path in paths:
-            song = self.load_song(path)
-
+        for path, song in zip(paths, self.iter_songs(paths), strict=True):
             tags = []
             realkeys = song.realkeys()
             if options.all:
@@ -467,9 +463,7 @@ class RemoveCommand(Command):
                 return v == value
 
         songs = []
-        for path in paths:
-            song = self.load_song(path)
-
+        for song in self.iter_songs(paths):
             if tag not in song:
                 continue
 
@@ -498,9 +492,7 @@ class AddCommand(Command):
         paths = args[2:]
 
         songs = []
-        for path in paths:
-            song = self.load_song(path)
-
+        for song in self.iter_songs(paths):
             if not song.can_change(tag):
                 raise CommandError(_("Can not set %r") % tag)
 
@@ -592,7 +584,7 @@ class ImageSetCommand(Command):
         if not image:
             raise CommandError(_("Failed to load image file: %r") % image_path)
 
-        songs = [self.load_song(p) for p in paths]
+        songs = self.load_songs(paths)
 
         for song in songs:
             if not song.can_change_images:
@@ -604,12 +596,14 @@ class ImageSetCommand(Command):
                     % {"file_name": song("~filename"), "file_format": song("~format")}
                 )
 
-        for song in songs:
+        def set_image(song):
             try:
                 song.set_image(image)
             except AudioFileError as e:
                 raise CommandError(e) from e
 
+        self.for_each_file(set_image, songs)
+
 
 @Command.register
 class ImageClearCommand(Command):
@@ -622,7 +616,7 @@ class ImageClearCommand(Command):
             raise CommandError(_("Not enough arguments"))
 
         paths = args
-        songs = [self.load_song(p) for p in paths]
+        songs = self.load_songs(paths)
 
         for song in songs:
             if not song.can_change_images:
@@ -634,12 +628,14 @@ class ImageClearCommand(Command):
                     % {"file_name": song("~filename"), "file_format": song("~format")}
                 )
 
-        for song in songs:
+        def clear_images(song):
             try:
                 song.clear_images()
             except AudioFileError as e:
                 raise CommandError(e) from e
 
+        self.for_each_file(clear_images, songs)
+
 
 @Command.register
 class ImageExtractCommand(Command):
@@ -674,9 +670,7 @@ class ImageExtractCommand(Command):
             self.verbose = True
 
         paths = args
-        for path in paths:
-            song = self.load_song(path)
-
+        for path, song in zip(paths, self.iter_songs(paths), strict=True):
             # get the primary one or all of them
             if options.primary:
                 image = song.get_primary_image()
@@ -756,8 +750,7 @@ class FillCommand(Command):
         pattern = TagsFromPattern(pattern_text)
 
         songs = []
-        for path in paths:
-            song = self.load_song(path)
+        for song in self.iter_songs(paths):
             for header in pattern.headers:
                 if not song.can_change(header):
                     raise CommandError(_("Can not set %r") % header)
@@ -843,11 +836,11 @@ class PrintCommand(Command):
 
         paths = args
         error = False
-        for path in paths:
-            try:
-                util.print_(pattern % self.load_song(path))
-            except CommandError:
+        for song in self.iter_songs(paths, ignore_errors=True):
+            if song is None:
                 error = True
+            else:
+                util.print_(pattern % song)
 
         if error:
             raise CommandError("One or more files failed to load.")
@@ -47,13 +47,23 @@ def main(argv=None):
     main_cmd = os.path.basename(argv[0])
 
     # the main optparser
-    usage = f"{main_cmd} [--version] [--help] [--verbose] <command> [<args>]"
+    usage = (
+        f"{main_cmd} [--version] [--help] [--verbose] [--jobs <n>] "
+        "<command> [<args>]"
+    )
     parser = OptionParser(usage=usage)
 
     parser.remove_option("--help")
     parser.add_option("-h", "--help", action="store_true")
     parser.add_option("--version", action="store_true", help="print version")
     parser.add_option("-v", "--verbose", action="store_true", help="verbose output")
+    parser.add_option(
+        "-j",
+        "--jobs",
+        type="int",
+        default=1,
+        help="number of files to load and save at the same time",
+    )
 
     # no args, print help (might change in the future)
     if len(argv) <= 1:
@@ -63,11 +73,13 @@ def main(argv=None):
     # collect options for the main command and get the command offset
     offset = -1
     pre_command = []
+    takes_value = False
     for i, a in enumerate(argv):
         if i == 0:
             continue
-        if a.startswith("-"):
+        if a.startswith("-") or takes_value:
             pre_command.append(a)
+            takes_value = a in ("-j", "--jobs")
         else:
             offset = i
             break
@@ -75,6 +87,10 @@ def main(argv=None):
     # parse the global options
     options = parser.parse_args(pre_command)[0]
 
+    if options.jobs < 1:
+        print_(f"Invalid number of jobs: {options.jobs}", file=sys.stderr)
+        return 1
+
     # --help somewhere
     if options.help:
         _print_help(main_cmd, parser)
@@ -6,11 +6,16 @@
 # the Free Software Foundation; either version 2 of the License, or
 # (at your option) any later version.
 
+import random
+import weakref
+from collections import Counter
+from collections.abc import Callable
 from typing import Any
 
 from gi.repository import Gtk
 
-from quodlibet import _, print_d
+from quodlibet import _, app, print_d
+from quodlibet.util.collections import FenwickTree
 
 
 class Order:
@@ -74,6 +79,13 @@ class Order:
         """Called when the user presses a "Previous" button."""
         return self.previous(playlist, iter)
 
+    def peek_implicit(self, playlist, iter):
+        """Returns what `next_implicit` would, without changing any state.
+
+        Orders that can't tell in advance (e.g. random ones) raise
+        `NotImplementedError`, which is the default."""
+        raise NotImplementedError
+
     def set_explicit(self, playlist, iter):
         """Called when the user manually selects a song (at `iter`).
         If desired the play order can override that, or just
@@ -99,45 +111,303 @@ class Order:
         return f"<{self.display_name}>"
 
 
+class ShuffleState:
+    """The not yet played rows of a playlist, for picking random songs
+    without scanning the whole playlist on every track change.
+
+    Unplayed row indices are kept in a bag for O(1) uniform picks and
+    removals and, if a `weight` function is given, their weights in a
+    `FenwickTree` for O(log n) weighted picks.
+    Rows being inserted, removed or reordered make the state stale,
+    after which it has to be rebuilt from the played rows. Songs changed
+    in `librarian` get their weight and tally updated.
+    """
+
+    def __init__(
+        self,
+        playlist,
+        weight: Callable[[Any], float] | None = None,
+        tally: str | None = None,
+        librarian=None,
+    ):
+        self.playlist = playlist
+        self.weight = weight
+        self.tally_key = tally
+        self.tally: Counter = Counter()
+        """The (numeric) `tally` tag values of all unplayed songs"""
+        self.stale = True
+        self._bag: list[int] = []
+        self._slots: list[int] = []
+        self._played: list[int] = []
+        self._tallied: list[Any] = []
+        self._tree: FenwickTree | None = None
+        self._rows: dict[Any, list[int]] = {}
+        """Row indices by song, for updating changed songs"""
+
+        ref = weakref.ref(self)
+        ids: list[int] = []
+
+        def invalidate(model, *args):
+            state = ref()
+            if state is not None:
+                state.stale = True
+            else:
+                for id_ in ids:
+                    model.disconnect(id_)
+                del ids[:]
+
+        for signal in ["row-inserted", "row-deleted", "rows-reordered"]:
+            ids.append(playlist.connect(signal, invalidate))
+        self._handler_ids = ids
+
+        self._librarian = librarian
+        self._librarian_ids: list[int] = []
+        if librarian is not None and (weight or tally):
+            librarian_ids = self._librarian_ids
+
+            def changed(librarian, songs):
+                state = ref()
+                if state is not None:
+                    state.songs_changed(songs)
+                else:
+                    for id_ in librarian_ids:
+                        librarian.disconnect(id_)
+                    del librarian_ids[:]
+
+            librarian_ids.append(librarian.connect("changed", changed))
+
+    def __len__(self):
+        return len(self._bag)
+
+    def detach(self):
+        """Stops following changes of the playlist"""
+
+        for id_ in self._handler_ids:
+            self.playlist.disconnect(id_)
+        del self._handler_ids[:]
+        for id_ in self._librarian_ids:
+            self._librarian.disconnect(id_)
+        del self._librarian_ids[:]
+        self.stale = True
+
+    def _index(self, iter_) -> int:
+        return self.playlist.get_path(iter_).get_indices()[0]
+
+    def _song(self, index):
+        playlist = self.playlist
+        return playlist.get_value(playlist.get_iter((index,)))
+
+    def _weight(self, song) -> float:
+        assert self.weight is not None
+        return max(0.0, float(self.weight(song)))
+
+    def build(self, played_iters):
+        """Rebuilds the state for `played_iters` being already played"""
+
+        counts = [0] * len(self.playlist)
+        for iter_ in played_iters:
+            counts[self._index(iter_)] += 1
+        self._played = counts
+        self._bag = bag = [i for i, count in enumerate(counts) if not count]
+        self._slots = slots = [-1] * len(counts)
+        for pos, index in enumerate(bag):
+            slots[index] = pos
+
+        songs = self.playlist.values() if self.tally_key or self.weight else []
+        self._rows = rows = {}
+        if self._librarian_ids:
+            for index, song in enumerate(songs):
+                rows.setdefault(song, []).append(index)
+        if self.tally_key:
+            self._tallied = tallied = [None] * len(counts)
+            for index in bag:
+                tallied[index] = songs[index](self.tally_key)
+            self.tally = Counter(tallied[index] for index in bag)
+        if self.weight:
+            self._tree = FenwickTree(
+                0.0 if count else self._weight(song)
+                for count, song in zip(counts, songs, strict=True)
+            )
+        self.stale = False
+        print_d(f"Rebuilt shuffle state: {len(bag)} of {len(counts)} unplayed")
+
+    def reweight(self):
+        """Recalculates all weights, e.g. after the weight function changed"""
+
+        if self.weight is None or self.stale:
+            return
+        played = self._played
+        self._tree = FenwickTree(
+            0.0 if played[index] else self._weight(song)
+            for index, song in enumerate(self.playlist.itervalues())
+        )
+
+    def mark_played(self, iter_):
+        if self.stale:
+            return
+        index = self._index(iter_)
+        self._played[index] += 1
+        if self._played[index] > 1:
+            return
+
+        bag, slots = self._bag, self._slots
+        pos = slots[index]
+        last = bag.pop()
+        if last != index:
+            bag[pos] = last
+            slots[last] = pos
+        slots[index] = -1
+
+        if self._tree is not None:
+            self._tree[index] = 0.0
+        if self.tally_key:
+            value = self._tallied[index]
+            self.tally[value] -= 1
+            if not self.tally[value]:
+                del self.tally[value]
+
+    def mark_unplayed(self, iter_):
+        if self.stale:
+            return
+        index = self._index(iter_)
+        if not self._played[index]:
+            return
+        self._played[index] -= 1
+        if self._played[index]:
+            return
+
+        self._slots[index] = len(self._bag)
+        self._bag.append(index)
+        if self._tree is not None or self.tally_key:
+            song = self._song(index)
+            if self._tree is not None:
+                self._tree[index] = self._weight(song)
+            if self.tally_key:
+                self._tallied[index] = value = song(self.tally_key)
+                self.tally[value] += 1
+
+    def songs_changed(self, songs):
+        """Updates the weights and the tally of unplayed rows of `songs`"""
+
+        if self.stale:
+            return
+        tree = self._tree
+        for song in songs:
+            for index in self._rows.get(song, ()):
+                if self._played[index]:
+                    continue
+                if tree is not None:
+                    tree[index] = self._weight(song)
+                if self.tally_key:
+                    old, new = self._tallied[index], song(self.tally_key)
+                    if old != new:
+                        self._tallied[index] = new
+                        self.tally[old] -= 1
+                        if not self.tally[old]:
+                            del self.tally[old]
+                        self.tally[new] += 1
+
+    def remaining(self) -> dict[int, Any]:
+        return {index: self._song(index) for index in self._bag}
+
+    def pick(self) -> int | None:
+        """Returns the index of a random unplayed row, or `None` if there
+        are none left.
+
+        With a weight function rows are picked in proportion to their
+        weight, falling back to a uniform pick if all weights are zero.
+        """
+
+        bag = self._bag
+        if not bag:
+            return None
+        tree = self._tree
+        if tree is None:
+            return random.choice(bag)
+
+        rebuilt = False
+        while True:
+            total = tree.total
+            if total <= 0:
+                return random.choice(bag)
+            index = tree.find(random.random() * total)
+            if self._played[index] or tree[index] <= 0:
+                # accumulated rounding errors
+                if rebuilt:
+                    return random.choice(bag)
+                self.reweight()
+                tree = self._tree
+                assert tree is not None
+                rebuilt = True
+                continue
+            weight = self._weight(self._song(index))
+            if weight != tree[index]:
+                # the song changed since we last looked, try again
+                tree[index] = weight
+                continue
+            return index
+
+
 class OrderRemembered(Order):
     """Shared class for all the shuffle modes that keep a memory
     of their previously played songs."""
 
     _played: list[Gtk.TreeIter]
+    _state: ShuffleState | None = None
 
     def __init__(self):
         super().__init__()
         self._played = []
+        self._state = None
 
     def next(self, playlist, iter):
         if iter is not None:
             self._played.append(iter)
+            if self._state is not None:
+                self._state.mark_played(iter)
 
     def previous(self, playlist, iter):
         if self._played:
-            return self._played.pop()
+            iter = self._played.pop()
+            if self._state is not None:
+                self._state.mark_unplayed(iter)
+            return iter
         return None
 
     def set(self, playlist, iter):
         if iter is not None:
             self._played.append(iter)
+            if self._state is not None:
+                self._state.mark_played(iter)
         return iter
 
     def reset(self, playlist):
         del self._played[:]
+        if self._state is not None:
+            self._state.detach()
+            self._state = None
+
+    def _shuffle_state(self, playlist, weight=None, tally=None) -> ShuffleState:
+        """Gets the up-to-date `ShuffleState` of the unplayed songs,
+        creating it with `weight` and `tally` if needed"""
+
+        state = self._state
+        if state is None or state.playlist is not playlist:
+            if state is not None:
+                state.detach()
+            state = self._state = ShuffleState(
+                playlist, weight, tally, librarian=app.librarian
+            )
+        if state.stale:
+            state.build(self._played)
+        return state
 
     def remaining(self, playlist) -> dict[int, Any]:
         """Gets a map of all song indices to their song from the `playlist`
         that haven't yet been played"""
 
-        def get_index(iter) -> int:
-            path = playlist.get_path(iter)
-            return path.get_indices()[0]
-
-        played = set(map(get_index, self._played))
         print_d("Played %d of %d song(s)" % (len(self._played), len(playlist)))
-        remaining = ((get_index(iter), value) for iter, value in playlist.iterrows())
-        return {index: song for (index, song) in remaining if index not in played}
+        return self._shuffle_state(playlist).remaining()
 
 
 class OrderInOrder(Order):
@@ -154,6 +424,13 @@ class OrderInOrder(Order):
             return playlist.get_iter_first()
         return playlist.iter_next(iter)
 
+    def peek_implicit(self, playlist, iter):
+        cls = type(self)
+        if (cls.next, cls.next_implicit) != (OrderInOrder.next, Order.next_implicit):
+            # A subclass picking songs differently
+            raise NotImplementedError
+        return OrderInOrder.next(self, playlist, iter)
+
     def previous(self, playlist, iter):
         if len(playlist) == 0:
             return None
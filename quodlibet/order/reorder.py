@@ -5,8 +5,6 @@
 # the Free Software Foundation; either version 2 of the License, or
 # (at your option) any later version.
 
-import random
-
 from quodlibet import _
 from quodlibet.order import Order, OrderRemembered
 
@@ -23,16 +21,19 @@ class OrderShuffle(Reorder, OrderRemembered):
 
     def next(self, playlist, iter):
         super().next(playlist, iter)
-        remaining = self.remaining(playlist)
+        index = self._shuffle_state(playlist).pick()
 
-        if not remaining:
+        if index is None:
             self.reset(playlist)
             return None
 
-        index = random.choice(list(remaining))
         return playlist.get_iter((index,))
 
 
+def _rating(song):
+    return song("~#rating")
+
+
 class OrderWeighted(Reorder, OrderRemembered):
     name = "weighted"
     display_name = _("Prefer higher rated")
@@ -40,21 +41,12 @@ class OrderWeighted(Reorder, OrderRemembered):
 
     def next(self, playlist, iter):
         super().next(playlist, iter)
-        remaining = self.remaining(playlist)
+        # When all songs are rated zero, this falls back to unweighted shuffle
+        index = self._shuffle_state(playlist, weight=_rating).pick()
 
         # Don't try to search through an empty / played playlist.
-        if not remaining:
+        if index is None:
             self.reset(playlist)
             return None
 
-        total_score = sum([song("~#rating") for song in remaining.values()])
-        if total_score == 0:
-            # When all songs are rated zero, fall back to unweighted shuffle
-            return playlist.get_iter((random.choice(list(remaining)),))
-        choice = random.random() * total_score
-        current = 0.0
-        for i, song in remaining.items():
-            current += song("~#rating")
-            if current >= choice:
-                return playlist.get_iter([i])
-        raise ValueError
+        return playlist.get_iter((index,))
@@ -49,6 +49,9 @@ class RepeatSongForever(Repeat):
     def next(self, playlist, iter):
         return iter
 
+    def peek_implicit(self, playlist, iter):
+        return iter
+
     def next_explicit(self, playlist, iter):
         return self.wrapped.next_explicit(playlist, iter)
 
@@ -68,6 +71,9 @@ class RepeatListForever(Repeat):
         print_d("Restarting songlist")
         return playlist.get_iter_first()
 
+    def peek_implicit(self, playlist, iter):
+        return self.wrapped.peek_implicit(playlist, iter) or playlist.get_iter_first()
+
 
 class OneSong(Repeat):
     """Stops after the current song"""
@@ -80,3 +86,6 @@ class OneSong(Repeat):
     def next(self, playlist, iter):
         print_d("Ending songlist.")
         return
+
+    def peek_implicit(self, playlist, iter):
+        return None
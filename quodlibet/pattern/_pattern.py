@@ -14,6 +14,7 @@
 import os
 import re
 from collections import OrderedDict
+from weakref import WeakKeyDictionary
 from re import Scanner  # type: ignore
 from urllib.parse import quote_plus
 
@@ -233,6 +234,8 @@ class PatternFormatter:
         self.__list_func = list_func
         self.tags = util.list_unique(tags)
         self.format(self.Dummy())  # Validate string
+        self._results = WeakKeyDictionary()
+        self._list_results = WeakKeyDictionary()
 
     class Dummy(dict):
         def __call__(self, key, *args):
@@ -253,6 +256,10 @@ class PatternFormatter:
             self.__song = realsong
             self.__formatter = formatter
 
+        def bind(self, realsong):
+            """Point this proxy at another song, to save allocations"""
+            self.__song = realsong
+
         def __call__(self, key, *args):
             return self.__song(key, *args)
 
@@ -308,6 +315,61 @@ class PatternFormatter:
             vals = ((self._post(v[0], song), self._post(v[1], song)) for v in vals)
         return set(vals)
 
+    def format_many(self, songs):
+        """Like `format` for each of `songs`, returning a list of results.
+
+        Results are cached per song until `invalidate` is called for it,
+        so callers need to do that whenever songs change.
+        """
+        results = self._results
+        proxy = None
+        out = []
+        for song in songs:
+            try:
+                out.append(results[song])
+                continue
+            except KeyError:
+                pass
+            except TypeError:
+                # Not weak-referenceable, so not cacheable
+                out.append(self.format(song))
+                continue
+            if proxy is None:
+                proxy = self.SongProxy(song, self._format)
+            else:
+                proxy.bind(song)
+            value = "".join(self.__func(proxy))
+            if self._post:
+                value = self._post(value, song)
+            results[song] = value
+            out.append(value)
+        return out
+
+    def format_list_many(self, songs):
+        """Like `format_list` for each of `songs`, returning a list of sets.
+        Cached in the same way as `format_many`"""
+        results = self._list_results
+        out = []
+        for song in songs:
+            try:
+                value = results[song]
+            except KeyError:
+                value = results[song] = frozenset(self.format_list(song))
+            except TypeError:
+                value = frozenset(self.format_list(song))
+            out.append(value)
+        return out
+
+    def invalidate(self, songs=None):
+        """Forget cached results for `songs`, or for everything if None"""
+        if songs is None:
+            self._results.clear()
+            self._list_results.clear()
+            return
+        for song in songs:
+            self._results.pop(song, None)
+            self._list_results.pop(song, None)
+
     __mod__ = format
 
 
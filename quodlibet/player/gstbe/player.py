@@ -7,6 +7,10 @@
 # the Free Software Foundation; either version 2 of the License, or
 # (at your option) any later version.
 
+import threading
+import time
+from collections import Counter
+
 import gi
 
 try:
@@ -162,6 +166,15 @@ class BufferingWrapper:
             )
         return res
 
+    def reset(self):
+        """Forgets about buffering in progress, for reusing the element"""
+
+        if self._task:
+            self._task.finish()
+            self._task = None
+        self._inhibit_play = False
+        self._wanted_state = None
+
     def destroy(self):
         if self.__bus_id:
             bus = self.bin.get_bus()
@@ -372,6 +385,22 @@ class GStreamerPlayer(BasePlayer, GStreamerPluginHandler):
         self.__bus_id = None
         self._runner = MainRunner()
 
+        self._next_lock = threading.Lock()
+        self.__next = None
+        """The pre-resolved (song, uri) to hand over to at about-to-finish"""
+        self.__handed_over = None
+        self.__resolve_id = None
+        self.__source_ids = []
+        self.gapless_hits = 0
+        """Gapless transitions answered with the pre-resolved song"""
+        self.gapless_fallbacks = 0
+        """Gapless transitions that had to wait on the main loop"""
+        self.track_changes = Counter()
+        """Non-gapless song changes by how the pipeline got prepared
+        (`reused` or `rebuilt`)"""
+        self.track_change_seconds = Counter()
+        """Time spent preparing the pipeline for them"""
+
     def __songs_changed(self, librarian, songs):
         # replaygain values might have changed, recalc volume
         if self.song and self.song in songs:
@@ -380,7 +409,92 @@ class GStreamerPlayer(BasePlayer, GStreamerPluginHandler):
     def _destroy(self):
         self._librarian.disconnect(self._lib_id)
         self._runner.abort()
+        self.__unwatch_source()
+        if self.__resolve_id is not None:
+            GLib.source_remove(self.__resolve_id)
+            self.__resolve_id = None
         self.__destroy_pipeline()
+        print_d(
+            f"Gapless transitions: {self.gapless_hits} pre-resolved, "
+            f"{self.gapless_fallbacks} through the main loop"
+        )
+        for mode, count in self.track_changes.items():
+            msecs = self.track_change_seconds[mode] * 1000 / count
+            print_d(f"Song changes with {mode} pipeline: {count}, {msecs:.1f} ms avg")
+
+    def setup(self, source, song, seek_pos, explicit=True):
+        self.__unwatch_source()
+        for model in source.models:
+            for signal in [
+                "row-inserted",
+                "row-deleted",
+                "rows-reordered",
+                "row-changed",
+                "order-changed",
+            ]:
+                id_ = model.connect(signal, self.__source_changed)
+                self.__source_ids.append((model, id_))
+        super().setup(source, song, seek_pos, explicit)
+
+    def __unwatch_source(self):
+        for model, id_ in self.__source_ids:
+            model.disconnect(id_)
+        del self.__source_ids[:]
+
+    def __source_changed(self, *args):
+        self.__invalidate_next()
+
+    def __invalidate_next(self):
+        """Forgets the pre-resolved next song and resolves it again once
+        the main loop is idle"""
+
+        with self._next_lock:
+            self.__next = None
+        if self.__resolve_id is None:
+            self.__resolve_id = GLib.idle_add(self.__resolve_next)
+
+    def __resolve_next(self):
+        self.__resolve_id = None
+
+        song = self.song
+        if song is None or self._source is None:
+            return False
+        if self._in_gapless_transition or self.__handed_over is not None:
+            return False
+        # see __about_to_finish_sync for why these aren't gapless
+        if song.multisong or isinstance(song, ModFile):
+            return False
+        if config.getboolean("player", "gst_disable_gapless"):
+            return False
+
+        try:
+            next_song = self._source.peek_next_ended()
+        except NotImplementedError:
+            print_d("Next song can't be resolved in advance")
+            return False
+
+        uri = next_song("~uri") if next_song is not None else None
+        with self._next_lock:
+            self.__next = (next_song, uri)
+        return False
+
+    def __hand_over(self):
+        """Moves the source to the pre-resolved song the pipeline got
+        handed over to, if that hasn't happened yet"""
+
+        with self._next_lock:
+            next_, self.__handed_over = self.__handed_over, None
+        if next_ is None:
+            return False
+
+        song = next_[0]
+        self._in_gapless_transition = True
+        self._source.next_ended()
+        if self._source.current is not song:
+            # shouldn't happen, but the source has to follow what gets played
+            print_w("Pre-resolved next song changed, going to it")
+            self._source.go_to(song)
+        return False
 
     @property
     def name(self):
@@ -585,6 +699,35 @@ class GStreamerPlayer(BasePlayer, GStreamerPluginHandler):
 
         return True
 
+    def __reuse_pipeline(self, previous):
+        """Prepares the active pipeline for playing the current song
+        from the start, keeping sinks and filters. `previous` is the song
+        the pipeline was set up for.
+
+        Returns True on success, False if the pipeline has to be rebuilt.
+        """
+
+        if not self.bin or not config.getboolean("player", "gst_reuse_pipeline"):
+            return False
+        # streams and mod files get a fresh one, as they used to, and so
+        # does whatever comes after them, as they leave state behind
+        for song in (previous, self.song):
+            if song is None or song.multisong or isinstance(song, ModFile):
+                return False
+
+        self.bin.set_state(Gst.State.READY)
+        status = self.bin.get_state(timeout=STATE_CHANGE_TIMEOUT)[0]
+        if status != Gst.StateChangeReturn.SUCCESS:
+            print_w(f"Resetting the pipeline failed ({status!r}), rebuilding it")
+            return False
+
+        print_d("Reusing Gstreamer pipeline")
+        self.bin.reset()
+        self.error = False
+        self._set_uri(self.song("~uri"))
+        self._reset_replaygain()
+        return True
+
     def _set_uri(self, uri: str) -> None:
         self.bin.set_property("uri", uri2gsturi(uri))
 
@@ -615,6 +758,8 @@ class GStreamerPlayer(BasePlayer, GStreamerPluginHandler):
             self.bin = None
 
         self._in_gapless_transition = False
+        with self._next_lock:
+            self.__handed_over = None
 
         self._ext_vol_element = None
         self._int_vol_element = None
@@ -639,6 +784,7 @@ class GStreamerPlayer(BasePlayer, GStreamerPluginHandler):
     def __message(self, bus, message, librarian):
         if message.type == Gst.MessageType.EOS:
             print_d("Stream EOS")
+            self.__hand_over()
             if not self._in_gapless_transition:
                 self._source.next_ended()
             self._end(False)
@@ -664,6 +810,7 @@ class GStreamerPlayer(BasePlayer, GStreamerPluginHandler):
             if message.src is self._ext_mute_element:
                 self.notify("mute")
         elif message.type == Gst.MessageType.STREAM_START:
+            self.__hand_over()
             if self._in_gapless_transition:
                 print_d("Stream changed")
                 self._end(False)
@@ -768,6 +915,7 @@ class GStreamerPlayer(BasePlayer, GStreamerPluginHandler):
             return None
 
         # this can trigger twice, see issue 987
+        self.__hand_over()
         if self._in_gapless_transition:
             return None
         self._in_gapless_transition = True
@@ -784,6 +932,20 @@ class GStreamerPlayer(BasePlayer, GStreamerPluginHandler):
     def __about_to_finish(self, playbin):
         print_d("About to finish (async)")
 
+        with self._next_lock:
+            next_, self.__next = self.__next, None
+        if next_ is not None and not config.getboolean("player", "gst_disable_gapless"):
+            with self._next_lock:
+                self.__handed_over = next_
+            self.gapless_hits += 1
+            GLib.idle_add(self.__hand_over, priority=GLib.PRIORITY_HIGH)
+            uri = next_[1]
+            if uri is not None:
+                print_d(f"About to finish (async): setting pre-resolved URI {uri}")
+                self._set_uri(uri)
+            return
+
+        self.gapless_fallbacks += 1
         try:
             uri = self._runner.call(
                 self.__about_to_finish_sync, priority=GLib.PRIORITY_HIGH, timeout=0.5
@@ -954,6 +1116,8 @@ class GStreamerPlayer(BasePlayer, GStreamerPluginHandler):
     def _end(self, stopped, next_song=None):
         print_d("End song")
         song, info = self.song, self.info
+        with self._next_lock:
+            self.__handed_over = None
 
         # set the new volume before the signals to avoid delays
         if self._in_gapless_transition:
@@ -975,11 +1139,18 @@ class GStreamerPlayer(BasePlayer, GStreamerPluginHandler):
 
         if self.song is not None:
             if not self._in_gapless_transition:
-                # Due to extensive problems with playbin2, we destroy the
-                # entire pipeline and recreate it each time we're not in
-                # a gapless transition.
-                self.__destroy_pipeline()
-                self.__init_pipeline()
+                start = time.perf_counter()
+                if self.__reuse_pipeline(song):
+                    mode = "reused"
+                else:
+                    # Due to extensive problems with playbin2, we destroy the
+                    # entire pipeline and recreate it each time we're not in
+                    # a gapless transition.
+                    mode = "rebuilt"
+                    self.__destroy_pipeline()
+                    self.__init_pipeline()
+                self.track_changes[mode] += 1
+                self.track_change_seconds[mode] += time.perf_counter() - start
             if self.bin:
                 if self.paused:
                     self.bin.set_state(Gst.State.PAUSED)
@@ -1002,6 +1173,8 @@ class GStreamerPlayer(BasePlayer, GStreamerPluginHandler):
         if self.song is None:
             self.paused = True
 
+        self.__invalidate_next()
+
     def __tag(self, tags, librarian):
         if self.song and self.song.multisong:
             self._fill_stream(tags, librarian)
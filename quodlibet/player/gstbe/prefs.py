@@ -79,6 +79,16 @@ class GstPlayerPreferences(Gtk.VBox):
                 "with some GStreamer versions"
             ),
         )
+        reuse_button = ConfigSwitch(
+            _("_Reuse the pipeline when changing songs"),
+            "player",
+            "gst_reuse_pipeline",
+            populate=True,
+            tooltip=_(
+                "Speeds up skipping songs with slow audio outputs. "
+                "The pipeline still gets rebuilt in case of problems"
+            ),
+        )
         jack_button = ConfigSwitch(
             _("Use JACK for playback if available"),
             "player",
@@ -107,6 +117,7 @@ class GstPlayerPreferences(Gtk.VBox):
         hb = self._create_buffer_box(buffer_label, scale)
         self.pack_start(hb, False, False, 0)
         self.pack_start(gapless_button, False, False, 0)
+        self.pack_start(reuse_button, False, False, 0)
 
         if not is_windows():
             self.pack_start(jack_button, False, False, 0)
@@ -6,9 +6,14 @@
 # the Free Software Foundation; either version 2 of the License, or
 # (at your option) any later version.
 
-from gi.repository import GObject
+import time
+from collections import Counter
+from collections.abc import Collection
+from concurrent.futures import ThreadPoolExecutor
 
-from quodlibet.util.dprint import print_e
+from gi.repository import GObject, GLib
+
+from quodlibet.util.dprint import print_d, print_e
 
 from quodlibet.plugins import PluginHandler
 
@@ -18,6 +23,23 @@ from quodlibet.util import connect_obj
 from quodlibet.errorreport import errorhook
 
 
+_SLOW_HANDLER_SECONDS = 0.1
+"""Handler calls taking longer than this get logged"""
+
+
+def _wrap_args(args):
+    """Wraps the songs passed with an event, so changes to them can be
+    saved afterwards"""
+
+    args = list(args)
+    if args and args[0]:
+        if isinstance(args[0], dict):
+            args[0] = SongWrapper(args[0])
+        elif isinstance(args[0], set | list):
+            args[0] = list_wrapper(args[0])
+    return args
+
+
 class EventPlugin:
     """Plugins that run in the background and receive events.
 
@@ -57,8 +79,20 @@ class EventPlugin:
     def plugin_on_songs_selected(self, songs):
         """Called when the selection in main songlist changes"""
 
+    def plugin_on_stats_changed(self, songs):
+        """Called right after the play statistics of songs got updated.
+
+        `plugin_on_changed` follows for them, but can be delayed by some
+        seconds to combine changes.
+        """
+
     PLUGIN_INSTANCE = True
 
+    PLUGIN_BACKGROUND_EVENTS: Collection[str] = ()
+    """Events (e.g. "added") whose `plugin_on_*` methods get called in a
+    background thread instead of the main loop, one after another in the
+    order the events happened. These must not use the UI."""
+
     def enabled(self):
         """Called when the plugin is enabled."""
 
@@ -102,13 +136,7 @@ class EventPluginHandler(PluginHandler):
                 librarian.connect(event, handler, event)
 
         if librarian and player:
-            sigs = _map_signals(player, blacklist=("notify",))
-            for event, _handle in sigs:
-
-                def cb_handler(librarian, *args):
-                    self.__invoke(librarian, args[-1], *args[:-1])
-
-                connect_obj(player, event, cb_handler, librarian, event)
+            self.__connect_events(player, librarian)
 
         if songlist:
 
@@ -121,28 +149,86 @@ class EventPluginHandler(PluginHandler):
         self.librarian = librarian
         self.__plugins = {}
         self.__sidebars = {}
+        self.__handlers: dict[str, list] = {}
+        """Plugins overriding the method of an event, by event"""
+        self.__executor: ThreadPoolExecutor | None = None
+        self.calls: Counter = Counter()
+        """Number of calls by (plugin ID, event)"""
+        self.seconds: Counter = Counter()
+        """Time spent in calls by (plugin ID, event)"""
 
-    def __invoke(self, librarian, event, *args):
-        args = list(args)
-        if args and args[0]:
-            if isinstance(args[0], dict):
-                args[0] = SongWrapper(args[0])
-            elif isinstance(args[0], set | list):
-                args[0] = list_wrapper(args[0])
-        for plugin in list(self.__plugins.values()):
-            method_name = "plugin_on_" + event.replace("-", "_")
-            handler = getattr(plugin, method_name, None)
+    def connect_tracker(self, tracker):
+        """Passes the events of a `SongTracker` to the plugins as well"""
+
+        self.__connect_events(tracker, self.librarian)
 
-            def overridden(obj, name):
-                return name in type(obj).__dict__
+    def __connect_events(self, obj, librarian):
+        sigs = _map_signals(obj, blacklist=("notify",))
+        for event, _handle in sigs:
 
-            if overridden(plugin, method_name):
-                try:
-                    handler(*args)
-                except Exception:
-                    print_e(f"Error during {method_name} on {type(plugin)}")
-                    errorhook()
+            def cb_handler(librarian, *args):
+                self.__invoke(librarian, args[-1], *args[:-1])
 
+            connect_obj(obj, event, cb_handler, librarian, event)
+
+    def __handlers_for(self, event):
+        handlers = self.__handlers.get(event)
+        if handlers is None:
+            method_name = "plugin_on_" + event.replace("-", "_")
+            handlers = self.__handlers[event] = [
+                (plugin, getattr(plugin, method_name))
+                for plugin in self.__plugins.values()
+                if method_name in type(plugin).__dict__
+            ]
+        return handlers
+
+    def __invoke(self, librarian, event, *args):
+        handlers = self.__handlers_for(event)
+        if not handlers:
+            return
+
+        wrapped = None
+        for plugin, handler in handlers:
+            if event in plugin.PLUGIN_BACKGROUND_EVENTS:
+                self.__invoke_background(librarian, event, plugin, handler, args)
+                continue
+            if wrapped is None:
+                wrapped = _wrap_args(args)
+            start = time.perf_counter()
+            try:
+                handler(*wrapped)
+            except Exception:
+                print_e(f"Error during {handler.__name__} on {type(plugin)}")
+                errorhook()
+            self.__count(plugin, event, time.perf_counter() - start)
+
+        if wrapped is not None:
+            self.__check_changed(librarian, event, wrapped)
+
+    def __invoke_background(self, librarian, event, plugin, handler, args):
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="event-plugins"
+            )
+        wrapped = _wrap_args(args)
+
+        def call():
+            start = time.perf_counter()
+            try:
+                handler(*wrapped)
+            except Exception:
+                print_e(f"Error during {handler.__name__} on {type(plugin)}")
+                errorhook()
+            GLib.idle_add(done, time.perf_counter() - start)
+
+        def done(seconds):
+            self.__count(plugin, event, seconds)
+            self.__check_changed(librarian, event, wrapped)
+            return False
+
+        self.__executor.submit(call)
+
+    def __check_changed(self, librarian, event, args):
         if event not in ["removed", "changed"] and args:
             songs = args[0]
             if not isinstance(songs, set | list):
@@ -150,11 +236,37 @@ class EventPluginHandler(PluginHandler):
             songs = filter(None, songs)
             check_wrapper_changed(librarian, songs)
 
+    def __count(self, plugin, event, seconds):
+        key = (plugin.PLUGIN_ID, event)
+        self.calls[key] += 1
+        self.seconds[key] += seconds
+        if seconds > _SLOW_HANDLER_SECONDS:
+            print_d(f"{plugin.PLUGIN_ID} took {seconds:.3f}s for {event!r}")
+
     def plugin_handle(self, plugin):
         return issubclass(plugin.cls, EventPlugin)
 
     def plugin_enable(self, plugin):
         self.__plugins[plugin.cls] = plugin.get_instance()
+        self.__handlers.clear()
 
     def plugin_disable(self, plugin):
         self.__plugins.pop(plugin.cls)
+        self.__handlers.clear()
+        if self.__executor is not None and not any(
+            p.PLUGIN_BACKGROUND_EVENTS for p in self.__plugins.values()
+        ):
+            self.__executor.shutdown(wait=False)
+            self.__executor = None
+        spent = {
+            event: seconds
+            for (plugin_id, event), seconds in self.seconds.items()
+            if plugin_id == plugin.id
+        }
+        if spent:
+            total = sum(spent.values())
+            slowest = max(spent, key=spent.get)
+            print_d(
+                f"{plugin.id} spent {total:.3f}s handling events, "
+                f"most of it on {slowest!r}"
+            )
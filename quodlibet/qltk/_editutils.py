@@ -7,20 +7,33 @@
 # the Free Software Foundation; either version 2 of the License, or
 # (at your option) any later version.
 
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 
 from gi.repository import Gtk, GObject
 from senf import fsn2text
 
 from quodlibet import config
 from quodlibet import util
-from quodlibet import _
+from quodlibet import _, ngettext, print_d, print_w
+from quodlibet.formats import AudioFile, AudioFileError
 from quodlibet.plugins import PluginHandler
 from quodlibet.qltk.ccb import ConfigCheckButton
 from quodlibet.qltk.msg import WarningMessage, ErrorMessage
 from quodlibet.qltk import Icons
-from quodlibet.util import connect_obj, connect_destroy
+from quodlibet.qltk.wlw import WritingWindow
+from quodlibet.util import connect_obj, connect_destroy, print_exc
 from quodlibet.errorreport import errorhook
 
+_MAX_WRITE_WORKERS = 4
+"""Songs written at once, as writing is mostly waiting on the disk"""
+
+_MAX_LISTED_FAILURES = 10
+"""Songs named in the error shown after failed writes"""
+
+_POLL_INTERVAL = 0.05
+"""Seconds to wait for writes before running the main loop again"""
+
 
 class OverwriteWarning(WarningMessage):
     RESPONSE_SAVE = 1
@@ -55,6 +68,160 @@ class WriteFailedError(ErrorMessage):
         super().__init__(parent, title, description, escape_desc=False)
 
 
+class WritesFailedError(ErrorMessage):
+    def __init__(self, parent, songs):
+        title = ngettext(
+            "Unable to save %(count)d song",
+            "Unable to save %(count)d songs",
+            len(songs),
+        ) % {"count": len(songs)}
+
+        names = [util.bold(fsn2text(s("~basename"))) for s in songs]
+        if len(names) > _MAX_LISTED_FAILURES:
+            rest = len(names) - _MAX_LISTED_FAILURES
+            names = names[:_MAX_LISTED_FAILURES]
+            names.append(ngettext("and %d more song", "and %d more songs", rest) % rest)
+        description = (
+            _(
+                "The files may be read-only, corrupted, or you do not have "
+                "permission to edit them."
+            )
+            + "\n\n"
+            + "\n".join(names)
+        )
+        super().__init__(parent, title, description, escape_desc=False)
+
+
+class TagWriter:
+    """Writes songs in a pool of background threads.
+
+    All methods have to be called from the main loop.
+    """
+
+    def __init__(self, workers: int = _MAX_WRITE_WORKERS):
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="tag-writer"
+        )
+        self._pending: dict[Future, AudioFile] = {}
+        self.written: list[AudioFile] = []
+        self.failed: list[tuple[AudioFile, Exception]] = []
+
+    @property
+    def pending(self) -> int:
+        """The number of songs queued or being written"""
+        return len(self._pending)
+
+    def write(self, song: AudioFile):
+        """Queues `song` for writing"""
+        self._pending[self._executor.submit(song.write)] = song
+
+    def poll(self, timeout: float | None = None) -> list[AudioFile]:
+        """Waits up to `timeout` seconds for writes to finish and returns
+        the songs done since the last call, written or failed."""
+
+        if not self._pending:
+            return []
+        done, _not_done = wait(self._pending, timeout, FIRST_COMPLETED)
+        songs = []
+        for future in done:
+            song = self._pending.pop(future)
+            try:
+                future.result()
+            except AudioFileError as e:
+                self.failed.append((song, e))
+            except Exception as e:
+                # Not an error of the file, but still a failed write
+                print_exc()
+                self.failed.append((song, e))
+            else:
+                self.written.append(song)
+            songs.append(song)
+        return songs
+
+    def shutdown(self) -> list[AudioFile]:
+        """Drops the queued songs, waits for the ones being written and
+        returns the dropped ones."""
+
+        dropped = []
+        for future in [f for f in self._pending if f.cancel()]:
+            dropped.append(self._pending.pop(future))
+        self._executor.shutdown(wait=True)
+        self.poll(0)
+        return dropped
+
+
+def write_songs(
+    parent, songs: Iterable[AudioFile], change: Callable[[AudioFile], bool], library
+) -> bool:
+    """Applies the edits of `change` to `songs` and writes them in the
+    background, showing the progress in a `WritingWindow`.
+
+    `change` is called for each song in the main loop and returns whether
+    the song needs to be written. Songs that couldn't be written (or
+    weren't because of stopping) get reloaded and the failures are shown
+    at the end. All changes are announced in one `library.changed`.
+
+    Returns whether all songs were written.
+    """
+
+    songs = list(songs)
+    invalid = [s for s in songs if not s.valid()]
+    if invalid:
+        resp = OverwriteWarning(parent, invalid[0]).run()
+        if resp != OverwriteWarning.RESPONSE_SAVE:
+            return False
+
+    win = WritingWindow(parent, len(songs))
+    win.show()
+    writer = TagWriter()
+    # Only keep a few songs queued, so stopping doesn't leave many songs
+    # changed but unwritten and the progress follows the actual writes
+    limit = writer.workers * 2
+
+    def process(timeout):
+        for _song in writer.poll(timeout):
+            if win.step():
+                break
+        while Gtk.events_pending():
+            Gtk.main_iteration()
+
+    try:
+        for song in songs:
+            while writer.pending >= limit and not win.quit:
+                process(_POLL_INTERVAL)
+            if win.quit:
+                break
+            if change(song):
+                writer.write(song)
+            elif win.step():
+                break
+        while writer.pending and not win.quit:
+            process(_POLL_INTERVAL)
+    finally:
+        # Also if something went wrong, for the songs already written
+        dropped = writer.shutdown()
+        was_changed = set(writer.written)
+        for song, e in writer.failed:
+            print_w(f"Couldn't write {song('~filename')!r}: {e}")
+        for song in dropped + [s for s, _e in writer.failed]:
+            library.reload(song, changed=was_changed)
+        print_d(
+            f"Wrote {len(writer.written)} song(s), {len(writer.failed)} failed, "
+            f"{len(dropped)} skipped"
+        )
+        stopped = win.quit
+        win.destroy()
+        library.changed(was_changed)
+
+    failed = [s for s, _e in writer.failed]
+    if len(failed) == 1:
+        WriteFailedError(parent, failed[0]).run()
+    elif failed:
+        WritesFailedError(parent, failed).run()
+    return not (stopped or writer.failed)
+
+
 class EditingPluginHandler(GObject.GObject, PluginHandler):
     __gsignals__ = {"changed": (GObject.SignalFlags.RUN_LAST, None, ())}
 
@@ -7,12 +7,19 @@
 # (at your option) any later version.
 
 
+import bisect
+import heapq
+
 from gi.repository import Gtk
 
 from quodlibet import formats, config, print_d
 from quodlibet.util import copool, massagers
 from quodlibet.util.tags import MACHINE_TAGS
 
+_MAX_COMPLETION_ROWS = 1000
+"""Values offered at once; larger vocabularies get narrowed down to the ones
+starting with the text typed so far"""
+
 
 class EntryWordCompletion(Gtk.EntryCompletion):
     """Entry completion for simple words, where a word boundary is
@@ -107,20 +114,13 @@ class LibraryTagCompletion(EntryWordCompletion):
         all_tags = cls.__tags
         model.clear()
 
-        tags = set()
-        songs = list(library)
-        for count, song in enumerate(songs):
-            for tag in song.keys():
-                if not (tag.startswith("~#") or tag in MACHINE_TAGS):
-                    tags.add(tag)
-
-            if count % 500 == 0 or count + 1 == len(songs):
-                tags -= all_tags
-                for tag in tags:
-                    model.append([tag])
-                all_tags.update(tags)
-                tags.clear()
-                yield True
+        yield from library.index_tag_names()
+        tags = {
+            tag
+            for tag in library.tag_names()
+            if not (tag.startswith("~#") or tag in MACHINE_TAGS)
+        }
+        yield True
 
         tags.update(["~dirname", "~basename", "~people", "~format"])
         for tag in [
@@ -136,7 +136,7 @@ class LibraryTagCompletion(EntryWordCompletion):
         ]:
             tags.add("#(" + tag)
         for tag in ["date", "bpm"]:
-            if tag in all_tags:
+            if tag in tags or tag in all_tags:
                 tags.add("#(" + tag)
 
         tags -= all_tags
@@ -155,6 +155,9 @@ class LibraryValueCompletion(Gtk.EntryCompletion):
         super().__init__()
         self.set_model(Gtk.ListStore(str))
         self.set_text_column(0)
+        self.__values: list[str] = []
+        self.__keys: list[str] = []
+        self.__entry = None
         self.set_tag(tag, library)
 
     def set_tag(self, tag, library):
@@ -178,15 +181,41 @@ class LibraryValueCompletion(Gtk.EntryCompletion):
     def __fill_tag(self, tag, library):
         model = self.get_model()
         model.clear()
+        self.__values = []
         yield True
 
         # Issue 439: pre-fill with valid values if available
-        values = massagers.get_options(tag)
-
-        values = sorted(set(values) | library.tag_values(tag))
+        options = sorted(set(massagers.get_options(tag)), key=str.casefold)
+        values = heapq.merge(options, library.sorted_tag_values(tag), key=str.casefold)
+        values = list(dict.fromkeys(values))
         self.set_minimum_key_length(int(len(values) > 100))
+        if len(values) > _MAX_COMPLETION_ROWS:
+            self.__values = values
+            self.__keys = [v.casefold() for v in values]
+            self.__refill()
+            return
         yield True
         for count, value in enumerate(values):
             model.append(row=[value])
             if count % 1000 == 0:
                 yield True
+
+    def __refill(self, *args):
+        """Fills the model with the values starting with the entry text"""
+
+        if not self.__values:
+            return
+        entry = self.get_entry()
+        if entry is None:
+            return
+        if entry is not self.__entry:
+            self.__entry = entry
+            entry.connect("changed", self.__refill)
+
+        prefix = entry.get_text().casefold()
+        start = bisect.bisect_left(self.__keys, prefix)
+        end = bisect.bisect_right(self.__keys, prefix + "\U0010ffff", lo=start)
+        model = self.get_model()
+        model.clear()
+        for value in self.__values[start : min(end, start + _MAX_COMPLETION_ROWS)]:
+            model.append(row=[value])
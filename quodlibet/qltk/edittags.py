@@ -16,19 +16,16 @@ from quodlibet import app
 from quodlibet import config
 from quodlibet import qltk
 from quodlibet import util
-from quodlibet.formats import AudioFileError
 from quodlibet.plugins import PluginManager
 from quodlibet.plugins.editing import EditTagsPlugin
 from quodlibet.qltk import Icons
-from quodlibet.qltk._editutils import EditingPluginHandler, OverwriteWarning
-from quodlibet.qltk._editutils import WriteFailedError
+from quodlibet.qltk._editutils import EditingPluginHandler, write_songs
 from quodlibet.qltk.ccb import ConfigCheckButton
 from quodlibet.qltk.completion import LibraryValueCompletion
 from quodlibet.qltk.models import ObjectStore
 from quodlibet.qltk.tagscombobox import TagsComboBox, TagsComboBoxEntry
 from quodlibet.qltk.views import RCMHintedTreeView, TreeViewColumn, BaseView
 from quodlibet.qltk.window import Dialog
-from quodlibet.qltk.wlw import WritingWindow
 from quodlibet.qltk.x import SeparatorMenuItem, Button, MenuItem
 from quodlibet.util import connect_obj
 from quodlibet.util import massagers
@@ -883,20 +880,7 @@ class EditTags(Gtk.VBox):
                 l = renamed.setdefault(entry.tag, [])
                 l.append((entry.origtag, entry.value, entry.origvalue))
 
-        was_changed = set()
-        songs = self._group_info.songs
-        win = WritingWindow(self, len(songs))
-        win.show()
-        all_done = False
-        for song in songs:
-            if not song.valid():
-                win.hide()
-                dialog = OverwriteWarning(self, song)
-                resp = dialog.run()
-                win.show()
-                if resp != OverwriteWarning.RESPONSE_SAVE:
-                    break
-
+        def change(song):
             changed = False
             for key, values in updated.items():
                 for new_value, old_value in values:
@@ -943,24 +927,9 @@ class EditTags(Gtk.VBox):
 
             for tag, value in save_rename:
                 song.add(tag, value.text)
+            return changed
 
-            if changed:
-                try:
-                    song.write()
-                except AudioFileError:
-                    util.print_exc()
-                    WriteFailedError(self, song).run()
-                    library.reload(song, changed=was_changed)
-                    break
-                was_changed.add(song)
-
-            if win.step():
-                break
-        else:
-            all_done = True
-
-        win.destroy()
-        library.changed(was_changed)
+        all_done = write_songs(self, self._group_info.songs, change, library)
         for b in [save, revert]:
             b.set_sensitive(not all_done)
 
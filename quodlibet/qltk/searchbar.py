@@ -14,6 +14,7 @@ from functools import reduce
 from gi.repository import Gtk, GObject, GLib
 
 import quodlibet
+from quodlibet import app
 from quodlibet import config
 from quodlibet import _
 
@@ -53,6 +54,8 @@ class SearchBarBox(Gtk.Box):
     ):
         super().__init__(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
 
+        # The default saved searches can use the library's cached results
+        self.__use_saved_searches = filename is None
         if filename is None:
             filename = os.path.join(quodlibet.get_user_dir(), "lists", "queries")
 
@@ -117,7 +120,10 @@ class SearchBarBox(Gtk.Box):
 
     def _update_query_from(self, text):
         # TODO: remove tight coupling to Query
-        self._query = Query(text, star=self._star)
+        if self.__use_saved_searches and app.library is not None:
+            self._query = app.library.saved_searches.query(text, star=self._star)
+        else:
+            self._query = Query(text, star=self._star)
 
     def get_text(self):
         """Get the active text as unicode"""
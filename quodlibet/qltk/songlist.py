@@ -9,6 +9,7 @@
 # the Free Software Foundation; either version 2 of the License, or
 # (at your option) any later version.
 
+import time
 from collections.abc import Sequence
 
 from gi.repository import Gtk, GLib, Gdk, GObject
@@ -33,8 +34,13 @@ from quodlibet.qltk.util import GSignals
 from quodlibet.qltk.delete import trash_songs
 from quodlibet.formats._audio import TAG_TO_SORT, AudioFile
 from quodlibet.qltk.x import SeparatorMenuItem
-from quodlibet.qltk.songlistcolumns import create_songlist_column, SongListColumn
-from quodlibet.util import connect_destroy
+from quodlibet.qltk.songlistcolumns import (
+    create_songlist_column,
+    SongListColumn,
+    PatternColumn,
+)
+from quodlibet.util import connect_destroy, copool
+from quodlibet.util.thread import call_async, Cancellable
 
 DND_QL, DND_URI_LIST = range(2)
 
@@ -452,6 +458,13 @@ class SongList(AllTreeView, SongListDnDMixin, DragScroll, util.InstanceTracker):
 
         self.set_search_equal_func(self.__search_func, None)
 
+        self._fill_cancellable = None
+        self.__fill_complete = None
+        """Adds the remaining rows of a progressive fill right away"""
+        self.fill_stats: tuple[int, float, float] | None = None
+        """(songs, seconds until first rows shown, total seconds)
+        for the last progressive fill"""
+
         self.connect("destroy", self.__destroy)
 
     @property
@@ -533,6 +546,7 @@ class SongList(AllTreeView, SongListDnDMixin, DragScroll, util.InstanceTracker):
                 c.set_sort_indicator(False)
 
         if refresh:
+            self.__complete_fill()
             songs = self.get_songs()
             song_order = self._get_song_order(songs)
             self.model.reorder(song_order)
@@ -608,6 +622,7 @@ class SongList(AllTreeView, SongListDnDMixin, DragScroll, util.InstanceTracker):
         self.emit("orders-changed")
 
     def __destroy(self, *args):
+        self.__cancel_fill()
         self.info.destroy()
         self.info = None
         self.handler_block(self.__csig)
@@ -789,6 +804,7 @@ class SongList(AllTreeView, SongListDnDMixin, DragScroll, util.InstanceTracker):
     def clear(self):
         """Remove all songs"""
 
+        self.__cancel_fill()
         model = self.get_model()
         if model:
             model.clear()
@@ -847,6 +863,7 @@ class SongList(AllTreeView, SongListDnDMixin, DragScroll, util.InstanceTracker):
         if not songs:
             return
 
+        self.__complete_fill()
         model = self.get_model()
         if not len(model):
             self.set_songs(songs, scroll=False)
@@ -880,6 +897,12 @@ class SongList(AllTreeView, SongListDnDMixin, DragScroll, util.InstanceTracker):
 
         model = self.get_model()
         assert model is not None
+        self.__cancel_fill()
+
+        threshold = config.getint("song_list", "progressive_fill_threshold", 0)
+        if threshold and len(songs) >= threshold and hasattr(model, "extend"):
+            self.__set_songs_progressive(songs, sorted, scroll, scroll_select)
+            return
 
         song_order = None
 
@@ -902,6 +925,11 @@ class SongList(AllTreeView, SongListDnDMixin, DragScroll, util.InstanceTracker):
             if song_order:
                 model.reorder(song_order)
 
+        self.__finish_set_songs(songs, restore_song, scroll, scroll_select)
+
+    def __finish_set_songs(self, songs, restore_song, scroll, scroll_select):
+        model = self.get_model()
+
         # scroll to the first selected or current song and restore
         # selection for the first selected item if there was one
         if scroll or scroll_select:
@@ -925,6 +953,121 @@ class SongList(AllTreeView, SongListDnDMixin, DragScroll, util.InstanceTracker):
         # pass the songs manually
         self.info._update_songs(songs)
 
+    FILL_FIRST_ROWS = 250
+    """How many rows to show straight away when filling progressively"""
+
+    FILL_CHUNK_SIZE = 5000
+    """How many rows to add per main loop iteration after that"""
+
+    @property
+    def is_filling(self) -> bool:
+        """Whether a progressive fill is still in progress"""
+        return self._fill_cancellable is not None
+
+    def __cancel_fill(self):
+        if self._fill_cancellable is None:
+            return
+        self._fill_cancellable.cancel()
+        self._fill_cancellable = None
+        self.__fill_complete = None
+        try:
+            copool.remove(self.__fill_funcid)
+        except ValueError:
+            pass
+
+    def __complete_fill(self):
+        """Adds the rest of a progressive fill right away, for changes
+        which need all the rows in their place"""
+
+        if self.__fill_complete is not None:
+            self.__fill_complete()
+
+    @property
+    def __fill_funcid(self):
+        return ("songlist-fill", id(self))
+
+    def __set_songs_progressive(self, songs, sorted, scroll, scroll_select):
+        """Like `set_songs`, but sorts in a thread and adds rows in chunks,
+        keeping the UI responsive for huge lists."""
+
+        start = time.monotonic()
+        key_funcs = []
+        if not sorted:
+            if not self.is_sorted():
+                default = self.find_default_sort_column()
+                if default:
+                    self.toggle_column_sort(default, refresh=False)
+            orders = self.get_sort_orders()
+            if orders:
+                key_funcs = self.__get_song_sort_key_func(orders)
+        else:
+            self.clear_sort()
+
+        restore_song = None
+        if scroll_select:
+            restore_song = self.get_first_selected_song()
+
+        self.get_model().clear()
+        cancellable = self._fill_cancellable = Cancellable()
+        songs = list(songs)
+        sorted_songs = None
+        added = 0
+
+        def sort_songs(songs, key_funcs):
+            order = list(range(len(songs)))
+            for key, reverse in key_funcs:
+                order.sort(key=lambda i: key(songs[i]), reverse=reverse)
+            return [songs[i] for i in order]
+
+        def finish():
+            total = time.monotonic() - start
+            self.fill_stats = (len(songs), first_time, total)
+            print_d(f"Filled song list with {len(songs)} songs in {total:.3f}s")
+            self._fill_cancellable = None
+            self.__fill_complete = None
+            self.__finish_set_songs(sorted_songs, restore_song, scroll, scroll_select)
+
+        def fill(result):
+            nonlocal sorted_songs, added, first_time
+            sorted_songs = result
+            added = self.FILL_FIRST_ROWS
+            with self.without_model() as model:
+                model.set(sorted_songs[:added])
+            first_time = time.monotonic() - start
+            print_d(f"Showing {min(added, len(songs))} rows after {first_time:.3f}s")
+
+            def add_chunks():
+                nonlocal added
+                model = self.get_model()
+                while added < len(sorted_songs):
+                    model.extend(sorted_songs[added : added + self.FILL_CHUNK_SIZE])
+                    added += self.FILL_CHUNK_SIZE
+                    yield True
+                finish()
+
+            copool.add(
+                add_chunks, funcid=self.__fill_funcid, priority=GLib.PRIORITY_HIGH_IDLE
+            )
+
+        def complete():
+            nonlocal sorted_songs, first_time
+            self.__cancel_fill()
+            if sorted_songs is None:
+                sorted_songs = sort_songs(songs, key_funcs)
+                with self.without_model() as model:
+                    model.set(sorted_songs)
+                first_time = time.monotonic() - start
+            else:
+                self.get_model().extend(sorted_songs[added:])
+            finish()
+
+        first_time = 0.0
+        self.__fill_complete = complete
+        if key_funcs:
+            call_async(sort_songs, cancellable, fill, args=(songs, key_funcs))
+        else:
+            fill(songs)
+
     def jump_to_song(self, song, select=False):
         """Scrolls to and selects the given song if in the list.
 
@@ -1024,8 +1167,13 @@ class SongList(AllTreeView, SongListDnDMixin, DragScroll, util.InstanceTracker):
         """Only update rows that are currently displayed.
         Warning: This makes the row-changed signal useless.
         """
+        for column in self.get_columns():
+            if isinstance(column, PatternColumn):
+                column.invalidate(songs)
+
         model = self.get_model()
         if config.getboolean("song_list", "auto_sort") and self.is_sorted():
+            self.__complete_fill()
             iters, _, complete = self.__find_iters_in_selection(songs)
 
             if not complete:
@@ -1062,6 +1210,7 @@ class SongList(AllTreeView, SongListDnDMixin, DragScroll, util.InstanceTracker):
                 for song in songs:
                     player.remove(song)
 
+            self.__complete_fill()
             model = self.get_model()
 
             # The selected songs are removed from the library and should
@@ -335,12 +335,17 @@ class PatternColumn(WideTextColumn):
     def _fetch_value(self, model, iter_):
         song = model.get_value(iter_)
         if self._pattern is not None:
-            return self._pattern % song
+            return self._pattern.format_many((song,))[0]
         return ""
 
     def _apply_value(self, model, iter_, cell, value):
         cell.set_property("text", value)
 
+    def invalidate(self, songs=None):
+        """Forget cached values, to be called when `songs` change"""
+        if self._pattern is not None:
+            self._pattern.invalidate(songs)
+
 
 class NumericColumn(TextColumn):
     """Any '~#' keys except dates."""
@@ -10,12 +10,13 @@
 from typing import Any
 from collections.abc import Iterable, Sequence
 
-from gi.repository import Gtk
+from gi.repository import Gtk, GObject, GLib
 
 from quodlibet.order import Order
 from quodlibet.qltk.playorder import OrderInOrder
 from quodlibet.qltk.models import ObjectStore
 from quodlibet.util import print_d
+from quodlibet.util.prefetch import Prefetcher
 from quodlibet import config
 
 
@@ -29,11 +30,26 @@ class PlaylistMux:
     def __init__(self, player, q, pl):
         self.q = q
         self.pl = pl
+        self.models = (q, pl)
+        """The models songs get picked from"""
         self._id = player.connect("song-started", self.__song_started)
         self._player = player
+        self._prefetcher = Prefetcher()
+        self.__prefetch_id = None
+        self.__model_ids = []
+        for model in self.models:
+            for signal in ["row-inserted", "row-deleted", "rows-reordered"]:
+                id_ = model.connect(signal, self.__queue_prefetch)
+                self.__model_ids.append((model, id_))
 
     def destroy(self):
         self._player.disconnect(self._id)
+        for model, id_ in self.__model_ids:
+            model.disconnect(id_)
+        if self.__prefetch_id is not None:
+            GLib.source_remove(self.__prefetch_id)
+            self.__prefetch_id = None
+        self._prefetcher.destroy()
 
     def __song_started(self, player, song):
         if song is not None and self.q.sourced:
@@ -44,6 +60,22 @@ class PlaylistMux:
                 # we don't call _check_sourced here since we want the queue
                 # to stay sourced even if no current song is left
 
+        if config.getint("player", "prefetch_songs", 0) > 0:
+            self._prefetcher.started(song)
+            self.__queue_prefetch()
+
+    def __queue_prefetch(self, *args):
+        if self.__prefetch_id is None:
+            self.__prefetch_id = GLib.idle_add(self.__prefetch)
+
+    def __prefetch(self):
+        self.__prefetch_id = None
+        count = config.getint("player", "prefetch_songs", 0)
+        if count > 0 and self._player.song is not None:
+            budget = config.getint("player", "prefetch_budget", 0) * 1024 * 1024
+            self._prefetcher.prefetch(self.peek_upcoming(count), budget)
+        return False
+
     @property
     def current(self):
         """The current song or None"""
@@ -90,6 +122,35 @@ class PlaylistMux:
             self.q.next_ended()
         self._check_sourced()
 
+    def peek_next_ended(self):
+        """The song `next_ended` would switch to, without switching.
+
+        Raises NotImplementedError if that can't be told in advance.
+        """
+
+        keep_songs = config.getboolean("memory", "queue_keep_songs", False)
+        q_disable = config.getboolean("memory", "queue_disable", False)
+
+        if self.q.is_empty() or q_disable or (keep_songs and not self.q.sourced):
+            if q_disable and self.q.sourced:
+                raise NotImplementedError
+            song = self.pl.peek_next_ended()
+            return self.q.current if self.q.current is not None else song
+        song = self.q.peek_next_ended()
+        return song if song is not None else self.pl.current
+
+    def peek_upcoming(self, count: int) -> list:
+        """Up to `count` songs coming up after the current one,
+        as far as they can be told in advance"""
+
+        keep_songs = config.getboolean("memory", "queue_keep_songs", False)
+        q_disable = config.getboolean("memory", "queue_disable", False)
+
+        if self.q.is_empty() or q_disable or (keep_songs and not self.q.sourced):
+            return self.pl.peek_upcoming(count)
+        songs = self.q.peek_upcoming(count)
+        return songs + self.pl.peek_upcoming(count - len(songs))
+
     def previous(self):
         """Go to the previous song"""
 
@@ -163,6 +224,18 @@ class TrackCurrentModel(ObjectStore):
             if song is oldsong:
                 self.__iter = iter_
 
+    def extend(self, songs: Sequence[Any]):
+        """Append the passed songs, picking up the last current song
+        if it's among them and there's no current one yet"""
+
+        oldsong = self.last_current
+        if self.__iter is not None or oldsong is None:
+            self.append_many(songs)
+            return
+        for iter_, song in zip(self.iter_append_many(songs), songs, strict=False):
+            if song is oldsong and self.__iter is None:
+                self.__iter = iter_
+
     def get(self) -> list[Any]:
         """A list of all contained songs"""
 
@@ -236,16 +309,30 @@ class TrackCurrentModel(ObjectStore):
 class PlaylistModel(TrackCurrentModel):
     """A play list model for song lists"""
 
-    order: Order
-    """The active play order"""
+    __gsignals__ = {
+        "order-changed": (GObject.SignalFlags.RUN_LAST, None, ()),
+    }
 
     sourced = False
     """True in case this model is the source of the currently playing song"""
 
     def __init__(self, order_cls: type[Order] = OrderInOrder):
         super().__init__(object)
+        self.models = (self,)
+        """The models songs get picked from"""
         self.order = order_cls()
 
+    @property
+    def order(self) -> Order:
+        """The active play order"""
+
+        return self.__order
+
+    @order.setter
+    def order(self, order: Order):
+        self.__order = order
+        self.emit("order-changed")
+
     def next(self):
         """Switch to the next song"""
 
@@ -260,6 +347,31 @@ class PlaylistModel(TrackCurrentModel):
         print_d(f"Using {self.order}.next_implicit() to get next song")
         self.current_iter = self.order.next_implicit(self, iter_)
 
+    def peek_next_ended(self):
+        """The song `next_ended` would switch to, without switching.
+
+        Raises NotImplementedError if the play order can't tell in advance.
+        """
+
+        iter_ = self.order.peek_implicit(self, self.current_iter)
+        return iter_ and self.get_value(iter_, 0)
+
+    def peek_upcoming(self, count: int) -> list:
+        """Up to `count` songs `next_ended` would switch to one after
+        the other, as far as the play order can tell in advance"""
+
+        songs = []
+        iter_ = self.current_iter
+        for _i in range(count):
+            try:
+                iter_ = self.order.peek_implicit(self, iter_)
+            except NotImplementedError:
+                break
+            if iter_ is None:
+                break
+            songs.append(self.get_value(iter_, 0))
+        return songs
+
     def previous(self):
         """Go to the previous song"""
 
@@ -18,12 +18,9 @@ from quodlibet import config
 from quodlibet import qltk
 from quodlibet import util
 
-from quodlibet.formats import AudioFileError
 from quodlibet.plugins import PluginManager
 from quodlibet.qltk._editutils import FilterPluginBox, FilterCheckButton
-from quodlibet.qltk._editutils import EditingPluginHandler, OverwriteWarning
-from quodlibet.qltk._editutils import WriteFailedError
-from quodlibet.qltk.wlw import WritingWindow
+from quodlibet.qltk._editutils import EditingPluginHandler, write_songs
 from quodlibet.qltk.views import TreeViewColumn
 from quodlibet.qltk.cbes import ComboBoxEntrySave
 from quodlibet.qltk.models import ObjectStore
@@ -282,24 +279,12 @@ class TagsFromPath(Gtk.VBox):
         pattern = TagsFromPattern(pattern_text)
         model = self.view.get_model()
         add = bool(addreplace.get_active())
-        win = WritingWindow(self, len(model))
-        win.show()
+        entries = {e.song: e for e in ((model and model.values()) or [])}
 
-        was_changed = set()
-
-        all_done = False
-        for entry in (model and model.values()) or []:
-            song = entry.song
+        def change(song):
+            entry = entries[song]
             changed = False
-            if not song.valid():
-                win.hide()
-                dialog = OverwriteWarning(self, song)
-                resp = dialog.run()
-                win.show()
-                if resp != OverwriteWarning.RESPONSE_SAVE:
-                    break
-
-            for _i, h in enumerate(pattern.headers):
+            for h in pattern.headers:
                 text = entry.get_match(h)
                 if text:
                     can_multiple = song.can_multiple_values(h)
@@ -311,24 +296,9 @@ class TagsFromPath(Gtk.VBox):
                             if val not in song.list(h):
                                 song.add(h, val)
                                 changed = True
+            return changed
 
-            if changed:
-                try:
-                    song.write()
-                except AudioFileError:
-                    util.print_exc()
-                    WriteFailedError(self, song).run()
-                    library.reload(song, changed=was_changed)
-                    break
-                was_changed.add(song)
-
-            if win.step():
-                break
-        else:
-            all_done = True
-
-        win.destroy()
-        library.changed(was_changed)
+        all_done = write_songs(self, entries, change, library)
         self.save.set_sensitive(not all_done)
 
     def __row_edited(self, renderer, path, new, model, header):
@@ -96,13 +96,29 @@ class TimeTracker(GObject.GObject):
                 )
 
 
-class SongTracker:
+class SongTracker(GObject.GObject):
+    """Updates the play statistics of songs when they start and end.
+
+    The `changed` signals for them get combined and emitted at most every
+    `FLUSH_INTERVAL` seconds (or on `flush()`), while `stats-changed` gets
+    emitted right away for anything that can't wait.
+    """
+
+    __gsignals__ = {
+        "stats-changed": (GObject.SignalFlags.RUN_LAST, None, (object,)),
+    }
+
+    FLUSH_INTERVAL = 10
+    """Maximum seconds between updating stats and emitting `changed`"""
+
     def __init__(self, librarian, player, pl):
+        super().__init__()
         self.__player_ids = [
             player.connect("song-ended", self.__end, librarian, pl),
             player.connect("song-started", self.__start, librarian),
         ]
         self.__player = player
+        self.__librarian = librarian
         timer = TimeTracker(player)
         timer.connect("tick", self.__timer)
         self.elapsed = 0
@@ -114,24 +130,34 @@ class SongTracker:
             self.__player.disconnect(id_)
         self.__player = None
 
-        if self.__change_id:
-            GLib.source_remove(self.__change_id)
-            self.__change_id = None
+        self.flush()
 
-    def __changed(self, librarian, song):
-        # try to combine changed events and process them if QL is idle
-        self.__to_change.add(song)
+    def flush(self):
+        """Emits `changed` for all songs with pending stats changes now"""
 
         if self.__change_id is not None:
             GLib.source_remove(self.__change_id)
             self.__change_id = None
 
-        def idle_change():
-            librarian.changed(list(self.__to_change))
+        if self.__to_change:
+            songs = list(self.__to_change)
             self.__to_change.clear()
+            print_d(f"Flushing stats changes of {len(songs)} song(s)")
+            self.__librarian.changed(songs)
+
+    def __changed(self, librarian, song):
+        self.__to_change.add(song)
+        self.emit("stats-changed", [song])
+
+        def timeout_flush():
             self.__change_id = None
+            self.flush()
+            return False
 
-        self.__change_id = GLib.idle_add(idle_change, priority=GLib.PRIORITY_LOW)
+        if self.__change_id is None:
+            self.__change_id = GLib.timeout_add_seconds(
+                self.FLUSH_INTERVAL, timeout_flush, priority=GLib.PRIORITY_LOW
+            )
 
     def __start(self, player, song, librarian):
         self.elapsed = 0
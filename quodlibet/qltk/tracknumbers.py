@@ -9,12 +9,9 @@ from gi.repository import Gtk
 from senf import fsn2text
 
 from quodlibet import qltk
-from quodlibet import util
 from quodlibet import _
-from quodlibet.formats import AudioFileError
-from quodlibet.qltk._editutils import OverwriteWarning, WriteFailedError
+from quodlibet.qltk._editutils import write_songs
 from quodlibet.qltk.views import HintedTreeView, TreeViewColumn
-from quodlibet.qltk.wlw import WritingWindow
 from quodlibet.qltk.x import Button, Align
 from quodlibet.qltk.models import ObjectStore
 from quodlibet.qltk import Icons
@@ -152,37 +149,15 @@ class TrackNumbers(Gtk.VBox):
             model.path_changed(path)
 
     def __save_files(self, parent, model, library):
-        win = WritingWindow(parent, len(model))
-        was_changed = set()
-        all_done = False
-        for entry in model.values():
-            song, track = entry.song, entry.tracknumber
-            if song.get("tracknumber") == track:
-                win.step()
-                continue
-            if not song.valid():
-                win.hide()
-                dialog = OverwriteWarning(self, song)
-                resp = dialog.run()
-                win.show()
-                if resp != OverwriteWarning.RESPONSE_SAVE:
-                    break
-            song["tracknumber"] = track
-            try:
-                song.write()
-            except AudioFileError:
-                util.print_exc()
-                WriteFailedError(self, song).run()
-                library.reload(song, changed=was_changed)
-                break
-            was_changed.add(song)
-            if win.step():
-                break
-        else:
-            all_done = True
+        tracks = {e.song: e.tracknumber for e in model.values()}
+
+        def change(song):
+            if song.get("tracknumber") == tracks[song]:
+                return False
+            song["tracknumber"] = tracks[song]
+            return True
 
-        library.changed(was_changed)
-        win.destroy()
+        all_done = write_songs(parent, tracks, change, library)
         self.save.set_sensitive(not all_done)
         self.revert.set_sensitive(not all_done)
 
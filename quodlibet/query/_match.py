@@ -13,14 +13,15 @@ from __future__ import annotations
 
 import operator
 import time
+import unicodedata
 from enum import auto, Enum
 from numbers import Real
 from typing import TypeVar
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
 
 from quodlibet.formats import FILESYSTEM_TAGS, TIME_TAGS
 from quodlibet.formats._audio import SIZE_TAGS, DURATION_TAGS
-from quodlibet.unisearch import compile
+from quodlibet.unisearch import compile, parse_literal, search_form
 from quodlibet.util import parse_date
 from senf import fsn2text, fsnative
 
@@ -59,7 +60,76 @@ class Node:
         return True
 
 
+def _compile_literal(
+    text: str,
+    at_start: bool,
+    at_end: bool,
+    ignore_case: bool,
+    fallback: Callable[[str], bool],
+) -> Callable[[str], bool]:
+    """Like `unisearch.compile` for a literal pattern, but using plain
+    string operations. Ignoring case needs an ASCII `text`, and values
+    which aren't ASCII get passed to `fallback` instead, as `str.lower`
+    doesn't fold case like the regex engine does (e.g. for "İ" or "K")."""
+
+    normalize = unicodedata.normalize
+    is_normalized = unicodedata.is_normalized
+    text = normalize("NFC", text)
+    if ignore_case:
+        assert text.isascii()
+        text = text.lower()
+
+        def matches(value: str, search: Callable[[str], bool]) -> bool:
+            if not value.isascii():
+                return fallback(value)
+            return search(value.lower())
+
+    else:
+
+        def matches(value: str, search: Callable[[str], bool]) -> bool:
+            if not is_normalized("NFC", value):
+                value = normalize("NFC", value)
+            return search(value)
+
+    # Multi-line (multi-value) tags match if any of their lines do
+    if at_start and at_end:
+
+        def search_folded(value):
+            return value == text or ("\n" in value and text in value.split("\n"))
+
+    elif at_start:
+        line_start = "\n" + text
+
+        def search_folded(value):
+            return value.startswith(text) or line_start in value
+
+    elif at_end:
+        line_end = text + "\n"
+
+        def search_folded(value):
+            return value.endswith(text) or line_end in value
+
+    else:
+
+        def search_folded(value):
+            return text in value
+
+    def search(value):
+        return matches(value, search_folded)
+
+    return search
+
+
 class Regex(Node):
+    exact: str | None = None
+    """The case-folded text if this matches a whole line exactly"""
+
+    folded: str | None = None
+    """The text to look for in `unisearch.search_form` values instead,
+    if this is a plain insensitive text search"""
+
+    ignore_case = True
+
     def __init__(self, pattern: str, mod_string: str):
         self.pattern = str(pattern)
         self.mod_string = str(mod_string)
@@ -67,13 +137,27 @@ class Regex(Node):
         ignore_case = "c" not in self.mod_string or "i" in self.mod_string
         dot_all = "s" in self.mod_string
         asym = "d" in self.mod_string
+        self.ignore_case = ignore_case
+
         try:
             re = compile(self.pattern, ignore_case, dot_all, asym)
-            self.search = re  # type: ignore
         except ValueError as e:
             raise ParseError(
                 f"The regular expression /{self.pattern}/ is invalid."
             ) from e
+        self.search = re  # type: ignore
+        self.folded = getattr(re, "folded", None)
+
+        literal = None if asym else parse_literal(self.pattern)
+        if literal is not None and (literal[0].isascii() or not ignore_case):
+            # Plain (anchored) text doesn't need the regex engine
+            text, at_start, at_end = literal
+            self.search = _compile_literal(  # type: ignore
+                text, at_start, at_end, ignore_case, re
+            )
+            if at_start and at_end:
+                text = unicodedata.normalize("NFC", text)
+                self.exact = text.lower() if ignore_case else text
 
     def __repr__(self):
         return f"<Regex pattern={self.pattern} mod={self.mod_string}>"
@@ -123,6 +207,38 @@ class Union(Node):
     def __init__(self, res: list[Node]):
         self.res = res
 
+        # Many exact values (e.g. `artist=|("a", "b", …)`) become a set lookup
+        exact = [r for r in res if isinstance(r, Regex) and r.exact is not None]
+        if len(exact) > 1:
+            self.search = self._exact_search(exact)  # type: ignore
+
+    def _exact_search(self, exact: list[Regex]) -> Callable[[str], bool]:
+        lines_in = {
+            ignore_case: frozenset(
+                r.exact for r in exact if r.ignore_case == ignore_case
+            )
+            for ignore_case in (True, False)
+        }
+        others = [r.search for r in self.res if r not in exact]
+        # str.lower doesn't fold case like the regex engine for non-ASCII
+        insensitive = [r.search for r in exact if r.ignore_case]
+        normalize = unicodedata.normalize
+
+        def search(value):
+            value = normalize("NFC", value)
+            lines = value.split("\n")
+            if not lines_in[False].isdisjoint(lines):
+                return True
+            if lines_in[True]:
+                if not value.isascii():
+                    if any(s(value) for s in insensitive):
+                        return True
+                elif not lines_in[True].isdisjoint(line.lower() for line in lines):
+                    return True
+            return any(s(value) for s in others)
+
+        return search
+
     def search(self, data):
         for re in self.res:
             if re.search(data):
@@ -549,6 +665,7 @@ class Tag(Node):
 
     def __init__(self, names: Iterable[str], res):
         self.res = res
+        self._folded = getattr(res, "folded", None)
         self._names = []
         self.__intern = []
         self.__fs = []
@@ -566,6 +683,11 @@ class Tag(Node):
                 self._names.append(name)
 
     def search(self, data):
+        if self._folded is not None:
+            forms = getattr(data, "search_forms", None)
+            if forms is not None:
+                return self._search_forms(data, forms)
+
         search = self.res.search
         fs_default = fsnative()
 
@@ -590,6 +712,40 @@ class Tag(Node):
 
         return False
 
+    def _search_forms(self, data, forms):
+        """Like `search`, but looks in (cached) search forms of the values"""
+
+        folded = self._folded
+        fs_default = fsnative()
+
+        for name in self._names:
+            val = data.get(name)
+            is_fs = False
+            if val is None:
+                if name in ("filename", "mountpoint"):
+                    val = data.get("~" + name, fs_default)
+                    is_fs = True
+                else:
+                    val = data.get("~" + name, "")
+
+            cached = forms.get(name)
+            if cached is None or cached[0] is not val:
+                text = fsn2text(val) if is_fs else val
+                cached = forms[name] = (val, search_form(text))
+            if folded in cached[1]:
+                return True
+
+        # Synthetic values are created on demand, so don't cache those
+        for name in self.__intern:
+            if folded in search_form(data(name)):
+                return True
+
+        for name in self.__fs:
+            if folded in search_form(fsn2text(data(name, fs_default))):
+                return True
+
+        return False
+
     def __repr__(self):
         names = self._names + self.__intern
         return f"<Tag names={names!r}, res={self.res!r}>"
@@ -7,10 +7,11 @@
 # (at your option) any later version.
 
 import os
+from collections.abc import Iterator
 
 from senf import path2fsn, fsn2bytes, bytes2fsn, fsnative
 
-from quodlibet.util import fifo, print_w
+from quodlibet.util import copool, fifo, print_exc, print_w
 from quodlibet import get_user_dir
 
 try:
@@ -151,13 +152,34 @@ class QuodLibetUnixRemote(RemoteBase):
         for command, path in messages:
             command = bytes2fsn(command, None)
             response = self._cmd_registry.handle_line(self._app, command)
-            if path is not None:
-                path = bytes2fsn(path, None)
+            if path is None:
+                continue
+            path = bytes2fsn(path, None)
+            if isinstance(response, Iterator):
+                copool.add(self._stream_response, path, response, funcid=path)
+            else:
                 with open(path, "wb") as h:
                     if response is not None:
                         assert isinstance(response, fsnative)
                         h.write(fsn2bytes(response, None))
 
+    def _stream_response(self, path, response):
+        """Writes the parts of a response to the reply FIFO,
+        one per main loop iteration"""
+
+        try:
+            with open(path, "wb") as h:
+                for part in response:
+                    assert isinstance(part, fsnative)
+                    if part:
+                        h.write(fsn2bytes(part, None))
+                        h.flush()
+                    yield True
+        except BrokenPipeError:
+            print_w(f"Reader of {path!r} went away")
+        except Exception:
+            print_exc()
+
 
 Remote: type[RemoteBase]
 
@@ -12,12 +12,14 @@ import unicodedata
 try:
     from re import _parser as sre_parse  # type: ignore
     from re import _constants as sre_constants  # type: ignore
+    from re._casefix import _EXTRA_CASES  # type: ignore
 except ImportError:
     import sre_parse
     import sre_constants
+    from sre_compile import _ignorecase_fixes as _EXTRA_CASES  # type: ignore # noqa: N812
 
 from quodlibet import print_d
-from quodlibet.util import re_escape
+from quodlibet.util import re_escape, cached_func
 
 from .db import get_replacement_mapping
 
@@ -276,6 +278,108 @@ def re_add_variants(text: str) -> str:
     return re_replace_literals(text, get_replacement_mapping())
 
 
+def parse_literal(pattern: str) -> tuple[str, bool, bool] | None:
+    """Returns `(text, at_start, at_end)` if the regex `pattern` is just
+    a literal text, optionally anchored to the start / end of a line,
+    or `None` if it needs a real regex engine."""
+
+    try:
+        parsed = sre_parse.parse(pattern)
+    except sre_constants.error:
+        return None
+    if parsed.state.flags & ~sre_constants.SRE_FLAG_UNICODE:
+        return None
+
+    ops = list(parsed)
+    at_start = bool(ops) and ops[0] == (sre_constants.AT, sre_constants.AT_BEGINNING)
+    if at_start:
+        ops = ops[1:]
+    at_end = bool(ops) and ops[-1] == (sre_constants.AT, sre_constants.AT_END)
+    if at_end:
+        ops = ops[:-1]
+    if any(op is not sre_constants.LITERAL for op, _av in ops):
+        return None
+    text = "".join(chr(av) for _op, av in ops)
+    if "\n" in text:
+        return None
+    return text, at_start, at_end
+
+
+@cached_func
+def get_fold_table() -> tuple[dict[int, str], frozenset[str]]:
+    """Returns a `str.translate` table replacing each character by the
+    (ASCII) character it is a variant of, and the lower-cased texts
+    which have variants that can't be replaced unambiguously or only
+    by several characters (like "ß" -> "ss").
+    """
+
+    owners: dict[str, set[str]] = {}
+    for text, variants in get_replacement_mapping().items():
+        for variant in variants:
+            owners.setdefault(variant, set()).add(text)
+
+    def root(text, seen=()):
+        # Variants of variants (e.g. "ǿ" of "ø" of "o") fold all the way
+        if len(text) > 1 or text in seen or len(owners.get(text, ())) != 1:
+            return text
+        return root(next(iter(owners[text])), seen + (text,))
+
+    table: dict[int, str] = {}
+    unsafe: set[str] = set()
+    for variant, texts in owners.items():
+        roots = {root(text) for text in texts}
+        if len(roots) == 1 and len(next(iter(roots))) == 1:
+            table[ord(variant)] = roots.pop()
+        else:
+            # A part of an expansion mustn't match on its own ("e" in "æ"),
+            # so these stay as they are and get searched with a regex
+            unsafe.update(text.lower() for text in texts)
+
+    # Search forms are lower-cased, but matching ignores case both ways
+    for code, target in list(table.items()):
+        lower = chr(code).lower()
+        if len(lower) == 1:
+            table.setdefault(ord(lower), target)
+
+    # Characters the regex engine treats as the same when ignoring case,
+    # beyond lower-casing ("ı" and "i", "ſ" and "s"), fold the same way
+    for code, others in _EXTRA_CASES.items():
+        group = sorted((code, *others))
+        folded = [table[c] for c in group if c in table]
+        table[code] = folded[0] if folded else chr(group[0])
+    return table, frozenset(unsafe)
+
+
+def search_form(text: str) -> str:
+    """Returns `text` normalized for case and diacritic insensitive searches:
+    NFC normalized, lower-cased and with all characters that are variants
+    of ASCII ones (see `re_add_variants`) replaced by them.
+
+    "Föhn" -> "fohn"
+    """
+
+    table = get_fold_table()[0]
+    text = unicodedata.normalize("NFC", text)
+    # The only character lower-cased to several ones ("i" and a dot above),
+    # while the regex engine matches it with just "i"
+    text = text.replace("\u0130", "i")
+    return text.lower().translate(table)
+
+
+def _fold_literal(text: str) -> str | None:
+    """Returns the search form of a literal search text if searching it in
+    search forms gives the same results as `re_add_variants`, else `None`"""
+
+    unsafe = get_fold_table()[1]
+    text = unicodedata.normalize("NFC", text).lower()
+    # Non-ASCII characters only match themselves or their own variants
+    if not text.isascii():
+        return None
+    if any(u in text for u in unsafe):
+        return None
+    return text
+
+
 def compile(
     pattern: str, ignore_case: bool = True, dot_all: bool = False, asym: bool = False
 ) -> Callable[[str], bool]:
@@ -296,6 +400,17 @@ def compile(
 
     pattern = unicodedata.normalize("NFC", pattern)
 
+    literal = parse_literal(pattern) if asym and ignore_case else None
+    if literal is not None and not any(literal[1:]):
+        folded = _fold_literal(literal[0])
+        if folded is not None:
+            # Plain text can be searched for in the search form instead
+            def search_folded(text: str):
+                return folded in search_form(text)
+
+            search_folded.folded = folded  # type: ignore
+            return search_folded
+
     if asym:
         try:
             pattern = re_add_variants(pattern)
@@ -688,6 +688,9 @@ class XSPFBackedPlaylist(FileBackedPlaylist):
     """Persistence version"""
 
     EXT = "xspf"
+    _written_state: tuple | None = None
+    """Persisted data as of the last write, for change detection"""
+
     CREATOR_PATTERN = Pattern("<artist|<artist>|<~people>>")
     _SAFER = {c: quote(c, safe="") for c in ('\\/:*?"<>|' if is_windows() else "\0/")}
 
@@ -712,56 +715,103 @@ class XSPFBackedPlaylist(FileBackedPlaylist):
         old_pl.delete()
         return new
 
+    def __init__(
+        self,
+        dir_: _fsnative,
+        filename: _fsnative,
+        songs_lib=None,
+        pl_lib=None,
+        validate: bool = False,
+        locations: tuple[str | None, list[str]] | None = None,
+    ):
+        # Already-parsed contents (see `read_locations`), if any
+        self._locations = locations
+        super().__init__(
+            dir_, filename, songs_lib=songs_lib, pl_lib=pl_lib, validate=validate
+        )
+
+    @classmethod
+    def read_locations(cls, path: _fsnative) -> tuple[str | None, list[str]]:
+        """Streams through the XSPF at `path`, returning its title
+        and the (local path, where possible) locations of its tracks.
+
+        This touches no library, so is safe to call from other threads.
+        Raises `OSError`, or `ValueError` / `ET.ParseError` for bad files
+        """
+        title = None
+        locations = []
+        prefix = None
+        in_track = False
+        location = None
+        for event, el in ET.iterparse(path, events=("start", "end")):
+            if prefix is None:
+                if el.tag == "playlist":
+                    prefix = ""
+                    print_w(f"Using legacy namespace for import of {path}")
+                elif el.tag == "{" + XSPF_NS + "}playlist":
+                    prefix = "{" + XSPF_NS + "}"
+                else:
+                    raise ValueError(f"Unknown playlist root of {el.tag}")
+                continue
+            tag = el.tag
+            if event == "start":
+                if tag == prefix + "track":
+                    in_track = True
+                    location = None
+                continue
+            if tag == prefix + "location" and in_track:
+                if location is None:
+                    location = el.text or ""
+            elif tag == prefix + "track":
+                in_track = False
+                if location is not None:
+                    path_ = location.strip().replace("\n", "").replace("\r", "")
+                    try:
+                        # TODO: process relative URIs too?
+                        path_ = uri2fsn(path_)
+                    except ValueError:
+                        pass
+                    locations.append(path_)
+                # Keep memory flat for big playlists
+                el.clear()
+            elif tag == prefix + "title" and not in_track and title is None:
+                title = el.text
+        return title, locations
+
     def _populate_from_file(self):
         library = self.songs_lib
         try:
-            tree = ET.parse(self.path)
-            # TODO: validate some top-level tag data
-
-            root = tree.getroot()
-            if root.tag == "playlist":
-                ns_mapping = None
-                print_w(f"Using legacy namespace for import of {self.path}")
-            elif root.tag == "{" + XSPF_NS + "}playlist":
-                # Try correct format first
-                ns_mapping = {"": XSPF_NS}
-            else:
-                raise ValueError(f"Unknown playlist root of {root.tag}")
-            node = root.find("title", namespaces=ns_mapping)
-            if node is None:
-                print_w(
-                    f"No <title> found in {self.path} "
-                    f"(Got nodes: {[el.tag for el in root.iter()]})"
-                )
-            elif self.name != node.text:
-                print_w(
-                    f"Playlist was named {node.text!r} in XML "
-                    f"instead of {self.name!r} at {self.path!r}"
-                )
-
-            for node in tree.iterfind(".//track", namespaces=ns_mapping):
-                location = node.findtext("location", namespaces=ns_mapping).strip()
-                path = location.replace("\n", "").replace("\r", "")
-                try:
-                    # TODO: process relative URIs too?
-                    path = uri2fsn(path)
-                except ValueError:
-                    pass
-                if path in library:
-                    self._list.append(library[path])
-                elif library and library.masked(path):
-                    self._list.append(path)
-                else:
-                    # TODO: handle missing playlist items (#3105, #729, #3131)
-                    node_dump = ET.tostring(node, method="xml").decode("utf-8")
-                    print_w(
-                        f"Couldn't find {path!r} in playlist at {self.path!r}. "
-                        f"Perhaps its metadata will help: {node_dump!r}"
-                    )
-                    self._list.append(path)
-                    library.mask(path)
+            title, paths = self._locations or self.read_locations(self.path)
         except (ET.ParseError, ValueError) as e:
             print_w(f"Couldn't load {self.path!r} ({e})")
+            return
+        finally:
+            self._locations = None
+        # TODO: validate some more top-level tag data
+        up_to_date = True
+        if title is None:
+            print_w(f"No <title> found in {self.path}")
+            up_to_date = False
+        elif self.name != title:
+            print_w(
+                f"Playlist was named {title!r} in XML "
+                f"instead of {self.name!r} at {self.path!r}"
+            )
+            up_to_date = False
+
+        for path in paths:
+            if path in library:
+                self._list.append(library[path])
+            elif library and library.masked(path):
+                self._list.append(path)
+            else:
+                # TODO: handle missing playlist items (#3105, #729, #3131)
+                print_w(f"Couldn't find {path!r} in playlist at {self.path!r}")
+                self._list.append(path)
+                library.mask(path)
+        if up_to_date:
+            # So unchanged playlists don't get written out again
+            self._written_state = self._state_of(self.name, self._track_data())
 
     @classmethod
     def filename_for(cls, name: str):
@@ -777,10 +827,9 @@ class XSPFBackedPlaylist(FileBackedPlaylist):
             raise TypeError(f"XSPFs should end in '{cls.EXT}', not {ext}")
         return filename
 
-    def write(self):
-        track_list = Element("trackList")
-        # TODO: ditch for proper indent, once we have Python 3.9
-        track_list.text = "\n"
+    def _track_data(self) -> list[dict[str, Any]]:
+        """The per-track fields that actually get persisted to XSPF"""
+        tracks = []
         for song in self._list:
             if isinstance(song, str):
                 track = {"location": fsn2uri(song)}
@@ -798,6 +847,36 @@ class XSPFBackedPlaylist(FileBackedPlaylist):
                     "trackNum": song("~#track"),
                     "duration": int(song("~#length") * 1000.0),
                 }
+            tracks.append(track)
+        return tracks
+
+    @classmethod
+    def _state_of(cls, name: str, tracks: list[dict[str, Any]]) -> tuple:
+        return name, tuple(tuple(t.items()) for t in tracks)
+
+    @property
+    def needs_write(self) -> bool:
+        """True if the persisted data (not e.g. play counts or `~playlists`)
+        differs from what was last written"""
+        if self._last_fn != self.path:
+            return True
+        return self._state_of(self.name, self._track_data()) != self._written_state
+
+    def write_if_changed(self) -> bool:
+        """Writes only if anything persisted has changed.
+        :returns True if the file was written"""
+        if not self.needs_write:
+            print_d(f"Nothing persisted changed for {self.name!r}, not writing")
+            return False
+        self.write()
+        return True
+
+    def write(self):
+        tracks = self._track_data()
+        track_list = Element("trackList")
+        # TODO: ditch for proper indent, once we have Python 3.9
+        track_list.text = "\n"
+        for track in tracks:
             track_list.append(self._element_from("track", track, True))
         playlist = Element("playlist", attrib={"version": "1", "xmlns": XSPF_NS})
         # Be kind to cat, git, editors etc. by leaving a final newline
@@ -814,6 +893,7 @@ class XSPFBackedPlaylist(FileBackedPlaylist):
         if self._last_fn != path:
             self._delete_file(self._last_fn)
             self._last_fn = path
+        self._written_state = self._state_of(self.name, tracks)
 
     @classmethod
     def _version_tag(cls):
@@ -214,3 +214,69 @@ class HashedList(abc.MutableSequence):
 
     def __repr__(self):
         return repr(self._data)
+
+
+class FenwickTree:
+    """A binary indexed tree of non-negative weights,
+    with O(log n) updates, prefix sums and weighted lookups.
+    """
+
+    def __init__(self, weights=()):
+        self._weights = [float(w) for w in weights]
+        n = len(self._weights)
+        tree = [0.0] * (n + 1)
+        for i, w in enumerate(self._weights, 1):
+            tree[i] += w
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def __len__(self):
+        return len(self._weights)
+
+    def __getitem__(self, index):
+        return self._weights[index]
+
+    def __setitem__(self, index, weight):
+        delta = float(weight) - self._weights[index]
+        if not delta:
+            return
+        self._weights[index] = float(weight)
+        tree = self._tree
+        i = index + 1
+        n = len(tree) - 1
+        while i <= n:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, end):
+        """The sum of the weights before `end`"""
+        total = 0.0
+        tree = self._tree
+        i = end
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    @property
+    def total(self):
+        return self.prefix_sum(len(self._weights))
+
+    def find(self, value):
+        """Returns the index `i` where `prefix_sum(i) <= value < prefix_sum(i + 1)`,
+        i.e. picks an index proportional to its weight
+        for a `value` uniformly chosen in [0, total)."""
+
+        tree = self._tree
+        n = len(tree) - 1
+        pos = 0
+        step = 1 << n.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= n and tree[nxt] <= value:
+                pos = nxt
+                value -= tree[nxt]
+            step >>= 1
+        return min(pos, n - 1)
@@ -0,0 +1,192 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+
+"""Files of JSON records which only get appended to until they get
+compacted, like a persistent queue of entries (e.g. scrobbles) waiting
+to be sent"""
+
+import itertools
+import json
+import os
+import threading
+from collections.abc import Iterable
+from typing import Any
+
+from quodlibet import print_d, print_w
+from quodlibet.util.atomic import atomic_save
+
+COMPACT_AFTER = 1000
+"""Superseded records in the file before it gets rewritten"""
+
+
+class RecordFile:
+    """Base class for state kept as a file of JSON records, one per line.
+
+    Changes get appended as records. Once enough of the records in the
+    file are superseded (counted in `_stale`), it gets rewritten with just
+    the current ones. Lines cut short by a crash get skipped on load.
+
+    Subclasses implement `_load_record()`, `_current_records()`
+    and `__len__()`, and call `_load()` once set up.
+    """
+
+    def __init__(self, path, compact_after: int = COMPACT_AFTER):
+        self.path = path
+        self.compact_after = compact_after
+        self._stale = 0
+        """Records in the file superseded by later ones"""
+        self._unterminated = False
+        """If the last line in the file is missing its newline"""
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def _load_record(self, record: dict):
+        """Applies a record read from the file.
+        Raises ValueError, KeyError or TypeError if it is invalid"""
+
+        raise NotImplementedError
+
+    def _current_records(self) -> Iterable[dict]:
+        """The records to rewrite the file with when compacting"""
+
+        raise NotImplementedError
+
+    def _load(self) -> int:
+        """Reads the file, returning the number of broken lines skipped"""
+
+        try:
+            with open(self.path, encoding="utf-8") as h:
+                lines = h.readlines()
+        except FileNotFoundError:
+            return 0
+        except OSError as e:
+            print_w(f"Couldn't read {self.path!r} ({e})")
+            return 0
+
+        broken = 0
+        for line in lines:
+            try:
+                self._load_record(json.loads(line))
+            except (ValueError, KeyError, TypeError):
+                # Most likely the last line, cut short by a crash
+                print_w(f"Skipping broken line in {self.path!r}")
+                broken += 1
+        self._unterminated = bool(lines) and not lines[-1].endswith("\n")
+        print_d(f"Loaded {len(self)} records from {self.path!r}")
+        if broken or self._should_compact():
+            self._compact()
+        return broken
+
+    def _should_compact(self) -> bool:
+        return self._stale >= max(self.compact_after, len(self))
+
+    def _append(self, records: Iterable[dict]):
+        data = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records)
+        if self._unterminated:
+            # Otherwise this would continue a line cut short by a crash
+            data = "\n" + data
+        try:
+            with open(self.path, "a", encoding="utf-8") as h:
+                h.write(data)
+            self._unterminated = False
+        except OSError as e:
+            print_w(f"Couldn't write to {self.path!r} ({e})")
+
+    def _compact(self) -> bool:
+        """Rewrites the file with just the current records, or removes it
+        if there are none. Returns False if that failed"""
+
+        try:
+            if not len(self):
+                os.remove(self.path)
+            else:
+                with atomic_save(self.path, "wb") as h:
+                    for record in self._current_records():
+                        h.write(json.dumps(record, separators=(",", ":")).encode())
+                        h.write(b"\n")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print_w(f"Couldn't compact {self.path!r} ({e})")
+            return False
+        print_d(f"Compacted {self.path!r}, {len(self)} records left")
+        self._stale = 0
+        self._unterminated = False
+        return True
+
+
+class Journal(RecordFile):
+    """Entries waiting to be processed, oldest first.
+
+    Each added or acknowledged entry is a line of JSON appended to the
+    file, so nothing already written gets rewritten until enough entries
+    were acknowledged for compacting. Thread safe.
+    """
+
+    def __init__(self, path, compact_after: int = COMPACT_AFTER):
+        super().__init__(path, compact_after)
+        self._lock = threading.Lock()
+        self._pending: dict[int, Any] = {}
+        self._next_id = 0
+        self._load()
+
+    def _load(self) -> int:
+        broken = super()._load()
+        # Don't reuse the IDs the broken lines might have had
+        self._next_id += broken
+        return broken
+
+    def _load_record(self, record: dict):
+        if "done" in record:
+            for id_ in record["done"]:
+                if self._pending.pop(id_, None) is not None:
+                    self._stale += 1
+        else:
+            self._pending[record["id"]] = record["entry"]
+            self._next_id = max(self._next_id, record["id"] + 1)
+
+    def _current_records(self) -> Iterable[dict]:
+        for id_, entry in self._pending.items():
+            yield {"id": id_, "entry": entry}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __bool__(self) -> bool:
+        return bool(self._pending)
+
+    def add(self, entry):
+        """Adds `entry`, which has to be serializable to JSON"""
+
+        with self._lock:
+            id_ = self._next_id
+            self._next_id += 1
+            self._pending[id_] = entry
+            self._append([{"id": id_, "entry": entry}])
+
+    def peek(self, count: int) -> list[tuple[int, Any]]:
+        """Returns up to `count` of the oldest entries with their IDs"""
+
+        with self._lock:
+            return list(itertools.islice(self._pending.items(), count))
+
+    def entries(self) -> list:
+        """Returns all pending entries"""
+
+        with self._lock:
+            return list(self._pending.values())
+
+    def acknowledge(self, ids: Iterable[int]):
+        """Removes the entries with the given IDs, as they got processed"""
+
+        with self._lock:
+            done = [i for i in ids if self._pending.pop(i, None) is not None]
+            if not done:
+                return
+            self._stale += len(done)
+            compact = not self._pending or self._should_compact()
+            if not (compact and self._compact()):
+                self._append([{"done": done}])
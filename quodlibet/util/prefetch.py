@@ -0,0 +1,114 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+
+"""Reading the start of upcoming songs ahead of time, so opening them
+doesn't stall on slow storage (network shares, spinning disks)"""
+
+import os
+from collections.abc import Iterable
+
+from quodlibet import print_d
+from quodlibet.util.thread import Cancellable, call_async_background
+
+READ_CHUNK = 256 * 1024
+"""Bytes read at once, so cancelling doesn't have to wait long"""
+
+
+def read_ahead(path, length: int, cancellable: Cancellable | None = None) -> int:
+    """Reads up to `length` bytes from the start of the file at `path`,
+    which leaves them in the page cache of the OS.
+
+    Returns the number of bytes read. Raises OSError.
+    """
+
+    done = 0
+    with open(path, "rb", buffering=0) as h:
+        if hasattr(os, "posix_fadvise"):
+            # lets the kernel start reading in larger requests
+            os.posix_fadvise(h.fileno(), 0, length, os.POSIX_FADV_WILLNEED)
+        while done < length:
+            if cancellable is not None and cancellable.is_cancelled():
+                break
+            data = h.read(min(READ_CHUNK, length - done))
+            if not data:
+                break
+            done += len(data)
+    return done
+
+
+class Prefetcher:
+    """Reads ahead the files of songs about to be played in a background
+    thread and keeps statistics on whether that happened in time.
+
+    All methods have to be called from the main loop.
+    """
+
+    def __init__(self):
+        self._cancellable = Cancellable()
+        self._warm: set = set()
+        """Paths read ahead completely"""
+        self.hits = 0
+        """Started songs that were read ahead in time"""
+        self.misses = 0
+        """Started songs that weren't"""
+        self.bytes_read = 0
+
+    def prefetch(self, songs: Iterable, budget: int):
+        """Reads ahead the local files of `songs`, replacing any prefetching
+        still going on. Each song gets an equal share of `budget` bytes,
+        in the given order.
+        """
+
+        self._cancellable.cancel()
+        self._cancellable = cancellable = Cancellable()
+
+        paths = list(dict.fromkeys(s("~filename") for s in songs if s.is_file))
+        self._warm.intersection_update(paths)
+        todo = [p for p in paths if p not in self._warm]
+        if not todo or budget <= 0:
+            return
+        length = budget // len(paths)
+        call_async_background(
+            self._read, cancellable, self._read_done, args=(todo, length, cancellable)
+        )
+
+    @staticmethod
+    def _read(paths, length, cancellable):
+        warm = []
+        total = 0
+        for path in paths:
+            try:
+                total += read_ahead(path, length, cancellable)
+            except OSError as e:
+                print_d(f"Couldn't read ahead {path!r}: {e}")
+                continue
+            if cancellable.is_cancelled():
+                break
+            warm.append(path)
+        return warm, total
+
+    def _read_done(self, result):
+        warm, total = result
+        self._warm.update(warm)
+        self.bytes_read += total
+        print_d(f"Read ahead {total} bytes of {len(warm)} song(s)")
+
+    def started(self, song):
+        """Counts `song` starting to play as a hit or a miss"""
+
+        if song is None or not song.is_file:
+            return
+        if song("~filename") in self._warm:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def destroy(self):
+        self._cancellable.cancel()
+        if self.hits or self.misses:
+            print_d(
+                f"Read ahead {self.bytes_read} bytes, "
+                f"{self.hits} hit(s), {self.misses} miss(es)"
+            )
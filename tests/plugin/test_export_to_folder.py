@@ -0,0 +1,61 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+
+import os
+import shutil
+from unittest import mock
+
+from quodlibet.formats import AudioFile
+from quodlibet.pattern import FileFromPattern
+
+from tests import mkdtemp
+from tests.plugin import PluginTestCase
+
+
+class TExportToFolder(PluginTestCase):
+    def setUp(self):
+        self.mod = self.modules["ExportToFolder"]
+        self.dir = mkdtemp()
+        self.source = os.path.join(self.dir, "source.mp3")
+        with open(self.source, "wb") as h:
+            h.write(b"abc" * 1000)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_copy_file(self):
+        dest = os.path.join(self.dir, "dest.mp3")
+        assert not self.mod.is_unchanged(self.source, dest)
+        self.assertEqual(self.mod.copy_file(self.source, dest), 3000)
+        with open(dest, "rb") as h:
+            self.assertEqual(h.read(), b"abc" * 1000)
+        assert self.mod.is_unchanged(self.source, dest)
+
+        older = os.stat(self.source).st_mtime - 10
+        os.utime(dest, (older, older))
+        assert not self.mod.is_unchanged(self.source, dest)
+
+    def test_copy_file_range_copies_nothing(self):
+        dest = os.path.join(self.dir, "dest.mp3")
+        with mock.patch.object(os, "copy_file_range", lambda *args: 0, create=True):
+            self.assertEqual(self.mod.copy_file(self.source, dest), 3000)
+        with open(dest, "rb") as h:
+            self.assertEqual(h.read(), b"abc" * 1000)
+
+    def test_copy_workers(self):
+        workers = self.mod.copy_workers(self.dir)
+        assert 1 <= workers <= self.mod._MAX_COPY_WORKERS
+        self.assertEqual(
+            self.mod.copy_workers(os.path.join(self.dir, "missing")),
+            self.mod._DEFAULT_COPY_WORKERS,
+        )
+
+    def test_skips_unchanged(self):
+        plugin = self.mod.ExportToFolder()
+        song = AudioFile({"~filename": self.source, "title": "foo"})
+        pattern = FileFromPattern("<title>")
+        self.assertEqual(plugin._copy_file(song, self.dir, 1, pattern), 3000)
+        assert os.path.exists(os.path.join(self.dir, "0001 - foo.mp3"))
+        self.assertIs(plugin._copy_file(song, self.dir, 1, pattern), None)
@@ -5,6 +5,8 @@
 # the Free Software Foundation; either version 2 of the License, or
 # (at your option) any later version.
 
+import os
+import shutil
 import time
 
 from gi.repository import Gtk
@@ -21,8 +23,8 @@ else:
 
 
 from quodlibet import config
-from quodlibet.formats import MusicFile
-from tests import get_data_path, skipUnless
+from quodlibet.formats import AudioFile, MusicFile
+from tests import get_data_path, mkdtemp, skipUnless
 from tests.plugin import PluginTestCase
 
 
@@ -80,6 +82,99 @@ class TFingerprint(PluginTestCase):
         self.assertEqual(events[0][-1], "start")
         self.assertEqual(events[1][-1], "error")
 
+    def test_analyze_pool_cached(self):
+        cache = self.mod.cache.FingerprintCache(os.devnull)
+        song = MusicFile(get_data_path("silence-44-s.ogg"))
+        cache.put(self.mod.analyze.FingerPrintResult(song, "AQAA", 3.5))
+        pool = self.mod.analyze.FingerPrintPool(cache=cache)
+
+        events = []
+
+        def handler(*args):
+            events.append(args)
+
+        pool.connect("fingerprint-started", handler, "start")
+        pool.connect("fingerprint-done", handler, "done")
+        pool.push(song)
+        assert not events
+
+        t = time.time()
+        while len(events) < 2 and time.time() - t < self.TIMEOUT:
+            Gtk.main_iteration_do(False)
+
+        self.assertEqual([e[-1] for e in events], ["start", "done"])
+        result = events[1][1]
+        assert result.song is song
+        self.assertEqual(result.chromaprint, "AQAA")
+        self.assertEqual(result.length, 3.5)
+
+
+@skipUnless(Gst and chromaprint, "gstreamer plugins missing")
+class TFingerprintCache(PluginTestCase):
+    def setUp(self):
+        self.mod = self.modules["AcoustidSearch"]
+        self.dir = mkdtemp()
+        self.path = os.path.join(self.dir, "cache")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def result(self, song, chromaprint):
+        return self.mod.analyze.FingerPrintResult(song, chromaprint, 10.0)
+
+    def cache(self, **kwargs):
+        return self.mod.cache.FingerprintCache(self.path, **kwargs)
+
+    def song(self, num, mtime=1.0):
+        return AudioFile(
+            {"~filename": f"/dir/{num}.ogg", "~#mtime": mtime, "~#length": 10}
+        )
+
+    def test_persisted(self):
+        cache = self.cache()
+        song = self.song(1)
+        assert cache.get(song) is None
+        cache.put(self.result(song, "AQAB"))
+        assert song in cache
+
+        other = self.song(1)
+        result = self.cache().get(other)
+        assert result.song is other
+        self.assertEqual(result.chromaprint, "AQAB")
+        self.assertEqual(result.length, 10.0)
+
+    def test_changed_song(self):
+        cache = self.cache()
+        cache.put(self.result(self.song(1), "AQAB"))
+        assert self.song(1, mtime=2.0) not in cache
+        longer = self.song(1)
+        longer["~#length"] = 11
+        assert longer not in cache
+
+    def test_compact(self):
+        cache = self.cache(compact_after=2)
+        cache.put(self.result(self.song(1), "a"))
+        cache.put(self.result(self.song(2), "b"))
+        cache.put(self.result(self.song(1, mtime=2.0), "c"))
+        with open(self.path) as h:
+            self.assertEqual(len(h.readlines()), 3)
+        cache.put(self.result(self.song(2, mtime=2.0), "d"))
+        with open(self.path) as h:
+            self.assertEqual(len(h.readlines()), 2)
+
+        cache = self.cache()
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get(self.song(2, mtime=2.0)).chromaprint, "d")
+
+    def test_broken_line(self):
+        self.cache().put(self.result(self.song(1), "a"))
+        with open(self.path, "a") as h:
+            h.write('{"path": "/dir/2.o')
+        self.assertEqual(len(self.cache()), 1)
+
+        self.cache().put(self.result(self.song(3), "c"))
+        self.assertEqual(len(self.cache()), 2)
+
 
 @skipUnless(Gst and chromaprint, "gstreamer plugins missing")
 class TAcoustidLookup(PluginTestCase):
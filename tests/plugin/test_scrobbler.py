@@ -7,14 +7,16 @@
 
 import os
 import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from time import sleep, time
+from urllib.parse import parse_qs
 
 from quodlibet import config
 from quodlibet.ext.events.qlscrobbler import QLSubmitQueue
 from quodlibet.formats import AudioFile
-from quodlibet.util.picklehelper import pickle_load
+from quodlibet.util.journal import Journal
 from senf import fsnative
-from tests import run_gtk_loop, init_fake_app, destroy_fake_app
+from tests import init_fake_app, destroy_fake_app
 from tests.plugin import PluginTestCase
 
 A_SONG = AudioFile(
@@ -37,12 +39,9 @@ class TScrobbler(PluginTestCase):
         self.mod = self.modules["QLScrobbler"]
         self.plugin = self.plugins["QLScrobbler"].cls()
         # It's a class instance, so make sure :(
-        self.plugin.queue.queue.clear()
-        self.SCROBBLER_CACHE_FILE = self.mod.QLSubmitQueue.SCROBBLER_CACHE_FILE
-        try:
-            os.unlink(self.SCROBBLER_CACHE_FILE)
-        except FileNotFoundError:
-            pass
+        journal = self.mod.QLSubmitQueue.journal
+        journal.acknowledge(id_ for id_, _entry in journal.peek(len(journal)))
+        self.JOURNAL_FILE = self.mod.QLSubmitQueue.JOURNAL_FILE
 
     def tearDown(self):
         del self.mod
@@ -54,8 +53,7 @@ class TScrobbler(PluginTestCase):
         songs = [A_SONG]
         for song in songs:
             queue.submit(song)
-        assert len(queue.queue) == 1
-        queue.dump_queue()
+        assert len(queue.journal) == 1
 
         loaded = self.load_queue()
         assert all(
@@ -64,39 +62,71 @@ class TScrobbler(PluginTestCase):
         )
 
     def load_queue(self) -> list[dict]:
-        try:
-            with open(self.SCROBBLER_CACHE_FILE, "rb") as f:
-                return pickle_load(f)
-        except FileNotFoundError:
-            return []
+        return Journal(self.JOURNAL_FILE).entries()
 
     def test_enabled_disabled(self):
         self.plugin.enabled()
-        assert self.plugin._tid
-        # Disable
+        self.plugin.queue.submit(A_SONG)
         self.plugin.disabled()
-        assert not self.plugin._tid
+        assert len(self.load_queue()) == 1
 
-    def test_autosave(self):
-        self.plugin.AUTOSAVE_INTERVAL = 0.1
+    def test_persisted(self):
         self.plugin.enabled()
         assert not self.load_queue()
-        assert not self.plugin.queue.queue, "Queue not empty in test"
+        assert not self.plugin.queue.journal, "Queue not empty in test"
         self.plugin.queue.submit(A_SONG)
-        assert len(self.plugin.queue.queue) == 1, "Song wasn't queued"
-
-        queue = self.retry_queue()
-        assert len(queue) == 1, "Queued song didn't get persisted"
+        assert len(self.plugin.queue.journal) == 1, "Song wasn't queued"
+        assert len(self.load_queue()) == 1, "Queued song didn't get persisted"
         self.plugin.disabled()
 
-    def retry_queue(self):
-        """Allows GTK looks, flushing of disk buffers etc"""
-        queue = None
-        start = time()
-        while time() - start < 2:
-            run_gtk_loop()
-            queue = self.load_queue()
-            if queue:
-                break
-            sleep(0.1)
-        return queue
+    def test_submit_batches(self):
+        submissions = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                base = f"http://localhost:{self.server.server_port}"
+                self.reply(f"OK\nsession\n{base}/np\n{base}/submit\n")
+
+            def do_POST(self):
+                data = self.rfile.read(int(self.headers["Content-Length"]))
+                if self.path == "/submit":
+                    submissions.append(parse_qs(data.decode("ascii")))
+                self.reply("OK\n")
+
+            def reply(self, text):
+                self.send_response(200)
+                self.end_headers()
+                self.wfile.write(text.encode("utf-8"))
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(("localhost", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        config = self.mod.plugin_config
+        config.set("service", "Other")
+        config.set("url", f"http://localhost:{server.server_port}")
+        config.set("username", "user")
+        config.set("password", "secret")
+        queue = self.mod.QLSubmitQueue()
+        queue.SUBMIT_INTERVAL = 0
+        try:
+            for _i in range(queue.BATCH_SIZE + 10):
+                queue.submit(A_SONG)
+            threading.Thread(target=queue.run, daemon=True).start()
+
+            start = time()
+            while os.path.exists(self.JOURNAL_FILE) and time() - start < 5:
+                sleep(0.05)
+            assert not queue.journal
+            assert not os.path.exists(self.JOURNAL_FILE)
+            self.assertEqual(
+                [sum(key.startswith("a[") for key in s) for s in submissions],
+                [queue.BATCH_SIZE, 10],
+            )
+        finally:
+            config.set("offline", True)
+            queue.changed()
+            for key in ["service", "url", "username", "password", "offline"]:
+                config.set(key, config.defaults.get(key))
+            server.shutdown()
@@ -6,6 +6,7 @@
 # (at your option) any later version.
 
 import os
+import time
 from os import makedirs
 from pathlib import Path
 from unittest.mock import ANY, patch
@@ -1191,3 +1192,57 @@ class TSyncToDevice(PluginTestCase):
         self.assertEqual(mock_mkdir.call_count, n_songs)
         self.assertEqual(mock_cp.call_count, n_songs)
         self.assertEqual(mock_rm.call_count, 0)
+
+    def test_needs_copy(self):
+        needs_copy = self.module.needs_copy
+        source = os.path.join(get_user_dir(), "source.mp3")
+        dest = os.path.join(self.path_dest, "sub", "dest.mp3")
+        with open(source, "wb") as f:
+            f.write(b"abc")
+        try:
+            assert needs_copy(source, dest)
+            self.assertEqual(self.module.copy_if_changed(source, dest), 3)
+            self.assertIs(self.module.copy_if_changed(source, dest), None)
+
+            with open(dest, "wb") as f:
+                f.write(b"abd")
+            newer = os.stat(source).st_mtime + 10
+            os.utime(dest, (newer, newer))
+            assert not needs_copy(source, dest)
+            assert needs_copy(source, dest, compare_hash=True)
+
+            older = newer - 20
+            os.utime(dest, (older, older))
+            assert needs_copy(source, dest)
+
+            with open(dest, "wb") as f:
+                f.write(b"abcd")
+            assert needs_copy(source, dest)
+        finally:
+            os.remove(source)
+
+    @patch("shutil.copyfile")
+    @patch("os.makedirs")
+    def test_start_sync_resume(self, mock_mkdir, mock_cp):
+        self._make_library()
+        query_name = "Directory"
+        self._select_searches(query_name)
+        self.dest_entry.set_text(self.path_dest)
+        self.plugin._start_preview(self.plugin.preview_start_button)
+        n_songs = QUERIES[query_name]["results"]
+
+        def stop(source, dest):
+            self.plugin.running = False
+            time.sleep(0.2)
+
+        mock_cp.side_effect = stop
+        self.plugin._start_sync(self.plugin.sync_start_button)
+        n_first = self.plugin.c_files_copy
+        assert 0 < n_first < n_songs
+        self.assertEqual(mock_cp.call_count, n_first)
+
+        mock_cp.side_effect = None
+        self.plugin._start_sync(self.plugin.sync_start_button)
+        self.assertEqual(self.plugin.c_files_copy, n_songs - n_first)
+        self.assertEqual(self.plugin.c_files_skip_previous, n_first)
+        self.assertEqual(mock_cp.call_count, n_songs)
@@ -3,6 +3,7 @@
 # the Free Software Foundation; either version 2 of the License, or
 # (at your option) any later version.
 
+import bz2
 import io
 from bz2 import BZ2Compressor
 from http.server import HTTPServer, BaseHTTPRequestHandler
@@ -17,6 +18,7 @@ from quodlibet.browsers.iradio import (
     IRFile,
     QuestionBar,
     parse_taglist,
+    TaglistParser,
     parse_pls,
     parse_m3u,
     download_taglist,
@@ -45,6 +47,18 @@ artist=bar
     assert stations[0].list("artist") == ["foo", "bar"]
 
 
+def test_taglist_parser_in_parts():
+    data = b"uri=http://foo.bar\ngenre=rock\ngenre=pop\nuri=http://baz\ntitle=baz\n"
+    parser = TaglistParser()
+    for i in range(0, len(data), 5):
+        parser.feed(data[i : i + 5])
+    stations = parser.finish()
+
+    assert [s("~uri") for s in stations] == ["http://foo.bar", "http://baz"]
+    assert stations[0].list("genre") == ["rock", "pop"]
+    assert stations[1]("title") == "baz"
+
+
 class FakeTask:
     def __init__(self):
         self.pulsed = 0
@@ -223,3 +237,46 @@ def test_download_tags(test_server):
     assert all(ret), "Got some falsey stations"
     assert received, f"No stations received from {url}"
     assert {s("~filename") for s in received} == set(FAKE_URLS)
+
+
+class ETagGetHandler(BaseHTTPRequestHandler):
+    ETAG = '"stations-1"'
+    requests: list[str | None] = []
+
+    def do_GET(self) -> None:
+        self.requests.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == self.ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        content = "\n".join(f"uri={url}" for url in FAKE_URLS).encode("utf-8")
+        data = bz2.compress(content)
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Content-type", "application/x-bzip2")
+        self.send_header("ETag", self.ETAG)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_download_tags_cached(tmp_path):
+    ETagGetHandler.requests = []
+    server = HTTPServer(("localhost", 0), ETagGetHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    url = f"http://{host}:{port:d}"
+    cache = str(tmp_path / "stations_list")
+
+    try:
+        for _ in range(2):
+            received = []
+            list(download_taglist(url, received.extend, None, cache=cache))
+            run_gtk_loop()
+            assert {s("~filename") for s in received} == set(FAKE_URLS)
+    finally:
+        server.shutdown()
+
+    assert ETagGetHandler.requests == [None, ETagGetHandler.ETAG]
@@ -556,6 +556,33 @@ class TPaneModel(TestCase):
         self._verify_model(m)
         assert m.matches([len(m) - 1], UNKNOWN_ARTIST)
 
+    def test_group(self):
+        m = PaneModel(PaneConfig("artist"))
+        entries, unknown = m.group(SONGS)
+        assert [key for key, _sort, _songs in entries] == ["<boris>", "mu", "piman"]
+        assert unknown == {SONGS[-1]}
+        assert m.group(SONGS) is m.group(list(SONGS)), "Should be cached"
+
+        # A few songs only, from the index
+        entries, unknown = m.group(SONGS[2:4])
+        assert entries == [("piman", entries[0][1], frozenset(SONGS[2:4]))]
+        assert not unknown
+
+    def test_group_after_changes(self):
+        m = PaneModel(PaneConfig("artist"))
+        m.add_songs(SONGS)
+        m.remove_songs(SONGS[:1], True)
+        entries, _unknown = m.group(SONGS[1:])
+        assert "<boris>" not in {key for key, _sort, _songs in entries}
+
+    def test_refill(self):
+        m = PaneModel(PaneConfig("artist"))
+        m.add_songs(SONGS)
+        first = [(e.key, e.songs) for e in m.itervalues()]
+        m.clear()
+        m.add_songs(SONGS)
+        assert [(e.key, e.songs) for e in m.itervalues()] == first
+
 
 class TPanedPreferences(TestCase):
     def setUp(self):
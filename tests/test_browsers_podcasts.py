@@ -2,17 +2,22 @@
 # it under the terms of the GNU General Public License as published by
 # the Free Software Foundation; either version 2 of the License, or
 # (at your option) any later version.
+from collections.abc import Generator
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from threading import Thread
+
 from _pytest.fixtures import fixture
 from gi.repository import Gtk
 
 import quodlibet.config
-from quodlibet.browsers.podcasts import Podcasts, AddFeedDialog, Feed
+from quodlibet.browsers.podcasts import Podcasts, AddFeedDialog, Feed, refresh_feeds
 from quodlibet.library import SongLibrary
 from quodlibet.util.config import Config
 from senf import fsn2uri
 from tests import TestCase, get_data_path
 
 TEST_URL = "https://a@b:foo.example.com?bar=baz&quxx#anchor"
+ETAG = '"v1"'
 
 
 class TAudioFeeds(TestCase):
@@ -83,3 +88,54 @@ def test_menu_items_can_be_clicked(config: Config, podcasts: Podcasts):
     assert menu
     for item in menu.get_children():
         item.emit("activate")
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    requests: list[str | None] = []
+
+    def do_GET(self) -> None:
+        self.requests.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        with open(get_data_path("valid_podcast.xml"), "rb") as h:
+            content = h.read()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("ETag", ETAG)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+@fixture
+def feed_server() -> Generator[HTTPServer, None, None]:
+    FeedHandler.requests = []
+    server = HTTPServer(("localhost", 0), FeedHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+
+
+def test_refresh_feeds_conditionally(config: Config, feed_server: HTTPServer):
+    host, port = feed_server.server_address
+    feeds = [Feed(f"http://{host}:{port:d}/{i}") for i in range(3)]
+
+    assert refresh_feeds(feeds) == feeds
+    assert all(len(feed) == 2 and feed.etag == ETAG for feed in feeds)
+    assert FeedHandler.requests == [None] * 3
+
+    assert not refresh_feeds(feeds)
+    assert not refresh_feeds(feeds, max_age=60 * 60)
+    assert all(len(feed) == 2 for feed in feeds)
+    assert FeedHandler.requests == [None] * 3 + [ETAG] * 3
+
+    for feed in feeds:
+        feed.clear()
+    assert refresh_feeds(feeds, conditional=False) == feeds
+    assert all(len(feed) == 2 for feed in feeds)
+    assert FeedHandler.requests == [None] * 3 + [ETAG] * 3 + [None] * 3
@@ -3,6 +3,9 @@
 # the Free Software Foundation; either version 2 of the License, or
 # (at your option) any later version.
 
+import json
+from unittest import mock
+
 from senf import fsnative
 
 from quodlibet.formats import AudioFile
@@ -177,3 +180,25 @@ class TCommandWithPattern(TCommandBase):
         assert (
             self._send('print-query {"query": "slash", "unknown": "<title>"}') == "\n"
         )
+
+    def test_offset_limit_sort(self):
+        def send(**args):
+            return self._send(
+                "print-query " + json.dumps({"query": "", "pattern": "<title>", **args})
+            )
+
+        assert send(sort="title", limit=2) == "4.0-FOUR\nONE\n"
+        assert send(sort="title", reverse=True, offset=1) == (
+            "SLASH\\.MP3\nONE\n4.0-FOUR\n"
+        )
+        assert send(sort="title", offset=10) == "\n"
+        assert len(send(limit=3).splitlines()) == 3
+        assert send(limit=-1) == "\n"
+
+    def test_stream(self):
+        args = json.dumps({"query": "", "pattern": "<title>", "sort": "~filename"})
+        with mock.patch("quodlibet.commands.QUERY_CHUNK_SIZE", 3):
+            parts = list(self._send("print-query-stream " + args))
+        assert len(parts) > 2
+        assert "".join(parts) == "4.0-FOUR\nONE\nSLASH\\.MP3\nTWO, PLEASE\n"
+        assert "".join(parts) == self._send("print-query " + args)
@@ -96,6 +96,75 @@ class TLibrarian(TestCase):
         self.assertEqual(self.changed_1, self.Frange(6, 12))
         self.assertEqual(self.changed_2, self.Frange(12, 18))
 
+    def test_coalescing(self):
+        self.librarian.set_coalescing(True)
+        self.lib1.add(self.Frange(4))
+        self.librarian.changed(self.Frange(2))
+        self.lib1.remove([self.Fake(3)])
+        assert not self.added
+        assert self.added_1
+        run_gtk_loop()
+        self.assertEqual(sorted(self.added), self.Frange(3))
+        assert not self.changed
+        assert not self.removed
+
+        self.librarian.changed([self.Fake(0), self.Fake(1)])
+        self.lib1.remove([self.Fake(1), self.Fake(2)])
+        self.lib1.add([self.Fake(1)])
+        self.librarian.flush()
+        self.assertEqual(sorted(self.removed), [self.Fake(1), self.Fake(2)])
+        self.assertEqual(sorted(self.added), sorted(self.Frange(3) + [self.Fake(1)]))
+        self.assertEqual(self.changed, [self.Fake(0)])
+
+        self.librarian.set_coalescing(False)
+        self.lib1.remove([self.Fake(0)])
+        self.assertEqual(self.removed[-1:], [self.Fake(0)])
+
+    def test_coalescing_removed_then_changed(self):
+        self.librarian.set_coalescing(True)
+        self.lib1.add(self.Frange(2))
+        self.librarian.flush()
+        self.lib1.remove([self.Fake(0)])
+        self.lib1.emit("changed", {self.Fake(0)})
+        self.librarian.flush()
+        self.assertEqual(self.removed, [self.Fake(0)])
+        assert not self.changed
+
+    def test_destroy_flushes(self):
+        self.librarian.set_coalescing(True)
+        self.lib1.add(self.Frange(2))
+        self.librarian.destroy()
+        self.assertEqual(sorted(self.added), self.Frange(2))
+
+    def test_handler_by_func(self):
+        calls = []
+
+        def handler(librarian, items):
+            calls.append(list(items))
+
+        handler_id = self.librarian.connect("added", handler)
+        self.librarian.handler_block_by_func(handler)
+        self.lib1.add([self.Fake(0)])
+        self.librarian.handler_unblock_by_func(handler)
+        self.lib1.add([self.Fake(1)])
+        assert self.librarian.handler_is_connected(handler_id)
+        self.librarian.disconnect_by_func(handler)
+        assert not self.librarian.handler_is_connected(handler_id)
+        self.lib1.add([self.Fake(2)])
+        self.assertEqual(calls, [[self.Fake(1)]])
+
+    def test_stats(self):
+        self.lib1.add(self.Frange(4))
+        self.lib2.add(self.Frange(4, 6))
+        self.librarian.changed(self.Frange(6))
+        stats = self.librarian.stats
+        self.assertEqual(stats.emissions["added"], 2)
+        self.assertEqual(stats.items["added"], 6)
+        self.assertEqual(stats.emissions["changed"], 2)
+        calls = [n for (signal, _name), n in stats.calls.items() if signal == "added"]
+        self.assertEqual(calls, [2])
+        assert stats.slowest()
+
     def test___getitem__(self):
         self.lib1.add(self.Frange(12))
         self.lib2.add(self.Frange(12, 24))
@@ -11,9 +11,14 @@ from quodlibet.formats import AudioFile
 from quodlibet.library import SongFileLibrary
 from quodlibet.util import connect_obj
 from quodlibet.util.collection import Playlist, FileBackedPlaylist
-from tests import TestCase, _TEMP_DIR
+from tests import TestCase, _TEMP_DIR, mkdtemp, run_gtk_loop
 from tests.test_library_libraries import FakeSong
-from quodlibet.library.playlist import _DEFAULT_PLAYLIST_DIR, PlaylistLibrary
+from quodlibet.library.playlist import (
+    _DEFAULT_PLAYLIST_DIR,
+    PlaylistIndex,
+    PlaylistLibrary,
+    PlaylistWriter,
+)
 
 
 def AFrange(*args):
@@ -158,6 +163,101 @@ class TPlaylistLibrary(TestCase):
         # It shouldn't implement FileLibrary etc
         assert not getattr(self.library, "filename", None)
 
+    def test_song_changes_write_lazily(self):
+        pl = self.library[PL_NAME]
+        pl.write()
+        self.underlying.changed(pl.songs)
+        assert len(self.library.writer) == 1
+        assert self.library.writer.flush() == 0, "Nothing persisted changed"
+
+        song = pl.songs[0]
+        song["title"] = "Something else"
+        self.underlying.changed([song])
+        assert self.library.writer.flush() == 1
+        assert not len(self.library.writer)
+
+    def test_deleted_playlists_not_written(self):
+        pl = self.library[PL_NAME]
+        self.library.writer.schedule([pl])
+        pl.delete()
+        assert not len(self.library.writer)
+        assert not os.path.exists(pl.path)
+
+
+class TPlaylistIndex(TestCase):
+    def setUp(self):
+        self.temp = mkdtemp()
+        self.fn = "test.xspf"
+        self.path = os.path.join(self.temp, self.fn)
+        with open(self.path, "w") as f:
+            f.write(
+                '<playlist xmlns="http://xspf.org/ns/0/"><title>test</title>'
+                "<trackList><track><location>file:///foo.mp3</location></track>"
+                "</trackList></playlist>"
+            )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp)
+
+    def test_roundtrip(self):
+        index = PlaylistIndex(self.temp)
+        title, locations = index.read(self.fn, self.path)
+        assert title == "test"
+        assert len(locations) == 1
+        index.save()
+
+        other = PlaylistIndex(self.temp)
+        other.load()
+        assert other.get(self.fn, self.path) == (title, locations)
+
+    def test_stale(self):
+        index = PlaylistIndex(self.temp)
+        index.read(self.fn, self.path)
+        with open(self.path, "a") as f:
+            f.write("\n")
+        assert index.get(self.fn, self.path) is None
+
+    def test_prune(self):
+        index = PlaylistIndex(self.temp)
+        index.read(self.fn, self.path)
+        index.prune([])
+        assert index.get(self.fn, self.path) is None
+
+
+class TPlaylistWriter(TestCase):
+    class FakePlaylist:
+        def __init__(self):
+            self.writes = 0
+
+        def write_if_changed(self):
+            self.writes += 1
+            return True
+
+    def test_coalesces(self):
+        writer = PlaylistWriter(delay=0)
+        pl = self.FakePlaylist()
+        writer.schedule([pl])
+        writer.schedule([pl])
+        assert len(writer) == 1
+        run_gtk_loop()
+        assert pl.writes == 1
+        assert not len(writer)
+
+    def test_max_delay(self):
+        writer = PlaylistWriter(delay=100000, max_delay=0)
+        pl = self.FakePlaylist()
+        writer.schedule([pl])
+        writer.schedule([pl])
+        run_gtk_loop()
+        assert pl.writes == 1
+
+    def test_flush(self):
+        writer = PlaylistWriter(delay=100000)
+        pls = [self.FakePlaylist(), self.FakePlaylist()]
+        writer.schedule(pls)
+        assert writer.flush() == 2
+        assert writer.flush() == 0
+
 
 class TPlaylistLibrarySignals(TestCase):
     def setUp(self):
@@ -0,0 +1,101 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+
+import os
+
+from quodlibet.formats import AudioFile
+from quodlibet.library import SongLibrary
+from quodlibet.library.saved import SavedQuery, SavedSearches, is_volatile
+from quodlibet.query import Query
+from senf import fsnative
+from tests import TestCase, mkstemp
+
+
+def song(num, **tags):
+    return AudioFile({"~filename": fsnative(f"/dir/{num}.ogg"), **tags})
+
+
+class TSavedSearches(TestCase):
+    def setUp(self):
+        fd, self.filename = mkstemp(text=True)
+        with os.fdopen(fd, "w") as h:
+            h.write("genre=rock\nRock\n#(lastplayed < 1 day)\nRecent\n")
+        self.library = SongLibrary()
+        self.rock = song(1, genre="rock")
+        self.jazz = song(2, genre="jazz")
+        self.library.add([self.rock, self.jazz])
+        self.searches = self.library.saved_searches
+        self.searches.path = self.filename
+
+    def tearDown(self):
+        self.library.destroy()
+        os.remove(self.filename)
+
+    def test_get(self):
+        query = self.searches.get("  rOCK ")
+        assert isinstance(query, SavedQuery)
+        assert query.string == "genre=rock"
+        assert self.searches.get("Rock") is query
+        self.assertRaises(KeyError, self.searches.get, "genre=rock")
+
+    def test_volatile(self):
+        assert is_volatile("#(lastplayed < 1 day)")
+        assert is_volatile("@(missing)")
+        assert not is_volatile("@(saved: rock)")
+        assert not is_volatile("artist=foo")
+        assert not isinstance(self.searches.get("recent"), SavedQuery)
+
+    def test_includes_volatile(self):
+        with open(self.filename, "a") as h:
+            h.write("@(saved: recent)\nOuter\n@(saved: rock)\nStable\n")
+        os.utime(self.filename, ns=(0, 0))
+        self.searches._read()
+        assert self.searches._is_volatile("@(saved: Recent )")
+        assert self.searches._is_volatile("@(saved: missing)")
+        assert not self.searches._is_volatile("@(saved: rock)")
+
+    def test_query(self):
+        assert isinstance(self.searches.query("genre=rock"), SavedQuery)
+        assert not isinstance(self.searches.query("genre=jazz"), SavedQuery)
+        self.assertEqual(self.searches.query("genre=jazz"), Query("genre=jazz"))
+
+    def test_results_follow_library(self):
+        query = self.searches.get("rock")
+        self.assertEqual(query.filter(self.library), [self.rock])
+
+        other = song(3, genre="rock")
+        self.library.add([other])
+        assert query.search(other)
+
+        self.jazz["genre"] = "rock"
+        self.rock["genre"] = "jazz"
+        self.library.changed([self.jazz, self.rock])
+        assert query.search(self.jazz)
+        assert not query.search(self.rock)
+
+        self.library.remove([other])
+        assert other not in self.searches._results[query._key]
+        # Songs outside the library still get matched the normal way
+        assert query.search(other)
+
+    def test_reread(self):
+        self.searches.get("rock")
+        with open(self.filename, "w") as h:
+            h.write("genre=jazz\nRock\n")
+        os.utime(self.filename, ns=(0, 0))
+        self.assertEqual(self.searches.get("rock").string, "genre=jazz")
+
+    def test_corrupt(self):
+        with open(self.filename, "w") as h:
+            h.write("genre=jazz\n")
+        os.utime(self.filename, ns=(0, 0))
+        self.assertRaises(ValueError, self.searches.get, "rock")
+        assert not isinstance(self.searches.query("genre=jazz"), SavedQuery)
+
+    def test_without_library(self):
+        searches = SavedSearches(path=self.filename)
+        query = searches.get("rock")
+        assert not isinstance(query, SavedQuery)
+        assert query.search(self.rock)
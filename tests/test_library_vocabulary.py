@@ -0,0 +1,78 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+
+from quodlibet.formats import AudioFile
+from quodlibet.library import SongLibrary
+from quodlibet.library.librarians import SongLibrarian
+from senf import fsnative
+from tests import TestCase
+
+
+def song(num, **tags):
+    return AudioFile({"~filename": fsnative(f"/dir/{num}.ogg"), **tags})
+
+
+class TTagVocabulary(TestCase):
+    def setUp(self):
+        self.library = SongLibrary()
+        self.songs = [
+            song(1, artist="b\na"),
+            song(2, artist="B", genre="rock"),
+            song(3, artist="a"),
+        ]
+        self.library.add(self.songs)
+
+    def tearDown(self):
+        self.library.destroy()
+
+    def test_values(self):
+        self.assertEqual(self.library.tag_values("artist"), {"a", "b", "B"})
+        self.assertEqual(self.library.tag_values("genre"), {"rock"})
+        self.assertEqual(self.library.tag_values("album"), set())
+
+    def test_sorted_values(self):
+        values = self.library.sorted_tag_values("artist")
+        self.assertEqual(values[0], "a")
+        self.assertEqual(sorted(values[1:]), ["B", "b"])
+
+    def test_follows_library(self):
+        self.assertEqual(self.library.tag_values("artist"), {"a", "b", "B"})
+        assert {"artist", "genre"} <= self.library.tag_names()
+
+        self.songs[0]["artist"] = "c"
+        self.library.changed([self.songs[0]])
+        self.assertEqual(self.library.tag_values("artist"), {"a", "c", "B"})
+        self.assertEqual(self.library.sorted_tag_values("artist"), ["a", "B", "c"])
+
+        self.library.remove([self.songs[1]])
+        self.assertEqual(self.library.tag_values("artist"), {"a", "c"})
+        assert "artist" in self.library.tag_names()
+        assert "genre" not in self.library.tag_names()
+
+        self.library.add([song(4, artist="d", album="x")])
+        self.assertEqual(self.library.tag_values("artist"), {"a", "c", "d"})
+        self.assertEqual(self.library.tag_values("album"), {"x"})
+        assert "album" in self.library.tag_names()
+
+    def test_index_names(self):
+        steps = self.library.index_tag_names()
+        next(steps)
+        self.library.remove([self.songs[1]])
+        self.library.add([song(4, album="x")])
+        list(steps)
+        self.assertEqual(self.library.tag_names(), {"~filename", "artist", "album"})
+
+    def test_librarian(self):
+        librarian = SongLibrarian()
+        other = SongLibrary()
+        librarian.register(self.library, "one")
+        librarian.register(other, "two")
+        other.add([song(5, artist="A"), song(6, artist="b")])
+        values = librarian.sorted_tag_values("artist")
+        self.assertEqual([v.casefold() for v in values], ["a", "a", "b", "b"])
+        self.assertEqual(len(set(values)), 4)
+        assert "artist" in librarian.tag_names()
+        other.destroy()
+        librarian.destroy()
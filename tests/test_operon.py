@@ -6,12 +6,14 @@
 # (at your option) any later version.
 
 import os
+import shutil
 import sys
+import time
 
 from quodlibet.util import is_osx, is_windows
 from senf import fsnative, path2fsn
 
-from tests import TestCase, get_data_path, mkstemp, skipIf
+from tests import TestCase, get_data_path, mkdtemp, mkstemp, skip, skipIf
 from .helper import capture_output, get_temp_copy
 
 from quodlibet import config
@@ -100,6 +102,56 @@ class TOperonMain(TOperonBase):
         self.check_true(["--version"], True, False)
 
 
+class TOperonJobs(TOperonBase):
+    # --jobs <n> <command> [<args>]
+
+    def test_misc(self):
+        self.check_false(["--jobs", "0", "help"], False, True)
+        self.check_true(["-j", "2", "help", "help"], True, False)
+        self.check_true(["--jobs=2", "help", "help"], True, False)
+
+    def test_order(self):
+        paths = [self.f, self.f2, self.f, self.f2]
+        o, e = self.check_true(
+            ["-j", "3", "print", "-p", "<~filename>"] + paths, True, False
+        )
+        self.assertEqual(o.splitlines(), paths)
+
+    def test_errors(self):
+        o, e = self.check_false(["-j", "3", "print", self.f3, self.f2], True, True)
+        assert "Quod Libet Test Data" in o
+        self.check_false(["-j", "3", "set", "foo", "bar", self.f, self.f3], False, True)
+        self.s.reload()
+        assert "foo" not in self.s
+
+    def test_save(self):
+        paths = [self.f, self.f2, self.f]
+        self.check_true(["-j", "3", "add", "foo", "bar"] + paths, False, False)
+        for song in [self.s, self.s2]:
+            song.reload()
+            self.assertEqual(song.list("foo"), ["bar"])
+
+    @skip("Enable for basic benchmarking of operon --jobs")
+    def test_benchmark(self):
+        temp_dir = mkdtemp()
+        try:
+            paths = []
+            for i in range(500):
+                path = os.path.join(temp_dir, f"{i}.ogg")
+                shutil.copy(self.f, path)
+                paths.append(path)
+
+            for jobs in [1, 2, 4, 8]:
+                t = time.time()
+                self.check_true(
+                    ["-j", str(jobs), "set", "foo", "bar"] + paths, False, False
+                )
+                self.check_true(["-j", str(jobs), "print"] + paths, True, False)
+                print(f"{jobs} job(s): {time.time() - t:.2f}s for {len(paths)} files")
+        finally:
+            shutil.rmtree(temp_dir)
+
+
 class TOperonAdd(TOperonBase):
     # add <tag> <value> <file> [<files>]
 
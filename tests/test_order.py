@@ -3,13 +3,15 @@
 # the Free Software Foundation; either version 2 of the License, or
 # (at your option) any later version.
 
-from collections import defaultdict
+from collections import Counter, defaultdict
 
 from quodlibet.formats import AudioFile
-from quodlibet.order import OrderInOrder
+from quodlibet.library import SongLibrary
+from quodlibet.order import OrderInOrder, ShuffleState
 from quodlibet.order.reorder import OrderWeighted, OrderShuffle
-from quodlibet.order.repeat import OneSong
+from quodlibet.order.repeat import OneSong, RepeatListForever, RepeatSongForever
 from quodlibet.qltk.songmodel import PlaylistModel
+from senf import fsnative
 from tests import TestCase
 
 r0 = AudioFile({"~#rating": 0})
@@ -34,6 +36,57 @@ class TOrderWeighted(TestCase):
         assert scores[r2] > scores[r1]
         assert scores[r3] > scores[r2]
 
+    def test_unrated_falls_back_to_shuffle(self):
+        pl = PlaylistModel()
+        pl.set([r0, r0, r0])
+        order = OrderWeighted()
+        cur = None
+        picked = set()
+        for _i in range(3):
+            cur = order.next_explicit(pl, cur)
+            picked.add(pl.get_path(cur).get_indices()[0])
+        self.assertEqual(picked, {0, 1, 2})
+        self.assertEqual(order.next_explicit(pl, cur), None)
+
+    def test_rating_changes(self):
+        songs = [AudioFile({"~#rating": 1.0}) for _i in range(10)]
+        pl = PlaylistModel()
+        pl.set(songs)
+        for _i in range(20):
+            order = OrderWeighted()
+            pl.order = order
+            for song in songs:
+                song["~#rating"] = 1.0
+            order.remaining(pl)
+            for song in songs[1:]:
+                song["~#rating"] = 0.0
+            first = order.next_explicit(pl, None)
+            self.assertEqual(pl.get_value(first), songs[0])
+
+    def test_follows_changed_songs(self):
+        library = SongLibrary()
+        songs = [
+            AudioFile(
+                {"~filename": fsnative(f"/{i}"), "~#rating": 0.0, "~#playcount": 1}
+            )
+            for i in range(3)
+        ]
+        library.add(songs)
+        pl = PlaylistModel()
+        pl.set(songs)
+        state = ShuffleState(
+            pl, lambda s: s("~#rating"), tally="~#playcount", librarian=library
+        )
+        state.build([])
+        songs[1]["~#rating"] = 1.0
+        songs[1]["~#playcount"] = 5
+        library.changed([songs[1]])
+        self.assertEqual(state.tally, Counter({1: 2, 5: 1}))
+        for _i in range(20):
+            self.assertEqual(state.pick(), 1)
+        state.detach()
+        library.destroy()
+
 
 class TOrderShuffle(TestCase):
     def test_remaining(self):
@@ -49,6 +102,44 @@ class TOrderShuffle(TestCase):
         cur = order.next_explicit(pl, cur)
         self.assertEqual(len(order.remaining(pl)), len(songs))
 
+    def test_plays_all_once(self):
+        order = OrderShuffle()
+        pl = PlaylistModel()
+        songs = [AudioFile({"~filename": str(i)}) for i in range(20)]
+        pl.set(songs)
+        cur = pl.current_iter
+        played = []
+        for _i in range(len(songs)):
+            cur = order.next_explicit(pl, cur)
+            played.append(pl.get_value(cur))
+        self.assertEqual(sorted(played, key=id), sorted(songs, key=id))
+        self.assertEqual(order.next_explicit(pl, cur), None)
+
+    def test_previous_is_remaining_again(self):
+        order = OrderShuffle()
+        pl = PlaylistModel()
+        pl.set([r3, r1, r2, r0])
+        first = order.next_explicit(pl, None)
+        second = order.next_explicit(pl, first)
+        self.assertEqual(len(order.remaining(pl)), 3)
+        self.assertEqual(order.previous_explicit(pl, second), first)
+        self.assertEqual(len(order.remaining(pl)), 4)
+
+    def test_follows_inserted_rows(self):
+        order = OrderShuffle()
+        pl = PlaylistModel()
+        pl.set([r0, r1])
+        cur = order.next_explicit(pl, None)
+        cur = order.next_explicit(pl, cur)
+        self.assertEqual(len(order.remaining(pl)), 1)
+        pl.insert(0, row=[r2])
+        pl.append(row=[r3])
+        remaining = order.remaining(pl)
+        self.assertEqual(len(remaining), 3)
+        self.assertEqual(remaining[0], r2)
+        self.assertEqual(remaining[3], r3)
+        assert pl.get_value(cur) in remaining.values()
+
 
 class TOrderOneSong(TestCase):
     def test_remaining(self):
@@ -57,3 +148,30 @@ class TOrderOneSong(TestCase):
         pl.set([r0, r1])
         for _i in range(2):
             self.assertEqual(order.next(pl, pl.current_iter), None)
+
+
+class TOrderPeek(TestCase):
+    def test_in_order(self):
+        pl = PlaylistModel()
+        pl.set([r0, r1])
+        order = OrderInOrder()
+        first = order.peek_implicit(pl, None)
+        self.assertEqual(pl.get_value(first), r0)
+        self.assertEqual(pl.get_value(order.peek_implicit(pl, first)), r1)
+        self.assertEqual(order.peek_implicit(pl, pl.iter_next(first)), None)
+
+    def test_repeat(self):
+        pl = PlaylistModel()
+        pl.set([r0, r1])
+        last = pl.iter_next(pl.get_iter_first())
+        order = RepeatListForever(OrderInOrder())
+        self.assertEqual(pl.get_value(order.peek_implicit(pl, last)), r0)
+        order = RepeatSongForever(OrderShuffle())
+        self.assertEqual(order.peek_implicit(pl, last), last)
+        self.assertEqual(OneSong(OrderInOrder()).peek_implicit(pl, None), None)
+
+    def test_unpredictable(self):
+        pl = PlaylistModel()
+        pl.set([r0, r1])
+        for order in [OrderShuffle(), RepeatListForever(OrderWeighted())]:
+            self.assertRaises(NotImplementedError, order.peek_implicit, pl, None)
@@ -679,3 +679,27 @@ class TPatternFormatList(_TPattern):
     def test_string(self):
         pat = Pattern("display")
         self.assertEqual(pat.format_list(self.a), {("display", "display")})
+
+
+class TPatternFormatMany(_TPattern):
+    def test_same_as_format(self):
+        songs = [self.a, self.b, self.c, self.h]
+        patterns = [
+            Pattern("<tracknumber|<tracknumber>. ><title>"),
+            FileFromPattern("/<artist>/<title>"),
+            XMLFromPattern("<xmltest>"),
+        ]
+        for pat in patterns:
+            assert pat.format_many(songs) == [pat.format(s) for s in songs]
+            assert pat.format_list_many(songs) == [pat.format_list(s) for s in songs]
+
+    def test_cached_until_invalidated(self):
+        pat = Pattern("<title>")
+        assert pat.format_many([self.a]) == ["Title5"]
+        self.a["title"] = "Changed"
+        assert pat.format_many([self.a]) == ["Title5"]
+        pat.invalidate([self.a])
+        assert pat.format_many([self.a]) == ["Changed"]
+        self.a["title"] = "Again"
+        pat.invalidate()
+        assert pat.format_list_many([self.a]) == [{("Again", "Again")}]
@@ -7,7 +7,7 @@
 
 from senf import fsnative
 
-from tests import TestCase, skipUnless, get_data_path
+from tests import TestCase, skipUnless, get_data_path, run_gtk_loop
 
 from quodlibet import player
 from quodlibet import library
@@ -387,6 +387,43 @@ class TGstPlayer(TPlayer, TPlayerMixin):
         assert self.player.can_play_uri("file://")
         assert not self.player.can_play_uri("fake://")
 
+    def test_reuse_pipeline(self):
+        config.set("player", "gst_reuse_pipeline", "true")
+        self.player.go_to(REAL_FILE)
+        bin_ = self.player.bin
+        self.player.go_to(REAL_FILE)
+        assert self.player.bin is bin_
+        self.assertEqual(self.player.song, REAL_FILE)
+        self.assertEqual(self.player.track_changes["reused"], 1)
+        config.set("player", "gst_reuse_pipeline", "false")
+        self.player.go_to(REAL_FILE)
+        assert self.player.bin is not bin_
+        self.assertEqual(self.player.track_changes["rebuilt"], 2)
+
+    def test_no_reuse_after_stream(self):
+        config.set("player", "gst_reuse_pipeline", "true")
+        stream = AudioFile(REAL_FILE)
+        stream.multisong = True
+        self.player.go_to(stream)
+        bin_ = self.player.bin
+        self.player.go_to(REAL_FILE)
+        assert self.player.bin is not bin_
+        self.assertEqual(self.player.track_changes["reused"], 0)
+        config.set("player", "gst_reuse_pipeline", "false")
+
+    def test_next_resolved_in_advance(self):
+        self.player.go_to(FILES[0])
+        run_gtk_loop()
+        resolved = self.player._GStreamerPlayer__next
+        self.assertEqual(resolved, (FILES[1], FILES[1]("~uri")))
+        self.player.go_to(FILES[1])
+        run_gtk_loop()
+        self.assertEqual(self.player._GStreamerPlayer__next, (None, None))
+        self.player.go_to(UNKNOWN_FILE)
+        run_gtk_loop()
+        resolved = self.player._GStreamerPlayer__next
+        self.assertEqual(resolved, (FILES[0], FILES[0]("~uri")))
+
 
 class TVolume(TestCase):
     def setUp(self):
@@ -3,17 +3,19 @@
 # the Free Software Foundation; either version 2 of the License, or
 # (at your option) any later version.
 
-from tests import TestCase, mkstemp, mkdtemp
+from tests import TestCase, mkstemp, mkdtemp, run_gtk_loop
 
 import os
 import sys
 import shutil
+import time
 
 from quodlibet import player
 from quodlibet.library import SongLibrarian, SongLibrary
 from quodlibet.plugins import PluginManager
 from quodlibet.plugins.events import EventPluginHandler
 from quodlibet.qltk.songlist import SongList
+from quodlibet.qltk.tracker import SongTracker
 
 
 class TEventPlugins(TestCase):
@@ -36,7 +38,7 @@ class TEventPlugins(TestCase):
         self.pm.quit()
         shutil.rmtree(self.tempdir)
 
-    def create_plugin(self, name="", funcs=None):
+    def create_plugin(self, name="", funcs=None, background=()):
         fd, fn = mkstemp(suffix=".py", text=True, dir=self.tempdir)
         file = os.fdopen(fd, "w")
 
@@ -49,6 +51,8 @@ class TEventPlugins(TestCase):
         if name:
             file.write(f"{indent}PLUGIN_ID = {name!r}\n")
             file.write(f"{indent}PLUGIN_NAME = {name!r}\n")
+        if background:
+            file.write(f"{indent}PLUGIN_BACKGROUND_EVENTS = {background!r}\n")
 
         for f in funcs or []:
             file.write(f"{indent}def {f}(s, *args): log.append(({f!r}, args))\n")
@@ -81,6 +85,30 @@ class TEventPlugins(TestCase):
         self.pm.enable(plugin, True)
         self.lib.emit("changed", [None])
         self.assertEqual([("plugin_on_changed", ([None],))], self._get_calls(plugin))
+        self.assertEqual(self.handler.calls[("Name", "changed")], 1)
+        assert self.handler.seconds[("Name", "changed")] >= 0
+
+    def test_lib_changed_background(self):
+        self.create_plugin(
+            name="Name", funcs=["plugin_on_changed"], background=("changed",)
+        )
+        self.pm.rescan()
+        plugin = self.pm.plugins[0]
+        self.pm.enable(plugin, True)
+        self.lib.emit("changed", [None])
+        deadline = time.time() + 5
+        while not self.handler.calls and time.time() < deadline:
+            run_gtk_loop()
+            time.sleep(0.01)
+        self.assertEqual([("plugin_on_changed", ([None],))], self._get_calls(plugin))
+        self.assertEqual(self.handler.calls[("Name", "changed")], 1)
+
+    def test_unhandled_not_counted(self):
+        self.create_plugin(name="Name", funcs=["plugin_on_paused"])
+        self.pm.rescan()
+        self.pm.enable(self.pm.plugins[0], True)
+        self.lib.emit("changed", [None])
+        assert not self.handler.calls
 
     def test_songs_selected(self):
         self.create_plugin(name="Name", funcs=["plugin_on_songs_selected"])
@@ -90,3 +118,16 @@ class TEventPlugins(TestCase):
         self.pm.enable(plugin, True)
         self.songlist.emit("selection-changed", self.songlist.get_selection())
         self.assertEqual(self._get_calls(plugin), [("plugin_on_songs_selected", ([],))])
+
+    def test_stats_changed(self):
+        tracker = SongTracker(self.lib, self.player, None)
+        self.handler.connect_tracker(tracker)
+        self.create_plugin(name="Name", funcs=["plugin_on_stats_changed"])
+        self.pm.rescan()
+        plugin = self.pm.plugins[0]
+        self.pm.enable(plugin, True)
+        tracker.emit("stats-changed", [None])
+        self.assertEqual(
+            self._get_calls(plugin), [("plugin_on_stats_changed", ([None],))]
+        )
+        tracker.destroy()
@@ -5,11 +5,13 @@
 
 from tests import TestCase
 
-from quodlibet.formats import DUMMY_SONG
+from quodlibet.formats import DUMMY_SONG, AudioFile, AudioFileError
 from quodlibet.qltk._editutils import (
     FilterCheckButton,
     OverwriteWarning,
+    TagWriter,
     WriteFailedError,
+    WritesFailedError,
     FilterPluginBox,
     EditingPluginHandler,
 )
@@ -70,6 +72,57 @@ class TEditDialogs(TestCase):
     def test_write_failed(self):
         WriteFailedError(None, DUMMY_SONG).destroy()
 
+    def test_writes_failed(self):
+        WritesFailedError(None, [DUMMY_SONG] * 20).destroy()
+
+
+class WritableSong(AudioFile):
+    def write(self):
+        self["~#written"] = self.get("~#written", 0) + 1
+
+
+class FailingSong(AudioFile):
+    def write(self):
+        raise AudioFileError("nope")
+
+
+class BrokenSong(AudioFile):
+    def write(self):
+        raise RuntimeError("dictionary changed size during iteration")
+
+
+class TTagWriter(TestCase):
+    def test_write(self):
+        written = [WritableSong({"~filename": f"/dev/null/{i}"}) for i in range(5)]
+        failed = FailingSong({"~filename": "/dev/null/x"})
+        writer = TagWriter(workers=2)
+        for song in written + [failed]:
+            writer.write(song)
+
+        done = []
+        while writer.pending:
+            done.extend(writer.poll())
+        assert writer.shutdown() == []
+        self.assertEqual(set(done), set(written) | {failed})
+        self.assertEqual(set(writer.written), set(written))
+        self.assertEqual([s for s, e in writer.failed], [failed])
+        assert all(s("~#written") == 1 for s in written)
+
+    def test_unexpected_error(self):
+        song = BrokenSong({"~filename": "/dev/null/x"})
+        writer = TagWriter()
+        writer.write(song)
+        while writer.pending:
+            writer.poll()
+        writer.shutdown()
+        assert not writer.written
+        self.assertEqual([s for s, e in writer.failed], [song])
+
+    def test_shutdown(self):
+        writer = TagWriter()
+        assert writer.poll(0) == []
+        assert writer.shutdown() == []
+
 
 class TFilterPluginBox(TestCase):
     def test_main(self):
@@ -3,6 +3,8 @@
 # the Free Software Foundation; either version 2 of the License, or
 # (at your option) any later version.
 
+import time
+
 from gi.repository import Gtk
 
 from quodlibet import config
@@ -146,6 +148,77 @@ class TSongList(TestCase):
         self.songlist.set_songs([], scroll=True)
         self.songlist.set_songs([], scroll=False)
 
+    def test_set_songs_progressive(self):
+        config.set("song_list", "progressive_fill_threshold", 2)
+        self.songlist.FILL_FIRST_ROWS = 2
+        self.songlist.FILL_CHUNK_SIZE = 3
+        songs = [
+            AudioFile({"~filename": fsnative(f"/dev/{i}"), "title": str(i)})
+            for i in range(10)
+        ]
+        self.songlist.set_column_headers(["title"])
+        self.songlist.set_sort_orders([("title", False)])
+        self.songlist.set_songs(list(reversed(songs)))
+        for _ in range(1000):
+            if not self.songlist.is_filling:
+                break
+            run_gtk_loop()
+            time.sleep(0.001)
+        assert not self.songlist.is_filling
+        assert self.songlist.get_songs() == songs
+        num, first, total = self.songlist.fill_stats
+        assert num == len(songs)
+        assert 0 <= first <= total
+
+    def _start_progressive_fill(self):
+        config.set("song_list", "progressive_fill_threshold", 2)
+        self.songlist.FILL_FIRST_ROWS = 2
+        self.songlist.FILL_CHUNK_SIZE = 3
+        songs = [
+            AudioFile({"~filename": fsnative(f"/dev/{i}"), "title": str(i)})
+            for i in range(10)
+        ]
+        self.songlist.set_column_headers(["title"])
+        self.songlist.set_sort_orders([("title", False)])
+        self.songlist.set_songs(list(reversed(songs)))
+        return songs
+
+    def test_set_songs_progressive_removed(self):
+        songs = self._start_progressive_fill()
+        self.lib.emit("removed", [songs[5]])
+        assert not self.songlist.is_filling
+        del songs[5]
+        assert self.songlist.get_songs() == songs
+        run_gtk_loop()
+        assert self.songlist.get_songs() == songs
+
+    def test_set_songs_progressive_resorted(self):
+        songs = self._start_progressive_fill()
+        for _ in range(1000):
+            if len(self.songlist.get_songs()) >= 2:
+                break
+            run_gtk_loop()
+            time.sleep(0.001)
+        assert self.songlist.is_filling
+        self.songlist.toggle_column_sort(self.songlist.get_columns()[0])
+        assert not self.songlist.is_filling
+        assert self.songlist.get_songs() == list(reversed(songs))
+
+    def test_set_songs_progressive_cleared(self):
+        self._start_progressive_fill()
+        self.songlist.clear()
+        assert not self.songlist.is_filling
+        run_gtk_loop()
+        assert not self.songlist.get_songs()
+
+    def test_set_songs_progressive_cancelled(self):
+        config.set("song_list", "progressive_fill_threshold", 2)
+        songs = [AudioFile({"~filename": fsnative(f"/dev/{i}")}) for i in range(3)]
+        self.songlist.set_songs(songs)
+        self.songlist.set_songs(songs[:1])
+        assert not self.songlist.is_filling
+        assert self.songlist.get_songs() == songs[:1]
+
     def test_set_songs_restore_select(self):
         song = AudioFile({"~filename": "/dev/null"})
         self.songlist.add_songs([song])
@@ -197,6 +197,36 @@ class TPlaylistModel(TestCase):
             self.pl.next_ended()
         self.assertEqual(self.pl.current, 3)
 
+    def test_peek_next_ended(self):
+        self.assertEqual(self.pl.peek_next_ended(), 0)
+        self.pl.go_to(3)
+        self.assertEqual(self.pl.peek_next_ended(), 4)
+        self.assertEqual(self.pl.current, 3)
+        self.pl.go_to(9)
+        self.assertEqual(self.pl.peek_next_ended(), None)
+        self.pl.order = RepeatListForever(OrderInOrder())
+        self.assertEqual(self.pl.peek_next_ended(), 0)
+        self.pl.order = RepeatSongForever(OrderShuffle())
+        self.assertEqual(self.pl.peek_next_ended(), 9)
+        self.pl.order = OrderShuffle()
+        self.assertRaises(NotImplementedError, self.pl.peek_next_ended)
+
+    def test_peek_upcoming(self):
+        self.pl.go_to(6)
+        self.assertEqual(self.pl.peek_upcoming(2), [7, 8])
+        self.assertEqual(self.pl.peek_upcoming(5), [7, 8, 9])
+        self.pl.order = RepeatListForever(OrderInOrder())
+        self.assertEqual(self.pl.peek_upcoming(5), [7, 8, 9, 0, 1])
+        self.pl.order = OrderShuffle()
+        self.assertEqual(self.pl.peek_upcoming(5), [])
+
+    def test_order_changed(self):
+        changed = []
+        self.pl.connect("order-changed", lambda model: changed.append(model.order))
+        order = OrderShuffle()
+        self.pl.order = order
+        self.assertEqual(changed, [order])
+
     def test_previous(self):
         self.pl.go_to(2)
         self.assertEqual(self.pl.current, 2)
@@ -430,6 +460,23 @@ class TPlaylistMux(TestCase):
         self.p.next()
         assert not self.pl.sourced
 
+    def test_peek_next_ended(self):
+        self.q.set(range(3))
+        self.pl.set(range(5, 10))
+        do_events()
+        for _i in range(8):
+            song = self.mux.peek_next_ended()
+            self.assertEqual(song, self.next())
+        self.assertEqual(self.mux.peek_next_ended(), None)
+
+    def test_peek_upcoming(self):
+        self.q.set(range(2))
+        self.pl.set(range(5, 10))
+        do_events()
+        self.assertEqual(self.mux.peek_upcoming(4), [0, 1, 5, 6])
+        self.next()
+        self.assertEqual(self.mux.peek_upcoming(4), [1, 5, 6, 7])
+
     def test_unqueue(self):
         self.q.set(range(100))
         self.mux.unqueue(range(100))
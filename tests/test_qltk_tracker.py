@@ -83,7 +83,27 @@ class TSongTracker(TestCase):
         self.assertEqual(self.s1["~#playcount"], 0)
         self.assertEqual(self.s1["~#skipcount"], 0)
 
+    def test_batched_changes(self):
+        songs = [AudioFile({"~filename": f"/{i}", "~#length": 1}) for i in range(3)]
+        self.w.add(songs)
+        changed, stats_changed = [], []
+        self.w.connect("changed", lambda lib, songs: changed.append(set(songs)))
+        self.cm.connect("stats-changed", lambda t, songs: stats_changed.extend(songs))
+
+        for song in songs:
+            self.p.emit("song-ended", song, True)
+        run_gtk_loop()
+        assert stats_changed == songs
+        assert all(song["~#skipcount"] == 1 for song in songs)
+        assert not changed
+
+        self.cm.flush()
+        assert changed == [set(songs)]
+        self.cm.flush()
+        assert changed == [set(songs)]
+
     def tearDown(self):
+        self.cm.flush()
         self.w.destroy()
         config.quit()
 
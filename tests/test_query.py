@@ -337,6 +337,75 @@ class TQuery(TestCase):
         assert not Query("album = /i hate/c").search(self.s1)
         assert not Query("title = /ångström/c").search(self.s4)
 
+    def test_literal_fast_paths(self):
+        assert isinstance(match.Regex("^foo$", "").exact, str)
+        assert match.Regex("/foo/", "d").exact is None
+        assert match.Regex("^f.o$", "").exact is None
+
+        assert Query('artist="mu"').search(self.s3)
+        assert Query('artist="PIMAN"').search(self.s3)
+        assert not Query('artist="PIMAN"c').search(self.s3)
+        assert not Query('artist="pi"').search(self.s3)
+        assert Query("artist=/^mu/").search(self.s3)
+        assert Query("artist=/man$/").search(self.s3)
+        assert not Query("artist=/^man/").search(self.s3)
+        assert Query('title="Ångström"').search(self.s4)
+        assert Query('title="ÅNGSTRÖM"').search(self.s4)
+        assert Query('title="A\u030angstro\u0308m"').search(self.s4)
+
+    def test_literal_case_folding(self):
+        # Like the regex engine, not like str.lower()
+        song = AudioFile({"title": "İstanbul", "artist": "\u212a"})
+        assert Query('title="istanbul"').search(song)
+        assert Query("title=/^istanbul$/").search(song)
+        assert not Query("title=/^i\u0307stanbul$/").search(song)
+        assert Query('artist="k"').search(song)
+        assert Query('artist=|("x", "k")').search(song)
+        assert not Query('artist=|("x", "k"c)').search(song)
+
+    def test_case_folding_search_forms(self):
+        song = AudioFile({"title": "Diyarbakır", "artist": "İzmir"})
+        assert Query("diyarbakir").search(song)
+        assert Query("izmir").search(song)
+        assert Query("artist=i").search(song)
+        assert not Query("artist=!i").search(song)
+        assert Query("title=/diyarbakir/d").search(song)
+
+    def test_exact_union(self):
+        assert Query('artist=|("foo", "mu")').search(self.s3)
+        assert Query('artist=|("foo", "MU", /^x/)').search(self.s3)
+        assert Query('artist=|("foo", "bar", /pi/)').search(self.s3)
+        assert not Query('artist=|("foo", "MU"c)').search(self.s3)
+        assert not Query('artist=|("foo", "bar")').search(self.s3)
+
+    def test_search_forms(self):
+        song = AudioFile({"artist": "Motörhead", "title": "Ace"})
+        query = Query("motor")
+        assert query.search(song)
+        assert song.search_forms["artist"][1] == "motorhead"
+        song["artist"] = "Lemmy"
+        assert not query.search(song)
+        # also notices values changed behind its back
+        dict.__setitem__(song, "artist", "Motörhead")
+        assert query.search(song)
+        assert not Query("motör").search(AudioFile({"artist": "Motorhead"}))
+
+    @skip("Enable for basic benchmarking of Query")
+    def test_literal_performance(self):
+        songs = [self.s1, self.s2, self.s3, self.s4, self.s5] * 2000
+        # Non-capturing groups force the regex engine
+        for fast, slow in [
+            ('artist="mu"', "artist=/(?:^mu$)/"),
+            ("artist=/^pi/", "artist=/(?:^pi)/"),
+            ('artist=|("foo", "mu", "bar")', "artist=/^(?:foo|mu|bar)$/"),
+        ]:
+            t = time.time()
+            fast_count = len(Query(fast).filter(songs))
+            fast_time = time.time() - t
+            t = time.time()
+            assert fast_count == len(Query(slow).filter(songs))
+            print(f"{fast}: {fast_time:.3f}s vs. {time.time() - t:.3f}s for regex")
+
     def test_re_and(self):
         assert Query("album = &(/ate/,/est/)").search(self.s1)
         assert not Query("album = &(/ate/, /ets/)").search(self.s1)
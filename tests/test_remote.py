@@ -12,7 +12,7 @@ import pytest
 from gi.repository import GLib, Gio
 from senf import fsn2bytes, bytes2fsn
 
-from . import TestCase
+from . import TestCase, run_gtk_loop
 from .helper import temp_filename
 
 import quodlibet
@@ -53,6 +53,16 @@ class TUnixRemote(TestCase):
             with open(fn, "rb") as h:
                 self.assertEqual(h.read(), b"resp")
 
+    def test_stream_response(self):
+        with temp_filename() as fn:
+            parts = [bytes2fsn(b, None) for b in [b"re", b"", b"sp"]]
+            mock = Mock(resp=iter(parts))
+            remote = QuodLibetUnixRemote(None, mock)
+            remote._callback(b"\x00foo\x00" + fsn2bytes(fn, None) + b"\x00")
+            run_gtk_loop()
+            with open(fn, "rb") as h:
+                self.assertEqual(h.read(), b"resp")
+
 
 @pytest.mark.skipif(is_windows(), reason="unix only")
 class TUnixRemoteFifoFullCycle(TestCase):
@@ -10,7 +10,7 @@ import unicodedata
 
 from tests import TestCase
 
-from quodlibet.unisearch import compile
+from quodlibet.unisearch import compile, parse_literal, search_form
 from quodlibet.unisearch.db import diacritic_for_letters
 from quodlibet.unisearch.parser import re_replace_literals, re_add_variants
 
@@ -184,9 +184,78 @@ class TCompileMatch(TestCase):
         assert compile("\u00c5", asym=True)("\u212b")
         assert compile("\u212b", asym=True)("\u00c5")
 
+    def test_asym_search_form(self):
+        search = compile("fohn", asym=True)
+        assert search.folded == "fohn"
+        assert search("Föhn")
+        assert search("FOHN")
+        assert not search("fön")
+
+        search = compile("föhn", asym=True)
+        assert getattr(search, "folded", None) is None
+        assert search("Föhn")
+        assert not search("fohn")
+
+        assert getattr(compile("fo+", asym=True), "folded", None) is None
+        assert getattr(compile("^fo", asym=True), "folded", None) is None
+        assert (
+            getattr(compile("fo", asym=True, ignore_case=False), "folded", None) is None
+        )
+
+    def test_asym_expansions(self):
+        for pattern, text in [
+            ("e", "Cæsar"),
+            ("es", "Cæsar"),
+            ("se", "Straße"),
+            ("s", "ß"),
+            ("o", "Œuvre"),
+            ("a", "æ"),
+            ("f", "ﬁne"),
+        ]:
+            assert not compile(pattern, asym=True)(text), (pattern, text)
+
+        for pattern, text in [("caesar", "Cæsar"), ("ss", "Straße"), ("æ", "ǽ")]:
+            search = compile(pattern, asym=True)
+            assert getattr(search, "folded", None) is None
+            assert search(text), (pattern, text)
+
+    def test_asym_case_folding(self):
+        # Searches in search forms have to agree with the regex engine
+        for pattern, text in [
+            ("izmir", "İzmir"),
+            ("diyarbakir", "Diyarbakır"),
+            ("i", "ı"),
+            ("s", "ſ"),
+            ("s", "ẛ"),
+            ("k", "\u212a"),
+            ("-", "ⲻ"),
+        ]:
+            search = compile(pattern, asym=True)
+            assert getattr(search, "folded", None) is not None
+            regex = re.compile(re_add_variants(pattern), re.IGNORECASE)
+            assert bool(regex.search(text)), (pattern, text)
+            assert search(text), (pattern, text)
+
     def test_invalid(self):
         with self.assertRaises(ValueError):
             compile("(F", asym=False)
 
         with self.assertRaises(ValueError):
             compile("(F", asym=True)
+
+
+class TSearchForm(TestCase):
+    def test_search_form(self):
+        assert search_form("Föhn") == "fohn"
+        assert search_form("Fo\u0308hn") == "fohn"
+        assert search_form("ÅNGSTRÖM") == "angstrom"
+        assert search_form("ǿ") == "o"
+        assert search_form("x\ny") == "x\ny"
+
+    def test_parse_literal(self):
+        assert parse_literal("foo") == ("foo", False, False)
+        assert parse_literal("^f\\.o$") == ("f.o", True, True)
+        assert parse_literal("^foo") == ("foo", True, False)
+        assert parse_literal("f.o") is None
+        assert parse_literal("(?i)foo") is None
+        assert parse_literal("(") is None
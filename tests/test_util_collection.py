@@ -725,6 +725,46 @@ class TXSPFBackedPlaylist(TFileBackedPlaylist):
                 lines = f.readlines()
                 assert len(lines) >= 1 + 2 + len(pl), "Was expecting a semi-pretty-file"
 
+    def test_write_if_changed(self):
+        song = AudioFile({"~filename": fsnative("/dev/null"), "title": "foo"})
+        with self.wrap("playlist") as pl:
+            pl.extend([song])
+            assert pl.write_if_changed()
+            assert not pl.needs_write
+            song["~#playcount"] = 42
+            assert not pl.write_if_changed(), "Play counts aren't persisted"
+            song["title"] = "bar"
+            assert pl.write_if_changed()
+
+    def test_loaded_needs_no_write(self):
+        songs_lib = FileLibrary()
+        songs_lib.add(NUMERIC_SONGS)
+        fn = XSPFBackedPlaylist.filename_for("playlist")
+        pl = XSPFBackedPlaylist(self.temp, fn, songs_lib=songs_lib)
+        pl.extend(NUMERIC_SONGS)
+        pl.write()
+        loaded = XSPFBackedPlaylist(self.temp, fn, songs_lib=songs_lib)
+        assert not loaded.needs_write
+        loaded.remove_songs(NUMERIC_SONGS[:1])
+        assert loaded.needs_write
+
+    def test_rename_needs_write(self):
+        with self.wrap("playlist") as pl:
+            pl.write()
+            pl.name = "other"
+            assert pl.needs_write
+
+    def test_read_locations(self):
+        with self.wrap("playlist") as pl:
+            pl.extend(NUMERIC_SONGS)
+            some_path = fsnative(os.path.join(self.temp, "xf0xf0"))
+            pl.extend([some_path])
+            pl.write()
+            title, locations = XSPFBackedPlaylist.read_locations(pl.path)
+            assert title == "playlist"
+            assert locations[-1] == some_path
+            assert len(locations) == len(NUMERIC_SONGS) + 1
+
     def test_load_legacy_format_to_xspf(self):
         playlist_fn = "old"
         songs_lib = FileLibrary()
@@ -4,7 +4,7 @@
 # (at your option) any later version.
 
 from tests import TestCase
-from quodlibet.util.collections import HashedList, DictProxy
+from quodlibet.util.collections import HashedList, DictProxy, FenwickTree
 
 
 class TDictMixin(TestCase):
@@ -148,3 +148,37 @@ class THashedList(TestCase):
         assert not l.has_duplicates()
         l.append(5)
         assert l.has_duplicates()
+
+
+class TFenwickTree(TestCase):
+    def test_empty(self):
+        tree = FenwickTree()
+        self.assertEqual(len(tree), 0)
+        self.assertEqual(tree.total, 0)
+
+    def test_prefix_sum(self):
+        weights = [3, 0, 1.5, 2, 0, 7, 1]
+        tree = FenwickTree(weights)
+        self.assertEqual(len(tree), len(weights))
+        for i in range(len(weights) + 1):
+            self.assertAlmostEqual(tree.prefix_sum(i), sum(weights[:i]))
+        self.assertAlmostEqual(tree.total, sum(weights))
+
+    def test_setitem(self):
+        tree = FenwickTree([1, 1, 1, 1])
+        tree[2] = 5
+        tree[0] = 0
+        self.assertEqual(tree[2], 5)
+        self.assertEqual(tree.prefix_sum(3), 6)
+        self.assertEqual(tree.total, 7)
+
+    def test_find(self):
+        tree = FenwickTree([2, 0, 1, 0, 3])
+        self.assertEqual(tree.find(0), 0)
+        self.assertEqual(tree.find(1.9), 0)
+        self.assertEqual(tree.find(2), 2)
+        self.assertEqual(tree.find(2.5), 2)
+        self.assertEqual(tree.find(3), 4)
+        self.assertEqual(tree.find(5.9), 4)
+        tree[4] = 0
+        self.assertEqual(tree.find(2.9), 2)
@@ -0,0 +1,91 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+
+import os
+
+from quodlibet.util.journal import Journal
+from tests import TestCase, mkdtemp
+
+
+class TJournal(TestCase):
+    def setUp(self):
+        self.dir = mkdtemp()
+        self.path = os.path.join(self.dir, "journal")
+
+    def tearDown(self):
+        for name in os.listdir(self.dir):
+            os.remove(os.path.join(self.dir, name))
+        os.rmdir(self.dir)
+
+    def lines(self):
+        with open(self.path) as h:
+            return len(h.readlines())
+
+    def test_persists(self):
+        journal = Journal(self.path)
+        assert not journal
+        for i in range(5):
+            journal.add({"n": i})
+        self.assertEqual(len(journal), 5)
+        self.assertEqual([e for _id, e in journal.peek(2)], [{"n": 0}, {"n": 1}])
+
+        journal.acknowledge(id_ for id_, _e in journal.peek(2))
+        self.assertEqual(Journal(self.path).entries(), [{"n": i} for i in range(2, 5)])
+        # Only appended so far
+        self.assertEqual(self.lines(), 6)
+
+    def test_compacts(self):
+        journal = Journal(self.path, compact_after=3)
+        for i in range(10):
+            journal.add(i)
+        journal.acknowledge([id_ for id_, _e in journal.peek(2)])
+        self.assertEqual(self.lines(), 11)
+        # Not before as many were acknowledged as are left
+        journal.acknowledge([id_ for id_, _e in journal.peek(2)])
+        self.assertEqual(self.lines(), 12)
+        journal.acknowledge([id_ for id_, _e in journal.peek(1)])
+        self.assertEqual(self.lines(), 5)
+        self.assertEqual(Journal(self.path).entries(), list(range(5, 10)))
+
+        journal.acknowledge([id_ for id_, _e in journal.peek(10)])
+        assert not journal
+        assert not os.path.exists(self.path)
+
+    def test_ids_continue(self):
+        journal = Journal(self.path)
+        journal.add("a")
+        journal.add("b")
+        journal.acknowledge([journal.peek(1)[0][0]])
+        journal = Journal(self.path)
+        journal.add("c")
+        self.assertEqual(journal.entries(), ["b", "c"])
+        self.assertEqual(len({id_ for id_, _e in journal.peek(2)}), 2)
+
+    def test_broken_line(self):
+        journal = Journal(self.path)
+        journal.add("a")
+        with open(self.path, "a") as h:
+            h.write('{"id": 1, "ent')
+        self.assertEqual(Journal(self.path).entries(), ["a"])
+
+    def test_add_after_broken_line(self):
+        journal = Journal(self.path)
+        journal.add("a")
+        with open(self.path, "a") as h:
+            h.write('{"id": 1, "ent')
+        journal = Journal(self.path)
+        journal.add("b")
+        self.assertEqual(Journal(self.path).entries(), ["a", "b"])
+        assert 1 not in dict(journal.peek(2))
+
+    def test_add_after_unterminated_line(self):
+        journal = Journal(self.path)
+        journal.add("a")
+        with open(self.path, "rb+") as h:
+            h.seek(-1, os.SEEK_END)
+            h.truncate()
+        journal = Journal(self.path)
+        journal.add("b")
+        self.assertEqual(Journal(self.path).entries(), ["a", "b"])
@@ -0,0 +1,71 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+
+import os
+import time
+
+from quodlibet.formats import AudioFile
+from quodlibet.util.prefetch import Prefetcher, read_ahead
+from quodlibet.util.thread import Cancellable
+from tests import TestCase, mkdtemp, run_gtk_loop
+from tests.helper import temp_filename
+
+
+class TReadAhead(TestCase):
+    def test_main(self):
+        with temp_filename() as filename:
+            with open(filename, "wb") as h:
+                h.write(b"x" * 1000)
+            self.assertEqual(read_ahead(filename, 100), 100)
+            self.assertEqual(read_ahead(filename, 10000), 1000)
+            cancellable = Cancellable()
+            cancellable.cancel()
+            self.assertEqual(read_ahead(filename, 100, cancellable), 0)
+
+    def test_missing(self):
+        self.assertRaises(OSError, read_ahead, "/does/not/exist", 100)
+
+
+class TPrefetcher(TestCase):
+    def setUp(self):
+        self.dir = mkdtemp()
+        self.songs = []
+        for i in range(3):
+            path = os.path.join(self.dir, f"{i}.ogg")
+            with open(path, "wb") as h:
+                h.write(b"x" * 1000)
+            self.songs.append(AudioFile({"~filename": path}))
+        self.prefetcher = Prefetcher()
+
+    def tearDown(self):
+        self.prefetcher.destroy()
+        for song in self.songs:
+            os.remove(song("~filename"))
+        os.rmdir(self.dir)
+
+    def _wait(self, prefetcher):
+        for _i in range(100):
+            run_gtk_loop()
+            if prefetcher.bytes_read:
+                break
+            time.sleep(0.01)
+
+    def test_hits(self):
+        first, second, third = self.songs
+        self.prefetcher.prefetch([first, second], 1000)
+        self._wait(self.prefetcher)
+        self.assertEqual(self.prefetcher.bytes_read, 1000)
+        self.prefetcher.started(first)
+        self.prefetcher.started(third)
+        self.assertEqual((self.prefetcher.hits, self.prefetcher.misses), (1, 1))
+
+    def test_read(self):
+        paths = [s("~filename") for s in self.songs] + ["/does/not/exist"]
+        warm, total = Prefetcher._read(paths, 600, Cancellable())
+        self.assertEqual(warm, paths[:3])
+        self.assertEqual(total, 1800)
+        cancellable = Cancellable()
+        cancellable.cancel()
+        self.assertEqual(Prefetcher._read(paths, 600, cancellable), ([], 0))